@@ -0,0 +1,353 @@
+"""
+Headless entry points to queue many ID generation jobs at once, described by a manifest: a REST API served by the
+Flask server of Dash application, and a command line tool.
+
+Manifest is a list of jobs, each with "part_category", "cap_color_codes" (a list or a string separated by spaces, all
+colors mapped with the part category if empty), "special_code" (optional) and "count" (number of Unique IDs for each cap color code). Whole manifest is
+validated first, then quota of all its jobs is reserved at once and all of them are enqueued together, so a batch
+is either queued fully or not at all.
+
+To queue the jobs of a manifest file, run command: `python3 batch_jobs.py manifest.json`
+"""
+
+import argparse
+import csv
+import hmac
+import json
+import os
+import sys
+import typing
+
+import flask
+
+import category_catalog
+import constants
+import file_lock
+import job_progress
+import job_queue
+import quota_ledger
+
+
+class ManifestError(ValueError):
+    """
+    Raised when a manifest can't be queued, with every problem found in `errors_list`.
+    """
+
+    def __init__(self, errors_list: typing.List[str]) -> None:
+        super().__init__(" ".join(errors_list))
+        self.errors_list: typing.List[str] = errors_list
+
+
+class QuotaExceededError(ManifestError):
+    """
+    Raised when the remaining quota isn't enough for all jobs of a manifest.
+    """
+
+
+def read_manifest_file(manifest_file_path: str) -> typing.List[dict]:
+    """
+    Returns the jobs of manifest file at `manifest_file_path`, without validating them.
+
+    JSON file must contain a list of jobs (or an object with that list as "jobs"). CSV file must have the columns
+    "PART_CATEGORY", "CAP_COLOR_CODES" (separated by spaces), "SPECIAL_CODE" and "COUNT", with one job per row.
+    """
+    if os.path.splitext(manifest_file_path)[1].lower() == ".csv":
+        with open(manifest_file_path, mode="r", newline="") as manifest_file:
+            return [
+                {
+                    "part_category": row_dict.get("PART_CATEGORY", ""),
+                    "cap_color_codes": str(
+                        row_dict.get("CAP_COLOR_CODES") or ""
+                    ).split(),
+                    "special_code": row_dict.get("SPECIAL_CODE", ""),
+                    "count": row_dict.get("COUNT", ""),
+                }
+                for row_dict in csv.DictReader(manifest_file)
+            ]
+
+    with open(manifest_file_path, mode="r") as manifest_file:
+        manifest_data: typing.Any = json.load(manifest_file)
+
+    if isinstance(manifest_data, dict):
+        manifest_data = manifest_data.get("jobs", [])
+
+    return manifest_data
+
+
+def validate_manifest(manifest_list: typing.List[dict]) -> typing.List[dict]:
+    """
+    Validates all jobs of `manifest_list` in a single pass, and returns them as `dict`s with same keys as used by
+    `enqueue_jobs()` of `job_queue` module. Raises `ManifestError` with problems of every invalid job.
+
+    Args:
+
+    `manifest_list` - The list of jobs, each as a `dict` with keys "part_category", "cap_color_codes", "special_code" and "count".
+    """
+    if not isinstance(manifest_list, list) or len(manifest_list) <= 0:
+        raise ManifestError(["Manifest must be a non-empty list of jobs."])
+
+    jobs_list: typing.List[dict] = []
+    errors_list: typing.List[str] = []
+
+    for job_no, manifest_job in enumerate(manifest_list, start=1):
+        if not isinstance(manifest_job, dict):
+            errors_list.append(f"Job {job_no}: Must be an object.")
+            continue
+
+        part_category: str = (
+            str(manifest_job.get("part_category") or "").strip().upper()
+        )
+        mapped_color_codes_list: typing.List[str] = [
+            color_code_dict["value"]
+            for color_code_dict in category_catalog.CategoryCatalog.get_mapped_color_codes(
+                short_category=part_category
+            )
+        ]
+        if len(mapped_color_codes_list) <= 0:
+            errors_list.append(
+                f"Job {job_no}: Unknown part category '{part_category}'."
+            )
+            continue
+
+        # Cap color codes given as a string are separated by spaces, same as in CSV manifest.
+        cap_color_codes: typing.Any = manifest_job.get("cap_color_codes") or []
+        if isinstance(cap_color_codes, str):
+            cap_color_codes = cap_color_codes.split()
+        if not isinstance(cap_color_codes, list):
+            errors_list.append(
+                f"Job {job_no}: Cap color codes must be a list (or a string separated by spaces)."
+            )
+            continue
+
+        # Same as the web page, all cap color codes of part category are used by default.
+        cap_color_codes_list: typing.List[str] = [
+            str(cap_color_code).strip().upper() for cap_color_code in cap_color_codes
+        ]
+        if len(cap_color_codes_list) <= 0:
+            cap_color_codes_list = mapped_color_codes_list
+
+        unknown_color_codes_list: typing.List[str] = [
+            cap_color_code
+            for cap_color_code in cap_color_codes_list
+            if cap_color_code not in mapped_color_codes_list
+        ]
+        if len(unknown_color_codes_list) > 0:
+            errors_list.append(
+                f"Job {job_no}: Cap color codes {unknown_color_codes_list} aren't mapped with part category '{part_category}'."
+            )
+        if len(set(cap_color_codes_list)) != len(cap_color_codes_list):
+            errors_list.append(f"Job {job_no}: Cap color codes are repeated.")
+
+        try:
+            max_generate_limit: int = int(str(manifest_job.get("count", "")).strip())
+        except ValueError:
+            max_generate_limit = 0
+        if (
+            max_generate_limit <= 0
+            or max_generate_limit > constants.MAX_UNIQUE_ID_GENERATION_LIMIT
+        ):
+            errors_list.append(
+                f"Job {job_no}: Count must be a whole number from 1 to {constants.MAX_UNIQUE_ID_GENERATION_LIMIT}."
+            )
+
+        jobs_list.append(
+            {
+                "PART_CATEGORY": part_category,
+                "CAP_COLOR_CODES": cap_color_codes_list,
+                "SPECIAL_CODE": str(manifest_job.get("special_code") or "")
+                .strip()
+                .upper(),
+                "MAX_GENERATE_LIMIT": max_generate_limit,
+            }
+        )
+
+    if len(errors_list) > 0:
+        raise ManifestError(errors_list)
+
+    return jobs_list
+
+
+def get_required_quota(jobs_list: typing.List[dict]) -> int:
+    """
+    Returns the quota needed by all jobs of `jobs_list` (returned by `validate_manifest()`), i.e. number of short URLs to be requested.
+    """
+    return sum(
+        job_dict["MAX_GENERATE_LIMIT"] * len(job_dict["CAP_COLOR_CODES"])
+        for job_dict in jobs_list
+    )
+
+
+def enqueue_manifest(manifest_list: typing.List[dict]) -> typing.List[dict]:
+    """
+    Validates the jobs of `manifest_list`, reserves the quota of all of them at once and enqueues them together.
+    Returns the enqueued jobs (in same order) as `dict`s returned by `validate_manifest()`, along with their "JOB_ID".
+
+    Raises `ManifestError` if any job is invalid, `QuotaExceededError` if remaining quota isn't enough for all of them,
+    `JobQueueFullError` of `job_queue` module if those can't fit in queue, or `LockTimeoutError` of `file_lock` module
+    if quota couldn't be reserved in time.
+
+    Args:
+
+    `manifest_list` - The list of jobs, each as a `dict` with keys "part_category", "cap_color_codes", "special_code" and "count".
+    """
+    jobs_list: typing.List[dict] = validate_manifest(manifest_list=manifest_list)
+    required_quota: int = get_required_quota(jobs_list=jobs_list)
+    batch_categories_str: str = ",".join(
+        dict.fromkeys(job_dict["PART_CATEGORY"] for job_dict in jobs_list)
+    )
+
+    # Local short URL backend doesn't use Google's API, so it doesn't need any quota.
+    quota_reservation_timestamp: float = None
+    if constants.SHORT_URL_BACKEND == "firebase":
+        quota_reservation_timestamp = quota_ledger.QuotaLedger.get_instance().reserve(
+            count=required_quota,
+            part_category=batch_categories_str,
+        )
+        if quota_reservation_timestamp is None:
+            raise QuotaExceededError(
+                [
+                    f"Remaining quota is {quota_ledger.QuotaLedger.get_instance().get_remaining_quota()}, which isn't enough for {required_quota} unique IDs of {len(jobs_list)} jobs."
+                ]
+            )
+
+    try:
+        # Every job shares the batch reservation, so the unused quota of an interrupted job can be released.
+        job_ids_list: typing.List[str] = job_queue.enqueue_jobs(
+            jobs_list=[
+                dict(job_dict, QUOTA_RESERVATION_TIMESTAMP=quota_reservation_timestamp)
+                for job_dict in jobs_list
+            ]
+        )
+    except job_queue.JobQueueFullError:
+        # Jobs aren't going to run, so give back their quota.
+        if constants.SHORT_URL_BACKEND == "firebase":
+            quota_ledger.QuotaLedger.get_instance().release(
+                count=required_quota,
+                reservation_timestamp=quota_reservation_timestamp,
+                part_category=batch_categories_str,
+            )
+        raise
+
+    return [
+        dict(job_dict, JOB_ID=job_id)
+        for job_id, job_dict in zip(job_ids_list, jobs_list)
+    ]
+
+
+def _is_request_authorized() -> bool:
+    """
+    Returns `True` if current request has the bearer token set for `BATCH_API_TOKEN` in `constants` module.
+    """
+    authorization_str: str = flask.request.headers.get("Authorization", "")
+
+    return hmac.compare_digest(
+        authorization_str.encode(),
+        f"Bearer {constants.BATCH_API_TOKEN}".encode(),
+    )
+
+
+def register_batch_api(server: flask.Flask) -> None:
+    """
+    Adds the batch REST API routes to `server`, i.e. the Flask server of Dash application.
+
+    - `POST /api/jobs` : Queues the jobs of manifest sent as JSON body, and responds with their job IDs.
+    - `GET /api/jobs/<job_id>` : Responds with the state & progress of a job.
+
+    Every request to "/api/" routes (including the ones of `file_downloads` module) must send `BATCH_API_TOKEN`
+    (from `constants` module) as "Authorization: Bearer <token>" header.
+    """
+
+    @server.before_request
+    def check_batch_api_token() -> flask.Response:
+        if not flask.request.path.startswith("/api/"):
+            return None
+
+        if constants.BATCH_API_TOKEN == "":
+            return flask.jsonify({"errors": ["Batch API is disabled."]}), 503
+
+        if not _is_request_authorized():
+            return flask.jsonify({"errors": ["Invalid API token."]}), 401
+
+        return None
+
+    @server.route("/api/jobs", methods=["POST"])
+    def enqueue_batch_jobs() -> flask.Response:
+        manifest_data: typing.Any = flask.request.get_json(silent=True)
+        if isinstance(manifest_data, dict):
+            manifest_data = manifest_data.get("jobs", [])
+
+        try:
+            enqueued_jobs_list: typing.List[dict] = enqueue_manifest(
+                manifest_list=manifest_data
+            )
+        except QuotaExceededError as error:
+            return flask.jsonify({"errors": error.errors_list}), 409
+        except ManifestError as error:
+            return flask.jsonify({"errors": error.errors_list}), 400
+        except (job_queue.JobQueueFullError, file_lock.LockTimeoutError) as error:
+            return flask.jsonify({"errors": [str(error)]}), 503
+
+        return flask.jsonify({"jobs": enqueued_jobs_list}), 202
+
+    @server.route("/api/jobs/<job_id>", methods=["GET"])
+    def get_batch_job(job_id: str) -> flask.Response:
+        job_dict: dict = job_queue.get_job(job_id=job_id)
+        if job_dict is None:
+            return flask.jsonify({"errors": [f"Job {job_id} not found."]}), 404
+
+        job_dict["PROGRESS"] = job_progress.read_job_progress(
+            job_id=job_id,
+            total_ids_count=job_dict["MAX_GENERATE_LIMIT"]
+            * len(job_dict["CAP_COLOR_CODES"]),
+        )
+
+        return flask.jsonify(job_dict), 200
+
+
+# Handle execution in case launched as a stand-alone script, to queue the jobs of a manifest file.
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Queue the Unique ID generation jobs of a manifest file (JSON or CSV)."
+    )
+    argument_parser.add_argument(
+        "manifest_file_path",
+        help="Path of manifest file to queue.",
+    )
+    argument_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only validate the manifest and show the quota it needs, without queueing.",
+    )
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    try:
+        manifest_list: typing.List[dict] = read_manifest_file(
+            manifest_file_path=arguments.manifest_file_path
+        )
+
+        if arguments.dry_run:
+            validated_jobs_list: typing.List[dict] = validate_manifest(
+                manifest_list=manifest_list
+            )
+            print(
+                f"- {len(validated_jobs_list)} valid jobs, needing quota of {get_required_quota(jobs_list=validated_jobs_list)}."
+            )
+        else:
+            for job_dict in enqueue_manifest(manifest_list=manifest_list):
+                print(
+                    f"- {job_dict['JOB_ID']} : {job_dict['PART_CATEGORY']} ({', '.join(job_dict['CAP_COLOR_CODES'])}), special code '{job_dict['SPECIAL_CODE']}', {job_dict['MAX_GENERATE_LIMIT']} unique IDs each"
+                )
+
+    except ManifestError as error:
+        for error_message in error.errors_list:
+            print(f"[!] {error_message}")
+        sys.exit(1)
+
+    except (
+        OSError,
+        ValueError,
+        job_queue.JobQueueFullError,
+        file_lock.LockTimeoutError,
+    ) as error:
+        print(f"[!] {error}")
+        sys.exit(1)
@@ -0,0 +1,116 @@
+"""
+Benchmark for dropdown data of categories & colors, before and after parsing the catalog CSV file once into indexed dictionaries.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_category_catalog.py`
+"""
+
+import os
+import sys
+import tempfile
+import time
+import typing
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import category_catalog
+import constants
+
+
+CATEGORIES_COUNT: int = 500
+COLORS_PER_CATEGORY_COUNT: int = 10
+CALLS_COUNT: int = 20
+
+
+def _get_mapped_color_codes_with_pandas(
+    catalog_file_path: str,
+    short_category: str,
+) -> typing.List[dict]:
+    """
+    Returns the mapped color codes the same way as earlier, reading the CSV file and filtering it once per color.
+    """
+    categories_df: pd.DataFrame = pd.read_csv(catalog_file_path)
+
+    return [
+        {
+            "value": short_color,
+            "label": short_color
+            + " ("
+            + categories_df.loc[
+                (categories_df["SHORT_CATEGORY"] == short_category)
+                & (categories_df["SHORT_COLOR"] == short_color),
+                "ACTUAL_COLOR",
+            ].iat[0]
+            + ")",
+        }
+        for short_color in categories_df.loc[
+            categories_df["SHORT_CATEGORY"] == short_category, "SHORT_COLOR"
+        ]
+        .unique()
+        .tolist()
+    ]
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        # Catalog is read from the temporary directory, so the application's catalog stays untouched.
+        constants.INTERNAL_DATA_DIRPATH = temp_dir_path
+        catalog_file_path: str = os.path.join(temp_dir_path, "category_colors.csv")
+
+        pd.DataFrame(
+            data=[
+                (
+                    f"C{category_idx:03d}",
+                    f"Category {category_idx}",
+                    f"K{color_idx:02d}",
+                    f"Color {color_idx}",
+                )
+                for category_idx in range(CATEGORIES_COUNT)
+                for color_idx in range(COLORS_PER_CATEGORY_COUNT)
+            ],
+            columns=[
+                "SHORT_CATEGORY",
+                "ACTUAL_CATEGORY",
+                "SHORT_COLOR",
+                "ACTUAL_COLOR",
+            ],
+        ).to_csv(catalog_file_path, index=False)
+
+        short_category: str = f"C{CATEGORIES_COUNT - 1:03d}"
+
+        start_time: float = time.perf_counter()
+        for _ in range(CALLS_COUNT):
+            pandas_colors_list: typing.List[dict] = _get_mapped_color_codes_with_pandas(
+                catalog_file_path=catalog_file_path,
+                short_category=short_category,
+            )
+        pandas_seconds: float = (time.perf_counter() - start_time) / CALLS_COUNT
+
+        start_time = time.perf_counter()
+        category_catalog.CategoryCatalog.get_mapped_color_codes(
+            short_category=short_category
+        )
+        first_call_seconds: float = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for _ in range(CALLS_COUNT):
+            catalog_colors_list: typing.List[
+                dict
+            ] = category_catalog.CategoryCatalog.get_mapped_color_codes(
+                short_category=short_category
+            )
+        catalog_seconds: float = (time.perf_counter() - start_time) / CALLS_COUNT
+
+        assert catalog_colors_list == pandas_colors_list
+
+        print(f"- Catalog rows : {CATEGORIES_COUNT * COLORS_PER_CATEGORY_COUNT:,}")
+        print(
+            f"- Reading CSV & filtering per color : {pandas_seconds * 1_000:.2f} ms per call"
+        )
+        print(
+            f"- Indexed catalog (first call, parsing CSV) : {first_call_seconds * 1_000:.2f} ms"
+        )
+        print(
+            f"- Indexed catalog (next calls) : {catalog_seconds * 1_000_000:.1f} µs per call"
+        )
@@ -0,0 +1,78 @@
+"""
+Benchmark for per Unique ID cost of encryption and encoding, before and after caching the RSA keys.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_encryptor_encoder.py`
+"""
+
+import base64
+import os
+import sys
+import time
+import typing
+
+import rsa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import constants
+import encryptor_encoder
+
+
+TOTAL_UNIQUE_IDS: int = 5_000
+
+
+def _encrypt_encode_unique_id_with_key_loading(
+    unique_id_str: str,
+) -> str:
+    """
+    Encrypts the same way as earlier `encrypt_encode_unique_id()`, which read and parsed both key files for every Unique ID.
+    """
+    os.makedirs(name=constants.SECRET_KEYS_DIR_PATH, exist_ok=True)
+
+    public_encryptor_file_path: str = os.path.join(
+        constants.SECRET_KEYS_DIR_PATH, "public_encryptor.pem"
+    )
+    private_decryptor_file_path: str = os.path.join(
+        constants.SECRET_KEYS_DIR_PATH, "private_decryptor.pem"
+    )
+
+    with open(public_encryptor_file_path, "rb") as public_file:
+        public_key: rsa.PublicKey = rsa.PublicKey.load_pkcs1(public_file.read())
+
+    with open(private_decryptor_file_path, "rb") as private_file:
+        _ = rsa.PrivateKey.load_pkcs1(private_file.read())
+
+    encrypted_message: bytes = rsa.encrypt(unique_id_str.encode(), public_key)
+    return base64.urlsafe_b64encode(encrypted_message).decode()
+
+
+def _print_timing(label: str, total_seconds: float) -> None:
+    """
+    Prints total and per Unique ID time taken.
+    """
+    print(
+        f"- {label:<32}: {total_seconds:.3f} seconds total, {total_seconds / TOTAL_UNIQUE_IDS * 1_000_000:.1f} µs per Unique ID"
+    )
+
+
+if __name__ == "__main__":
+    unique_ids_list: typing.List[str] = [
+        f"ALRED{idx:06d}" for idx in range(TOTAL_UNIQUE_IDS)
+    ]
+
+    # Make sure the key files exist before timing anything.
+    encryptor_encoder.EncryptionKeys.get_public_key()
+
+    start_time: float = time.perf_counter()
+    for unique_id_str in unique_ids_list:
+        _encrypt_encode_unique_id_with_key_loading(unique_id_str=unique_id_str)
+    _print_timing("Key loading per Unique ID", time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    for unique_id_str in unique_ids_list:
+        encryptor_encoder.encrypt_encode_unique_id(unique_id_str=unique_id_str)
+    _print_timing("Cached keys per Unique ID", time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    encryptor_encoder.encrypt_encode_unique_ids(unique_ids_list=unique_ids_list)
+    _print_timing("Cached keys batch API", time.perf_counter() - start_time)
@@ -0,0 +1,185 @@
+"""
+Benchmark for cold start of the Dash application, i.e. time taken by a new Python process to import `app.py` and
+respond to the first page requests, along with the slowest imports reported by `python3 -X importtime`.
+
+Every run starts a fresh process on a copy of the application in a temporary directory, so queued jobs and data files
+of the application stay untouched. The first run only compiles the bytecode and isn't reported.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_import_time.py`
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+
+APP_DIR_PATH: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS_COUNT: int = 5
+
+# Modules which are only needed by running jobs, and shouldn't be imported by the web server.
+JOB_ONLY_MODULES_LIST: typing.List[str] = [
+    "pandas",
+    "numpy",
+    "openpyxl",
+    "rsa",
+    "aiohttp",
+    "uid_generator",
+    "encryptor_encoder",
+]
+
+# Code run by every cold process, which prints its timings as JSON.
+_COLD_START_CODE: str = f"""
+import json, multiprocessing, os, sys, time
+# Job workers started by application would inherit "-X importtime", and mix their reports with this one.
+sys._xoptions.pop("importtime", None)
+start_time = time.perf_counter()
+import app
+import_seconds = time.perf_counter() - start_time
+# Checked before the first response, as `dash` imports `numpy` (if installed) to serialize the layout.
+job_only_modules_list = [name for name in {JOB_ONLY_MODULES_LIST!r} if name in sys.modules]
+test_client = app.app.test_client()
+for url_path in ("/", "/_dash-layout", "/_dash-dependencies"):
+    assert test_client.get(url_path).status_code == 200, url_path
+first_response_seconds = time.perf_counter() - start_time
+print(json.dumps({{
+    "IMPORT_SECONDS": import_seconds,
+    "FIRST_RESPONSE_SECONDS": first_response_seconds,
+    "JOB_ONLY_MODULES": job_only_modules_list,
+}}), flush=True)
+# Background threads of the application never stop by themselves, so stop its job workers and exit at once.
+for child_process in multiprocessing.active_children():
+    child_process.terminate()
+os._exit(0)
+"""
+
+
+def _copy_application(temp_dir_path: str) -> None:
+    """
+    Copies the source files and category catalog of the application to `temp_dir_path`.
+    """
+    for file_path in glob.glob(os.path.join(APP_DIR_PATH, "*.py")):
+        shutil.copy(file_path, temp_dir_path)
+
+    shutil.copytree(
+        os.path.join(APP_DIR_PATH, "assets"), os.path.join(temp_dir_path, "assets")
+    )
+    os.makedirs(os.path.join(temp_dir_path, "Internal_Data"))
+    shutil.copy(
+        os.path.join(APP_DIR_PATH, "Internal_Data", "category_colors.csv"),
+        os.path.join(temp_dir_path, "Internal_Data"),
+    )
+
+
+def _run_cold_process(temp_dir_path: str) -> typing.Tuple[dict, str]:
+    """
+    Starts a new process importing the application, and returns its timings along with report of `-X importtime`.
+    """
+    # Output is written to files instead of pipes, as the job workers started by application would keep pipes open.
+    stdout_file_path: str = os.path.join(temp_dir_path, "stdout.txt")
+    stderr_file_path: str = os.path.join(temp_dir_path, "stderr.txt")
+
+    start_time: float = time.perf_counter()
+    with open(stdout_file_path, mode="w") as stdout_file, open(
+        stderr_file_path, mode="w"
+    ) as stderr_file:
+        subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _COLD_START_CODE],
+            cwd=temp_dir_path,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            check=True,
+        )
+    process_seconds: float = time.perf_counter() - start_time
+
+    with open(stdout_file_path, mode="r") as stdout_file:
+        timings_dict: dict = json.loads(
+            [
+                line
+                for line in stdout_file.read().splitlines()
+                if line.startswith('{"IMPORT_SECONDS"')
+            ][-1]
+        )
+    timings_dict["PROCESS_SECONDS"] = process_seconds
+
+    with open(stderr_file_path, mode="r") as stderr_file:
+        return timings_dict, stderr_file.read()
+
+
+def _get_slowest_imports(
+    importtime_report: str,
+    top_count: int,
+) -> typing.List[typing.Tuple[str, int]]:
+    """
+    Returns the imported packages & application modules (name and cumulative microseconds, including the modules
+    imported by them) from `importtime_report`, slowest first.
+    """
+    imports_list: typing.List[typing.Tuple[str, int]] = []
+
+    for line in importtime_report.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+
+        _, cumulative_us_str, module_name = line[len("import time:") :].split("|")
+        module_name = module_name.strip()
+
+        # Sub-modules are counted in their packages, and `app` itself contains everything.
+        if "." not in module_name and module_name not in ("app", "site"):
+            imports_list.append((module_name, int(cumulative_us_str)))
+
+    return sorted(imports_list, key=lambda item: item[1], reverse=True)[:top_count]
+
+
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Measure the cold start time of Dash application."
+    )
+    argument_parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of slowest imports to show. Default is 15.",
+    )
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        _copy_application(temp_dir_path=temp_dir_path)
+
+        # First run compiles the bytecode, same as it's already compiled on a deployed worker.
+        _run_cold_process(temp_dir_path=temp_dir_path)
+
+        timings_dicts_list: typing.List[dict] = []
+        for _ in range(RUNS_COUNT):
+            timings_dict, importtime_report = _run_cold_process(
+                temp_dir_path=temp_dir_path
+            )
+            timings_dicts_list.append(timings_dict)
+
+    print(f"- Runs : {RUNS_COUNT} (median shown)")
+    print(
+        f"- Importing app.py : {statistics.median(timings_dict['IMPORT_SECONDS'] for timings_dict in timings_dicts_list) * 1_000:.0f} ms"
+    )
+    print(
+        f"- Importing & first page response : {statistics.median(timings_dict['FIRST_RESPONSE_SECONDS'] for timings_dict in timings_dicts_list) * 1_000:.0f} ms"
+    )
+    print(
+        f"- Whole process (with interpreter start) : {statistics.median(timings_dict['PROCESS_SECONDS'] for timings_dict in timings_dicts_list) * 1_000:.0f} ms"
+    )
+    print(
+        f"- Job-only modules imported by web server : {', '.join(timings_dicts_list[-1]['JOB_ONLY_MODULES']) or 'none'}"
+    )
+
+    print("\nSlowest imports (last run, `-X importtime`, including nested imports):")
+    for module_name, cumulative_us in _get_slowest_imports(
+        importtime_report=importtime_report,
+        top_count=arguments.top,
+    ):
+        print(f"  {cumulative_us / 1_000:9.1f} ms  {module_name}")
@@ -0,0 +1,45 @@
+"""
+Benchmark for throughput of "local" short URL backend, when shortening new tokens and the ones shortened earlier.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_local_url_shortner.py`
+"""
+
+import os
+import sys
+import time
+import typing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import local_url_shortner
+
+
+TOTAL_TOKENS: int = 1_00_000
+
+
+if __name__ == "__main__":
+    # Tokens unique for every run, so none of those are shortened already.
+    tokens_list: typing.List[str] = [
+        f"TOKEN{time.time_ns()}{idx:08d}=" for idx in range(TOTAL_TOKENS)
+    ]
+
+    for label in ("New tokens", "Already shortened tokens"):
+        start_time: float = time.perf_counter()
+        tokens_to_short_url_dict: typing.Dict[
+            str, str
+        ] = local_url_shortner.shorten_tokens(tokens_list=tokens_list)
+        total_seconds: float = time.perf_counter() - start_time
+
+        assert len(tokens_to_short_url_dict) == TOTAL_TOKENS
+
+        print(
+            f"- {label:<24}: {total_seconds:.2f} seconds, {TOTAL_TOKENS / total_seconds:,.0f} tokens/second"
+        )
+
+    short_code: str = tokens_to_short_url_dict[tokens_list[0]].rsplit("/", 1)[-1]
+    start_time = time.perf_counter()
+    for _ in range(10_000):
+        local_url_shortner.resolve_short_code(short_code=short_code)
+    print(
+        f"- {'Resolve short code':<24}: {(time.perf_counter() - start_time) / 10_000 * 1_000_000:.1f} µs per lookup"
+    )
@@ -0,0 +1,53 @@
+"""
+Benchmark for scaling of encryption stage with number of worker processes.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_parallel_encryption.py`
+"""
+
+import os
+import sys
+import time
+import typing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import constants
+import encryptor_encoder
+
+
+TOTAL_UNIQUE_IDS: int = 1_00_000
+
+
+if __name__ == "__main__":
+    unique_ids_list: typing.List[str] = [
+        f"ALRED{idx:06d}" for idx in range(TOTAL_UNIQUE_IDS)
+    ]
+
+    # Make sure the key files exist before timing anything.
+    encryptor_encoder.EncryptionKeys.get_public_key()
+
+    workers_count_list: typing.List[int] = sorted(
+        {1, 2, 4, 8, constants.ENCRYPTION_MAX_WORKERS}
+    )
+    single_worker_seconds: float = 0.0
+
+    for workers_count in workers_count_list:
+        # Start the pool (and load keys in its workers) before timing.
+        if workers_count > 1:
+            encryptor_encoder.EncryptionProcessPool.get_instance(
+                max_workers=workers_count
+            )
+
+        start_time: float = time.perf_counter()
+        encryptor_encoder.encrypt_encode_unique_ids(
+            unique_ids_list=unique_ids_list,
+            max_workers=workers_count,
+        )
+        total_seconds: float = time.perf_counter() - start_time
+
+        if workers_count == 1:
+            single_worker_seconds = total_seconds
+
+        print(
+            f"- {workers_count:>2} worker(s) : {total_seconds:.2f} seconds, {TOTAL_UNIQUE_IDS / total_seconds:,.0f} IDs/second, speed-up {single_worker_seconds / total_seconds:.2f}x"
+        )
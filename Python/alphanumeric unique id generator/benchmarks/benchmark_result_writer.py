@@ -0,0 +1,217 @@
+"""
+Benchmark for writing result Excel files, before and after streaming only the exported columns row by row using
+`result_writer` module, instead of building a seven-column DataFrame for every chunk.
+
+It also writes a result with small row limits, to check that worksheets and files continue in the next ones and no row is lost.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_result_writer.py`
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import constants
+import result_writer
+
+
+CHUNK_SIZE: int = constants.GENERATION_CHUNK_SIZE
+
+# Tracing memory allocations slows down the writing many times, so memory is traced over a few chunks only.
+MEMORY_TRACED_ROWS_COUNT: int = 3 * CHUNK_SIZE
+
+
+def _get_chunk_values(
+    chunk_start_idx: int,
+    chunk_ids_count: int,
+) -> typing.Tuple[typing.List[str], typing.List[str], typing.List[str]]:
+    """
+    Returns the full Unique IDs, encrypted encoded IDs and short links of a chunk, similar to the generated ones.
+    """
+    full_unique_ids_list: typing.List[str] = [
+        f"PRBLK{idx:06X}"
+        for idx in range(chunk_start_idx, chunk_start_idx + chunk_ids_count)
+    ]
+    encrypted_encoded_ids_list: typing.List[str] = [
+        f"{unique_id}{'X' * 160}" for unique_id in full_unique_ids_list
+    ]
+    short_links_list: typing.List[str] = [
+        f"https://example.page.link/{unique_id[-6:]}AbCdEfGhIj"
+        for unique_id in full_unique_ids_list
+    ]
+
+    return full_unique_ids_list, encrypted_encoded_ids_list, short_links_list
+
+
+def _write_with_dataframes(file_path: str, rows_count: int) -> None:
+    """
+    Writes the result the same way as earlier, using a seven-column DataFrame for every chunk.
+    """
+    result_workbook: openpyxl.Workbook = openpyxl.Workbook(write_only=True)
+    result_worksheet: "openpyxl.worksheet._write_only.WriteOnlyWorksheet" = (
+        result_workbook.create_sheet(title="PR_BLK")
+    )
+    result_worksheet.append(result_writer.RESULT_COLUMNS)
+
+    for chunk_start_idx in range(0, rows_count, CHUNK_SIZE):
+        chunk_ids_count: int = min(CHUNK_SIZE, rows_count - chunk_start_idx)
+        (
+            full_unique_ids_list,
+            encrypted_encoded_ids_list,
+            short_links_list,
+        ) = _get_chunk_values(
+            chunk_start_idx=chunk_start_idx, chunk_ids_count=chunk_ids_count
+        )
+
+        result_df: pd.DataFrame = pd.DataFrame(
+            data={
+                "Product category": ["Premium"] * chunk_ids_count,
+                "Cap colour": ["Black"] * chunk_ids_count,
+                "Unique record": short_links_list,
+                "Date of generation": ["01/01/2024"] * chunk_ids_count,
+                "Unique ID": full_unique_ids_list,
+                "Encrypted Encoded": encrypted_encoded_ids_list,
+                "Short Links": short_links_list,
+            },
+        )
+        missing_short_url_mask: pd.Series = result_df["Unique record"].fillna("") == ""
+        result_df.loc[missing_short_url_mask, "Unique record"] = (
+            result_df.loc[missing_short_url_mask, "Encrypted Encoded"]
+            .map({})
+            .fillna("")
+        )
+        for row_values in result_df.loc[
+            result_df["Unique record"].fillna("") != "",
+            result_writer.RESULT_COLUMNS,
+        ].itertuples(index=False, name=None):
+            result_worksheet.append(row_values)
+
+    result_workbook.save(file_path)
+
+
+def _write_with_result_writer(file_path: str, rows_count: int) -> typing.List[str]:
+    """
+    Writes the result the same way as now, streaming only the exported columns using `ResultExcelWriter`.
+    """
+    result_excel_writer: result_writer.ResultExcelWriter = (
+        result_writer.ResultExcelWriter(file_path=file_path, sheet_title="PR_BLK")
+    )
+
+    for chunk_start_idx in range(0, rows_count, CHUNK_SIZE):
+        chunk_ids_count: int = min(CHUNK_SIZE, rows_count - chunk_start_idx)
+        _, _, short_links_list = _get_chunk_values(
+            chunk_start_idx=chunk_start_idx, chunk_ids_count=chunk_ids_count
+        )
+
+        result_excel_writer.append_rows(
+            rows_iter=(
+                ("Premium", "Black", short_link, "01/01/2024")
+                for short_link in short_links_list
+                if short_link
+            )
+        )
+
+    return result_excel_writer.close()
+
+
+def _measure_seconds(
+    write_function: typing.Callable,
+    file_path: str,
+    rows_count: int,
+) -> float:
+    """
+    Returns the seconds taken by `write_function` to write `rows_count` rows.
+    """
+    start_time: float = time.perf_counter()
+    write_function(file_path=file_path, rows_count=rows_count)
+
+    return time.perf_counter() - start_time
+
+
+def _measure_peak_mib(write_function: typing.Callable, file_path: str) -> float:
+    """
+    Returns the peak memory (in MiB) allocated by `write_function` to write `MEMORY_TRACED_ROWS_COUNT` rows.
+    """
+    tracemalloc.start()
+    write_function(file_path=file_path, rows_count=MEMORY_TRACED_ROWS_COUNT)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak_bytes / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Measure the writing of result Excel files."
+    )
+    argument_parser.add_argument(
+        "--rows",
+        type=int,
+        default=constants.MAX_UNIQUE_ID_GENERATION_LIMIT,
+        help=f"Number of rows to write. Default is {constants.MAX_UNIQUE_ID_GENERATION_LIMIT}.",
+    )
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        dataframe_file_path: str = os.path.join(temp_dir_path, "DATAFRAME.xlsx")
+        writer_file_path: str = os.path.join(temp_dir_path, "WRITER.xlsx")
+
+        # Both are timed before tracing any, as the writing stays slower for a while after tracing is stopped.
+        dataframe_seconds: float = _measure_seconds(
+            write_function=_write_with_dataframes,
+            file_path=dataframe_file_path,
+            rows_count=arguments.rows,
+        )
+        writer_seconds: float = _measure_seconds(
+            write_function=_write_with_result_writer,
+            file_path=writer_file_path,
+            rows_count=arguments.rows,
+        )
+        dataframe_peak_mib: float = _measure_peak_mib(
+            write_function=_write_with_dataframes, file_path=dataframe_file_path
+        )
+        writer_peak_mib: float = _measure_peak_mib(
+            write_function=_write_with_result_writer, file_path=writer_file_path
+        )
+
+        # Small limits, so the result continues in 3 worksheets per file & 2 files (last one partially filled).
+        constants.RESULT_EXCEL_MAX_SHEET_ROWS = 1_000
+        constants.RESULT_EXCEL_MAX_SHEETS_PER_FILE = 3
+        result_file_paths_list: typing.List[str] = _write_with_result_writer(
+            file_path=os.path.join(temp_dir_path, "ROLL_OVER.xlsx"),
+            rows_count=4_500,
+        )
+        sheet_rows_counts_list: typing.List[int] = []
+        for result_file_path in result_file_paths_list:
+            result_workbook: openpyxl.Workbook = openpyxl.load_workbook(
+                result_file_path, read_only=True
+            )
+            # Write-only workbook doesn't store dimensions of worksheets, so rows (excluding header) are counted.
+            sheet_rows_counts_list.extend(
+                sum(1 for _ in worksheet.iter_rows(values_only=True)) - 1
+                for worksheet in result_workbook.worksheets
+            )
+            result_workbook.close()
+
+    print(
+        f"- Rows : {arguments.rows} (peak memory traced over {MEMORY_TRACED_ROWS_COUNT})"
+    )
+    print(
+        f"- Seven-column DataFrame per chunk : {dataframe_seconds:.2f} seconds, peak memory {dataframe_peak_mib:.1f} MiB"
+    )
+    print(
+        f"- Streaming exported columns : {writer_seconds:.2f} seconds, peak memory {writer_peak_mib:.1f} MiB"
+    )
+    print(
+        f"- Roll over of 4500 rows : {[os.path.basename(file_path) for file_path in result_file_paths_list]}, rows per worksheet {sheet_rows_counts_list}"
+    )
+    assert sheet_rows_counts_list == [1_000, 1_000, 1_000, 1_000, 500]
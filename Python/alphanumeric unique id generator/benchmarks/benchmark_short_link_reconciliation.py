@@ -0,0 +1,101 @@
+"""
+Benchmark for filling the received short URLs into result DataFrame, before and after replacing per-key `.loc` scans with a single `.map()`.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_short_link_reconciliation.py`
+"""
+
+import time
+import typing
+
+import pandas as pd
+
+
+ROWS_COUNTS_LIST: typing.List[int] = [10_000, 1_00_000, 10_00_000]
+
+# Every `.loc` scan of earlier loop reads the whole DataFrame, so its time per key depends only on number of rows.
+# It's timed for these many keys and scaled to all the keys, as the full loop would take hours at 1M rows.
+LEGACY_SAMPLE_KEYS_COUNT: int = 200
+
+
+def _create_result_df(rows_count: int) -> typing.Tuple[pd.DataFrame, dict]:
+    """
+    Returns the result DataFrame with all short URLs missing, and the mapping of received short URLs for all of those.
+    """
+    encrypted_encoded_ids_list: typing.List[str] = [
+        f"TOKEN{idx:039d}=" for idx in range(rows_count)
+    ]
+    result_df: pd.DataFrame = pd.DataFrame(
+        data={
+            "Unique record": [""] * rows_count,
+            "Encrypted Encoded": encrypted_encoded_ids_list,
+        },
+    )
+    unique_ids_to_short_url_dict: dict = {
+        encrypted_encoded_id: f"https://short.link/{idx}"
+        for idx, encrypted_encoded_id in enumerate(encrypted_encoded_ids_list)
+    }
+
+    return result_df, unique_ids_to_short_url_dict
+
+
+def _fill_with_loc_scans(
+    result_df: pd.DataFrame,
+    unique_ids_to_short_url_dict: dict,
+) -> None:
+    """
+    Fills the short URLs the same way as earlier, scanning the whole DataFrame for every key.
+    """
+    for encrypted_encoded_key, short_url in unique_ids_to_short_url_dict.items():
+        result_df.loc[
+            result_df["Encrypted Encoded"] == encrypted_encoded_key, "Unique record"
+        ] = short_url
+
+
+def _fill_with_map(
+    result_df: pd.DataFrame,
+    unique_ids_to_short_url_dict: dict,
+) -> None:
+    """
+    Fills the short URLs the same way as `uid_generator` module does now.
+    """
+    missing_short_url_mask: pd.Series = result_df["Unique record"].fillna("") == ""
+    result_df.loc[missing_short_url_mask, "Unique record"] = (
+        result_df.loc[missing_short_url_mask, "Encrypted Encoded"]
+        .map(unique_ids_to_short_url_dict)
+        .fillna("")
+    )
+
+
+if __name__ == "__main__":
+    for rows_count in ROWS_COUNTS_LIST:
+        result_df, unique_ids_to_short_url_dict = _create_result_df(
+            rows_count=rows_count
+        )
+
+        sample_short_url_dict: dict = dict(
+            list(unique_ids_to_short_url_dict.items())[:LEGACY_SAMPLE_KEYS_COUNT]
+        )
+        start_time: float = time.perf_counter()
+        _fill_with_loc_scans(
+            result_df=result_df.copy(),
+            unique_ids_to_short_url_dict=sample_short_url_dict,
+        )
+        loc_scans_seconds: float = (
+            (time.perf_counter() - start_time)
+            / LEGACY_SAMPLE_KEYS_COUNT
+            * len(unique_ids_to_short_url_dict)
+        )
+
+        start_time = time.perf_counter()
+        _fill_with_map(
+            result_df=result_df,
+            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+        )
+        map_seconds: float = time.perf_counter() - start_time
+
+        assert (result_df["Unique record"] != "").all()
+
+        print(
+            f"- {rows_count:>9,} rows : per-key .loc scans {loc_scans_seconds:>10.1f} seconds (estimated from {LEGACY_SAMPLE_KEYS_COUNT} keys),"
+            f" single .map() {map_seconds:.3f} seconds"
+        )
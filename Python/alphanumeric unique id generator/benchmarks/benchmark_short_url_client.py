@@ -0,0 +1,113 @@
+"""
+Benchmark for short URL client against a local stub server, which checks that the request rate limit is respected.
+
+The stub server answers every POST request after `STUB_LATENCY_SECONDS`, like a slow short links API would,
+and records when each request arrived.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_short_url_client.py`
+"""
+
+import asyncio
+import bisect
+import os
+import sys
+import threading
+import time
+import typing
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import constants
+import firebase_url_shortner
+
+
+TOTAL_UNIQUE_IDS: int = 100
+
+STUB_LATENCY_SECONDS: float = 0.5
+
+STUB_PORT_NO: int = 44668
+
+
+# Arrival times of all POST requests received by stub server.
+request_times_list: typing.List[float] = []
+
+
+async def _handle_short_link_request(request: web.Request) -> web.Response:
+    """
+    Stub handler that returns a short link for the long link from request body.
+    """
+    request_times_list.append(time.monotonic())
+    request_dict: dict = await request.json()
+    await asyncio.sleep(STUB_LATENCY_SECONDS)
+
+    long_link: str = request_dict["dynamicLinkInfo"]["link"]
+    return web.json_response({"shortLink": f"https://stub.link/{long_link[-8:]}"})
+
+
+def _run_stub_server() -> None:
+    """
+    Runs the stub server in current thread, forever.
+    """
+    stub_app: web.Application = web.Application()
+    stub_app.router.add_post("/", _handle_short_link_request)
+    web.run_app(
+        stub_app,
+        host="127.0.0.1",
+        port=STUB_PORT_NO,
+        print=None,
+        handle_signals=False,
+    )
+
+
+def _get_max_requests_in_one_second() -> int:
+    """
+    Returns the maximum number of requests received within any one second window.
+    """
+    return max(
+        bisect.bisect_left(request_times_list, request_time + 1.0) - idx
+        for idx, request_time in enumerate(request_times_list)
+    )
+
+
+if __name__ == "__main__":
+    threading.Thread(target=_run_stub_server, daemon=True).start()
+    time.sleep(1.0)
+
+    constants.FIREBASE_SHORT_LINKS_API_URL = f"http://127.0.0.1:{STUB_PORT_NO}/"
+
+    unique_ids_to_short_url_dict: dict = {}
+
+    for requests_per_second in (
+        constants.GOOGLE_API_REQUESTS_PER_SECOND,
+        constants.GOOGLE_API_REQUESTS_PER_SECOND * 10,
+    ):
+        request_times_list.clear()
+        unique_ids_to_short_url_dict.clear()
+
+        # Codes unique for every run, so none of those are taken from the short links cache.
+        encrypted_encoded_coupon_codes_list: typing.List[str] = [
+            f"CODE{time.time_ns()}{idx:08d}" for idx in range(TOTAL_UNIQUE_IDS)
+        ]
+
+        start_time: float = time.perf_counter()
+        firebase_url_shortner.collect_firebase_short_urls(
+            encrypted_encoded_coupon_codes_list=encrypted_encoded_coupon_codes_list,
+            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+            requests_per_second=requests_per_second,
+        )
+        total_seconds: float = time.perf_counter() - start_time
+
+        assert all(
+            unique_ids_to_short_url_dict[code].endswith(code[-8:])
+            for code in encrypted_encoded_coupon_codes_list
+        )
+
+        max_requests_count: int = _get_max_requests_in_one_second()
+        print(
+            f"- Limit {requests_per_second:>3} requests/second : {TOTAL_UNIQUE_IDS / total_seconds:.1f} requests/second achieved,"
+            f" at most {max_requests_count} requests in any one second, sequential client would take at least"
+            f" {TOTAL_UNIQUE_IDS * max(STUB_LATENCY_SECONDS, 1 / requests_per_second):.1f} seconds instead of {total_seconds:.1f}"
+        )
+        assert max_requests_count <= requests_per_second
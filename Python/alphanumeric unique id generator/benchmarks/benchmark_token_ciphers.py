@@ -0,0 +1,50 @@
+"""
+Benchmark for throughput and token length of the available token ciphers.
+
+Run from the application directory using command: `python3 benchmarks/benchmark_token_ciphers.py`
+"""
+
+import os
+import sys
+import time
+import typing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import encryptor_encoder
+
+
+TOTAL_UNIQUE_IDS: int = 20_000
+
+
+if __name__ == "__main__":
+    unique_ids_list: typing.List[str] = [
+        f"ALRED{idx:06d}" for idx in range(TOTAL_UNIQUE_IDS)
+    ]
+
+    for backend_name in encryptor_encoder.TOKEN_CIPHERS_DICT:
+        token_cipher: encryptor_encoder.TokenCipher = (
+            encryptor_encoder.get_token_cipher(backend_name=backend_name)
+        )
+
+        # Make sure the key files exist before timing anything.
+        token_cipher.load_keys()
+
+        start_time: float = time.perf_counter()
+        tokens_list: typing.List[str] = token_cipher.encrypt_encode_many(
+            unique_ids_list
+        )
+        encrypt_seconds: float = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        decoded_ids_list: typing.List[str] = [
+            encryptor_encoder.decode_decrypt_token(token_str=token_str)
+            for token_str in tokens_list
+        ]
+        decrypt_seconds: float = time.perf_counter() - start_time
+
+        assert decoded_ids_list == unique_ids_list
+
+        print(
+            f"- {backend_name:<12}: encrypt {TOTAL_UNIQUE_IDS / encrypt_seconds:>10,.0f} IDs/second, decrypt {TOTAL_UNIQUE_IDS / decrypt_seconds:>10,.0f} IDs/second, token length {len(tokens_list[0])} characters"
+        )
@@ -0,0 +1,218 @@
+"""
+Catalog of product categories and their cap colors, read from `Internal_Data/category_colors.csv` file.
+
+The CSV file is parsed once into dictionaries indexed by short category and short color, and parsed again only
+when its modification time (or size) changes. So the dropdown callbacks don't read the file on every call.
+
+Parsed catalog is published as a single immutable snapshot, so other threads see either the old catalog or the new one.
+"""
+
+import csv
+import os
+import threading
+import typing
+
+import constants
+
+
+class _CatalogSnapshot(typing.NamedTuple):
+    """
+    Parsed catalog of categories & colors, along with the signature of CSV file it's parsed from.
+    """
+
+    # Modification time (in nanoseconds) & size of CSV file when it's parsed, or `None` if the CSV file didn't exist.
+    file_signature: typing.Tuple[int, int]
+
+    # Dropdown items of all unique short categories, in the same order as CSV file.
+    categories_list: typing.List[typing.Dict[str, str]]
+
+    # Dropdown items of unique short colors, against each short category.
+    colors_by_category_dict: typing.Dict[str, typing.List[typing.Dict[str, str]]]
+
+    # Full names against short categories, and short colors.
+    category_names_dict: typing.Dict[str, str]
+    color_names_dict: typing.Dict[str, str]
+
+    # All known short category & short color pairs, joined together (for e.g. "ALRED").
+    category_color_codes_set: typing.FrozenSet[str]
+
+
+class CategoryCatalog:
+    """
+    Class that hold the parsed catalog of categories & colors of current process, for easy access.
+    """
+
+    # Snapshot of last parsed catalog, or `None` if it's not parsed yet. It's replaced as a whole, never modified.
+    _snapshot: _CatalogSnapshot = None
+
+    # Dash callbacks run in multiple threads of same process.
+    _reload_lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def _get_file_path() -> str:
+        """`Private method.`"""
+
+        return os.path.join(constants.INTERNAL_DATA_DIRPATH, "category_colors.csv")
+
+    @staticmethod
+    def _parse_file(
+        file_path: str, file_signature: typing.Tuple[int, int]
+    ) -> _CatalogSnapshot:
+        """`Private method.`"""
+
+        categories_list: typing.List[typing.Dict[str, str]] = []
+        colors_by_category_dict: typing.Dict[
+            str, typing.List[typing.Dict[str, str]]
+        ] = {}
+        category_names_dict: typing.Dict[str, str] = {}
+        color_names_dict: typing.Dict[str, str] = {}
+        category_color_codes_set: typing.Set[str] = set()
+
+        with open(file_path, mode="r", newline="") as catalog_file:
+            for row_dict in csv.DictReader(catalog_file):
+                short_category: str = row_dict["SHORT_CATEGORY"].strip()
+                short_color: str = row_dict["SHORT_COLOR"].strip()
+
+                # First row of every category or color gives its full name, same as earlier.
+                if short_category not in category_names_dict:
+                    category_names_dict[short_category] = row_dict[
+                        "ACTUAL_CATEGORY"
+                    ].strip()
+                    categories_list.append(
+                        {
+                            "value": short_category,
+                            "label": short_category
+                            + " - "
+                            + category_names_dict[short_category],
+                        }
+                    )
+                    colors_by_category_dict[short_category] = []
+
+                if short_color not in color_names_dict:
+                    color_names_dict[short_color] = row_dict["ACTUAL_COLOR"].strip()
+
+                if short_category + short_color not in category_color_codes_set:
+                    category_color_codes_set.add(short_category + short_color)
+                    colors_by_category_dict[short_category].append(
+                        {
+                            "value": short_color,
+                            "label": short_color
+                            + " ("
+                            + row_dict["ACTUAL_COLOR"].strip()
+                            + ")",
+                        }
+                    )
+
+        return _CatalogSnapshot(
+            file_signature=file_signature,
+            categories_list=categories_list,
+            colors_by_category_dict=colors_by_category_dict,
+            category_names_dict=category_names_dict,
+            color_names_dict=color_names_dict,
+            category_color_codes_set=frozenset(category_color_codes_set),
+        )
+
+    @staticmethod
+    def _reload_if_changed() -> _CatalogSnapshot:
+        """`Private method.`"""
+
+        file_path: str = CategoryCatalog._get_file_path()
+
+        try:
+            file_stat: os.stat_result = os.stat(file_path)
+            file_signature: typing.Tuple[int, int] = (
+                file_stat.st_mtime_ns,
+                file_stat.st_size,
+            )
+        except FileNotFoundError:
+            file_signature = None
+
+        # Read only once, as other thread may replace it meanwhile.
+        snapshot: _CatalogSnapshot = CategoryCatalog._snapshot
+        if snapshot is not None and file_signature == snapshot.file_signature:
+            return snapshot
+
+        with CategoryCatalog._reload_lock:
+            # Other thread might have parsed it while waiting for the lock.
+            snapshot = CategoryCatalog._snapshot
+            if snapshot is not None and file_signature == snapshot.file_signature:
+                return snapshot
+
+            if file_signature is None:
+                snapshot = _CatalogSnapshot(
+                    file_signature=None,
+                    categories_list=[],
+                    colors_by_category_dict={},
+                    category_names_dict={},
+                    color_names_dict={},
+                    category_color_codes_set=frozenset(),
+                )
+            else:
+                snapshot = CategoryCatalog._parse_file(
+                    file_path=file_path, file_signature=file_signature
+                )
+
+            # Published with a single assignment, so other threads never see a partially parsed catalog.
+            CategoryCatalog._snapshot = snapshot
+
+        return snapshot
+
+    @staticmethod
+    def get_product_categories() -> typing.List[typing.Dict[str, str]]:
+        """
+        Returns the `list` containing `dict`s of unique product categories, which is shared and must not be modified.
+
+        `Public method.`
+        """
+        return CategoryCatalog._reload_if_changed().categories_list
+
+    @staticmethod
+    def get_mapped_color_codes(
+        short_category: str,
+    ) -> typing.List[typing.Dict[str, str]]:
+        """
+        Returns the `list` containing `dict`s of color codes mapped with `short_category`, which is shared and must not be modified.
+
+        `Public method.`
+        """
+        return CategoryCatalog._reload_if_changed().colors_by_category_dict.get(
+            short_category, []
+        )
+
+    @staticmethod
+    def get_category_name(short_category: str) -> str:
+        """
+        Returns the full name of `short_category`, or `short_category` itself if it's not in catalog.
+
+        `Public method.`
+        """
+        return CategoryCatalog._reload_if_changed().category_names_dict.get(
+            short_category, short_category
+        )
+
+    @staticmethod
+    def get_color_name(short_color: str) -> str:
+        """
+        Returns the full name of `short_color`, or `short_color` itself if it's not in catalog.
+
+        `Public method.`
+        """
+        return CategoryCatalog._reload_if_changed().color_names_dict.get(
+            short_color, short_color
+        )
+
+    @staticmethod
+    def get_category_color_codes() -> typing.FrozenSet[str]:
+        """
+        Returns the `frozenset` of all known short category & short color pairs joined together (for e.g. "ALRED").
+
+        `Public method.`
+        """
+        return CategoryCatalog._reload_if_changed().category_color_codes_set
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(CategoryCatalog.get_product_categories())
+    # print(CategoryCatalog.get_mapped_color_codes(short_category="AL"))
@@ -18,7 +18,73 @@ MAX_UNIQUE_ID_GENERATION_LIMIT: int = 2_00_000
 """ Maximum per 24 hours limit of Google's short link API endpoint. """
 
 GOOGLE_API_REQUESTS_PER_SECOND: int = 5
-""" Maximum per second limit of Google's short link API endpoint. """
+""" Maximum per second limit of Google's short link API endpoint, shared by all processes sending requests. """
+
+SHORT_URL_BACKEND: str = "firebase"
+""" Backend used to create short URLs. Either "firebase" (Google's short link API, rate limited) or "local" (self-hosted short codes, served by `local_url_shortner.py`). """
+
+LOCAL_SHORT_LINKS_BASE_URL: str = (
+    "http://127.0.0.1:44670/"  # TODO: Use public URL of redirect service.
+)
+""" Public base URL of the redirect service of "local" short URL backend, which is followed by the short code. """
+
+LOCAL_SHORT_LINKS_PORT_NO: int = 44670
+""" Port number for the redirect service of "local" short URL backend. """
+
+FIREBASE_SHORT_LINKS_API_URL: str = (
+    "CUSTOM_FIREBASE_ENDPOINT"  # TODO: Use appropriate endpoint.
+)
+""" URL of the Firebase short links API endpoint, where POST requests to create short URLs are sent. """
+
+FIREBASE_API_KEY: str = "CUSTOM_KEY"  # TODO: Use appropriate key.
+""" API key passed as `key` query parameter to `FIREBASE_SHORT_LINKS_API_URL`. """
+
+SHORT_URL_LINK_PREFIX: str = (
+    "https://LINK_TO_BE_SHORTENED/"  # TODO: Use appropriate link.
+)
+""" Long link to be shortened, which is followed by the encrypted encoded unique ID. """
+
+SHORT_URL_MAX_IN_FLIGHT_REQUESTS: int = 8
+""" Maximum number of short URL requests waiting for their response at the same time, so the response latency doesn't slow down the generation. """
+
+SHORT_URL_MAX_RETRIES: int = 5
+""" Maximum number of times a missing short URL is requested again, before its unique ID is moved to the dead letters. """
+
+SHORT_URL_RETRY_BASE_DELAY_SECONDS: float = 1.0
+""" Delay before first retry of missing short URLs, which is doubled (with random jitter) for every next retry. """
+
+SHORT_URL_RETRY_MAX_DELAY_SECONDS: float = 60.0
+""" Maximum delay between two retries of missing short URLs. """
+
+SHORT_URL_CIRCUIT_BREAKER_THRESHOLD: int = 10
+""" Number of consecutive responses failing with "429 Too Many Requests", server errors or no response at all, after which no more requests are sent for a while. """
+
+SHORT_URL_CIRCUIT_BREAKER_COOLDOWN_SECONDS: float = 300.0
+""" Number of seconds no requests are sent, after `SHORT_URL_CIRCUIT_BREAKER_THRESHOLD` is reached. """
+
+TOKEN_CIPHER_BACKEND: str = "rsa"
+""" Cipher used to create encrypted encoded tokens of unique IDs. Either "rsa" (44 characters tokens) or "blake2-siv" (faster and shorter tokens). """
+
+SYMMETRIC_TOKEN_KEY_VERSION: int = 1
+""" Version of the secret key used to create new tokens with "blake2-siv" cipher. Tokens created with older versions can still be decoded. """
+
+MAX_CAP_COLOR_WORKERS: int = 3
+""" Maximum number of cap color codes to be processed in parallel (each in a separate process) during generation process. """
+
+ENCRYPTION_MAX_WORKERS: int = os.cpu_count() or 1
+""" Maximum number of processes used to encrypt the unique IDs on multiple CPU cores. These are shared by all cap color codes processed in parallel. """
+
+GENERATION_CHUNK_SIZE: int = 10_000
+""" Number of unique IDs generated, encrypted, shortened and written to files at once. Memory usage of generation process depends on it. """
+
+EXCEL_MAX_SHEET_ROWS: int = 1_048_576
+""" Maximum rows (including header) a worksheet can have in Excel, beyond which the file can't be opened. """
+
+RESULT_EXCEL_MAX_SHEET_ROWS: int = 1_000_000
+""" Rows of Unique IDs written to a single worksheet of result Excel file, before continuing in the next worksheet. Kept below `EXCEL_MAX_SHEET_ROWS`. """
+
+RESULT_EXCEL_MAX_SHEETS_PER_FILE: int = 1
+""" Worksheets written to a single result Excel file, before continuing in the next file (named with "_PART_<number>" suffix). """
 
 DEFAULT_ALPHA_NUM_UNIQUE_ID_LENGTH: int = 6
 """ Default length of unique ID characters to be considered during generation process. """
@@ -31,6 +97,12 @@ TVS_TEXT_RGBA_COLOR: str = "rgba(41, 58, 128, 1.0)"
 ID_GENERATION_TRACKING_DATETIME_FORMAT: str = f"%d/%b/%Y %I:%M:%S.%f %p"
 ID_GENERATION_TRACKING_CSV_FILENAME: str = "id_generation_tracking.csv"
 
+TASK_LOG_RETENTION_HOURS: int = 24
+""" Number of hours the ID generation tasks are kept in task log, after which their whole hourly segment files are removed. """
+
+TASK_LOG_COMPACTION_INTERVAL_SECONDS: float = 5 * 60
+""" Interval between the rounds of background compactor removing expired task log segments and quota reservations. """
+
 # Path to store data files needed for application internally.
 INTERNAL_DATA_DIRPATH: str = os.path.join(
     "Internal_Data",
@@ -46,7 +118,7 @@ if not IS_DASH_DEBUG_MODE:
     # SECRET_KEYS_DIR_PATH = ""
     pass
 
-# Path to store files containing alpha-numeric digit length for unique ID.
+# Path to store files containing alpha-numeric digit length for unique ID (only read to migrate those to `STATE_STORE_FILE_PATH`).
 ALPHA_NUM_DIGIT_LEN_DIR_PATH: str = os.path.join(
     INTERNAL_DATA_DIRPATH, "Alpha_Numeric_Digit_Lengths"
 )
@@ -54,6 +126,105 @@ if not IS_DASH_DEBUG_MODE:
     # ALPHA_NUM_DIGIT_LEN_DIR_PATH = ""
     pass
 
+# Path to store files containing high-water mark (i.e. the next alpha-numeric sequence) for unique ID (only read to migrate those to `STATE_STORE_FILE_PATH`).
+HIGH_WATER_MARKS_DIR_PATH: str = os.path.join(INTERNAL_DATA_DIRPATH, "High_Water_Marks")
+if not IS_DASH_DEBUG_MODE:
+    # HIGH_WATER_MARKS_DIR_PATH = ""
+    pass
+
+# Path to store lock files used to synchronize across processes (and App Service instances sharing the storage).
+LOCKS_DIR_PATH: str = os.path.join(INTERNAL_DATA_DIRPATH, "Locks")
+if not IS_DASH_DEBUG_MODE:
+    # LOCKS_DIR_PATH = ""
+    pass
+
+FILE_LOCK_TIMEOUT_SECONDS: float = 120.0
+""" Maximum seconds to wait for a file lock, after which `LockTimeoutError` of `file_lock` module is raised. """
+
+JOB_WORKERS_COUNT: int = 2
+""" Number of warm worker processes running the queued ID generation jobs, i.e. maximum jobs running together. """
+
+JOB_QUEUE_MAX_LENGTH: int = 100
+""" Maximum number of ID generation jobs waiting in queue (for e.g. a nightly batch of all categories), after which new jobs are rejected. """
+
+JOB_QUEUE_POLL_INTERVAL_SECONDS: float = 1.0
+""" Interval to check for newly queued jobs, while all of them are processed. """
+
+JOB_QUEUE_HOST_ELECTION_INTERVAL_SECONDS: float = 10.0
+""" Interval at which the processes not running the jobs check if they can become job queue host (for e.g. after host stops). """
+
+JOB_PROGRESS_WRITE_INTERVAL_SECONDS: float = 2.0
+""" Minimum interval between two writes of a job's progress file, while its counters keep changing. """
+
+JOB_PROGRESS_POLL_INTERVAL_MILLISECONDS: int = 5_000
+""" Interval at which the web page reads the progress of last queued job. """
+
+JOB_PROGRESS_STALL_SECONDS: float = 300.0
+""" Seconds without any progress update, after which a running job is shown as stalled. """
+
+JOB_PROGRESS_RETENTION_HOURS: int = 24
+""" Hours to keep the progress files of jobs after their last update, before those are removed by `task_log` compactor. """
+
+BATCH_API_TOKEN: str = os.environ.get("UID_GENERATOR_API_TOKEN", "")
+""" Bearer token required by all "/api/" routes (batch REST API of `batch_jobs` module & downloads of `file_downloads` module), read from "UID_GENERATOR_API_TOKEN" environment variable. The API is disabled while it's empty. """
+
+DOWNLOAD_GZIP_CHUNK_SIZE_BYTES: int = 256 * 1024
+""" Bytes of CSV file read & compressed at once, when it's downloaded as gzip by `file_downloads` module. """
+
+# Path of SQLite database file caching the short URLs already created, against their encrypted encoded unique IDs.
+SHORT_LINKS_CACHE_FILE_PATH: str = os.path.join(
+    INTERNAL_DATA_DIRPATH, "short_links_cache.sqlite3"
+)
+if not IS_DASH_DEBUG_MODE:
+    # SHORT_LINKS_CACHE_FILE_PATH = ""
+    pass
+
+# Path of SQLite database file storing the short codes (and their encrypted encoded unique IDs) of "local" short URL backend.
+LOCAL_SHORT_LINKS_FILE_PATH: str = os.path.join(
+    INTERNAL_DATA_DIRPATH, "local_short_links.sqlite3"
+)
+if not IS_DASH_DEBUG_MODE:
+    # LOCAL_SHORT_LINKS_FILE_PATH = ""
+    pass
+
+# Path of SQLite database file storing alpha-numeric digit lengths and high-water marks of all part category & cap color pairs.
+STATE_STORE_FILE_PATH: str = os.path.join(INTERNAL_DATA_DIRPATH, "state_store.sqlite3")
+if not IS_DASH_DEBUG_MODE:
+    # STATE_STORE_FILE_PATH = ""
+    pass
+
+# Path of SQLite database file storing the next free request slot of short links API, shared by all processes sending requests.
+REQUEST_RATE_LIMITS_FILE_PATH: str = os.path.join(
+    INTERNAL_DATA_DIRPATH, "request_rate_limits.sqlite3"
+)
+if not IS_DASH_DEBUG_MODE:
+    # REQUEST_RATE_LIMITS_FILE_PATH = ""
+    pass
+
+# Path to store CSV files of unique IDs whose short URLs couldn't be received even after retries, to resume those later.
+DEAD_LETTERS_DIR_PATH: str = os.path.join(INTERNAL_DATA_DIRPATH, "Dead_Letters")
+if not IS_DASH_DEBUG_MODE:
+    # DEAD_LETTERS_DIR_PATH = ""
+    pass
+
+# Path to store hourly segment files of append-only log of ID generation tasks.
+TASK_LOG_DIR_PATH: str = os.path.join(INTERNAL_DATA_DIRPATH, "Task_Log")
+if not IS_DASH_DEBUG_MODE:
+    # TASK_LOG_DIR_PATH = ""
+    pass
+
+# Path of SQLite database file storing the queue of ID generation jobs.
+JOB_QUEUE_FILE_PATH: str = os.path.join(INTERNAL_DATA_DIRPATH, "job_queue.sqlite3")
+if not IS_DASH_DEBUG_MODE:
+    # JOB_QUEUE_FILE_PATH = ""
+    pass
+
+# Path to store the progress files of ID generation jobs, one per job and cap color code.
+JOB_PROGRESS_DIR_PATH: str = os.path.join(INTERNAL_DATA_DIRPATH, "Job_Progress")
+if not IS_DASH_DEBUG_MODE:
+    # JOB_PROGRESS_DIR_PATH = ""
+    pass
+
 # Path to store resulting Excel files.
 RESULT_EXCEL_DIRPATH: str = os.path.join(
     "Result",
@@ -1,12 +1,16 @@
-import multiprocessing
+import datetime
+import time
 
 import dash
 import dash_mantine_components as dmc
 
 import constants
 import dash_instance
+import file_lock
+import job_progress
+import job_queue
+import quota_ledger
 import utility_functions
-import uid_generator
 
 
 # Get application instance to register callback handlers.
@@ -33,20 +37,15 @@ def category_select_callback(part_category_value):
     Callback that handles things when category input gets selected or changed.
     """
 
-    # Remove previous tracking if there're older processes exist which might be older than yesterday.
-    with dash_instance.DashInstance.get_multiprocessing_lock() as mp_lock:
-        utility_functions.remove_old_id_generation_task_entries()
-
     # Prepare remaining quota highlighting values.
-    remaining_quota_children_str: str = (
-        f"Remaining quota: {utility_functions.get_google_api_remaining_quota()}"
-    )
-    if utility_functions.get_google_api_remaining_quota() <= 0:
+    remaining_quota: int = utility_functions.get_google_api_remaining_quota()
+    remaining_quota_children_str: str = f"Remaining quota: {remaining_quota}"
+    if remaining_quota <= 0:
         remaining_quota_children_str = f"Remaining quota: Expired, no quota left."
 
     remaining_quota_highlight_str: str = remaining_quota_children_str
     remaining_quota_highlight_color_str: str = (
-        "yellow" if (utility_functions.get_google_api_remaining_quota() > 0) else "red"
+        "yellow" if (remaining_quota > 0) else "red"
     )
 
     if (
@@ -100,23 +99,24 @@ def color_cap_code_multiselect_callback(cap_color_code_values):
     """
     Callback that handles things when color cap input gets selected or changed.
     """
+    remaining_quota: int = utility_functions.get_google_api_remaining_quota()
+
     if cap_color_code_values is None or len(cap_color_code_values) <= 0:
         return (
             0,
             True,
-            10
-            if (10 < utility_functions.get_google_api_remaining_quota())
-            else utility_functions.get_google_api_remaining_quota(),
-            utility_functions.get_google_api_remaining_quota(),
+            10 if (10 < remaining_quota) else remaining_quota,
+            remaining_quota,
         )
 
+    # Every cap color code generates the given number of unique IDs, so the remaining quota is split among them.
+    max_unique_ids: int = remaining_quota // len(cap_color_code_values)
+
     return (
         0,
         False,
-        10
-        if (10 < utility_functions.get_google_api_remaining_quota())
-        else utility_functions.get_google_api_remaining_quota(),
-        utility_functions.get_google_api_remaining_quota(),
+        10 if (10 < max_unique_ids) else max_unique_ids,
+        max_unique_ids,
     )
 
 
@@ -144,6 +144,7 @@ def unique_ids_numberinput_callback(unique_ids_numberinput):
     [
         dash.Output("Notifications-View", "children"),
         dash.Output("part-category-select", "value"),
+        dash.Output("job-id-store", "data"),
     ],
     [
         dash.Input("generate-unique-ids-button", "n_clicks"),
@@ -164,28 +165,91 @@ def generate_unique_ids_callback(
         return (
             dash.no_update,
             dash.no_update,
+            dash.no_update,
         )
 
-    # Start a separate process to generate all unique IDs.
-    # Reference : https://stackoverflow.com/a/2046630
-
     print(
         f"part_category_value={type(part_category_value)}\ncap_color_code_values={type(cap_color_code_values)}\nspecial_code_value={special_code_value}\nunique_ids_numberinput={type(unique_ids_numberinput)}"
     )
 
-    process: multiprocessing.Process = multiprocessing.Process(
-        target=uid_generator.generate_unique_ids,
-        args=(
-            part_category_value,
-            cap_color_code_values,
-            str(special_code_value).strip().upper(),
-            unique_ids_numberinput,
-        ),
-    )
-    process.start()
+    # Reserve the quota for all cap color codes before starting, so the jobs started together can't exceed the limit.
+    # Local short URL backend doesn't use Google's API, so it doesn't need any quota.
+    is_quota_reserved: bool = True
+    quota_reservation_timestamp: float = None
+    quota_error_message: str = ""
+    if constants.SHORT_URL_BACKEND == "firebase":
+        try:
+            quota_reservation_timestamp = (
+                quota_ledger.QuotaLedger.get_instance().reserve(
+                    count=int(unique_ids_numberinput) * len(cap_color_code_values),
+                    part_category=part_category_value,
+                    special_code=str(special_code_value).strip().upper(),
+                )
+            )
+            is_quota_reserved = quota_reservation_timestamp is not None
+            quota_error_message = f"Remaining quota is {utility_functions.get_google_api_remaining_quota()}, which isn't enough for {unique_ids_numberinput} unique IDs of {len(cap_color_code_values)} cap color codes."
+        except file_lock.LockTimeoutError:
+            is_quota_reserved = False
+            quota_error_message = "Quota is being reserved by other jobs, please try again after some time."
 
-    notification_title = "Started unique ID generation process!"
-    notification_message = f"File with total {unique_ids_numberinput} unique IDs will be sent on e-mail.\nYou can close this tab now."
+    if not is_quota_reserved:
+        return (
+            dmc.Notification(
+                title=dmc.Text(
+                    children="Couldn't reserve the quota!",
+                    transform="capitalize",
+                    weight=500,
+                ),
+                id="Upload-And-Indexing-Success-Notification",
+                action="show",
+                autoClose=False,
+                disallowClose=False,
+                color="red",
+                message=quota_error_message,
+            ),
+            dash.no_update,
+            dash.no_update,
+        )
+
+    # Queue the job to generate all unique IDs, which is started by a job worker once it's idle.
+    try:
+        job_id: str = job_queue.enqueue_job(
+            part_category=part_category_value,
+            cap_color_codes=cap_color_code_values,
+            special_code=str(special_code_value).strip().upper(),
+            max_generate_limit=int(unique_ids_numberinput),
+            quota_reservation_timestamp=quota_reservation_timestamp,
+        )
+    except job_queue.JobQueueFullError as error:
+        # Job isn't going to run, so give back its quota.
+        if constants.SHORT_URL_BACKEND == "firebase":
+            quota_ledger.QuotaLedger.get_instance().release(
+                count=int(unique_ids_numberinput) * len(cap_color_code_values),
+                reservation_timestamp=quota_reservation_timestamp,
+                part_category=part_category_value,
+                special_code=str(special_code_value).strip().upper(),
+            )
+
+        return (
+            dmc.Notification(
+                title=dmc.Text(
+                    children="Too many jobs are waiting!",
+                    transform="capitalize",
+                    weight=500,
+                ),
+                id="Upload-And-Indexing-Success-Notification",
+                action="show",
+                autoClose=False,
+                disallowClose=False,
+                color="red",
+                message=f"{error} Please try again after some time.",
+            ),
+            dash.no_update,
+            dash.no_update,
+        )
+
+    notification_title = "Queued unique ID generation job!"
+    notification_message = f"Job {job_id} is at position {job_queue.get_job(job_id=job_id)['QUEUE_POSITION']} in queue, its progress is shown below.\nFile with total {unique_ids_numberinput} unique IDs will be sent on e-mail.\nYou can close this tab now."
     notification_children = dmc.Notification(
         title=dmc.Text(
             children=notification_title,
@@ -204,4 +268,138 @@ def generate_unique_ids_callback(
     return (
         notification_children,
         "",
+        job_id,
+    )
+
+
+@dash_app_instance.callback(
+    [
+        dash.Output("job-progress-view", "children"),
+        dash.Output("job-progress-interval", "disabled"),
+    ],
+    [
+        dash.Input("job-progress-interval", "n_intervals"),
+        dash.Input("job-id-store", "data"),
+    ],
+)
+def job_progress_interval_callback(job_progress_n_intervals, job_id_data):
+    """
+    Callback that shows the progress of last queued job, polled until the job is finished.
+    """
+    if job_id_data is None or str(job_id_data).strip() == "":
+        return (
+            [],
+            True,
+        )
+
+    job_dict: dict = job_queue.get_job(job_id=job_id_data)
+    if job_dict is None:
+        return (
+            [],
+            True,
+        )
+
+    total_ids_count: int = job_dict["MAX_GENERATE_LIMIT"] * len(
+        job_dict["CAP_COLOR_CODES"]
+    )
+    job_title_str: str = f"Job {job_dict['PART_CATEGORY']} ({', '.join(job_dict['CAP_COLOR_CODES'])}) : {job_dict['STATE'].capitalize()}"
+
+    if job_dict["STATE"] == "QUEUED":
+        return (
+            dmc.Stack(
+                spacing="xs",
+                children=[
+                    dmc.Text(job_title_str, size="sm", weight=500),
+                    dmc.Text(
+                        f"Waiting at position {job_dict['QUEUE_POSITION']} in queue.",
+                        size="xs",
+                        color="gray",
+                    ),
+                ],
+            ),
+            False,
+        )
+
+    job_progress_dict: dict = job_progress.read_job_progress(
+        job_id=job_id_data,
+        total_ids_count=total_ids_count,
+    )
+    if job_progress_dict is None:
+        job_progress_dict = dict.fromkeys(job_progress.PROGRESS_COUNTER_NAMES, 0)
+        job_progress_dict.update(
+            {
+                "TOTAL_IDS_COUNT": total_ids_count,
+                "UPDATED_TIMESTAMP": job_dict["STARTED_TIMESTAMP"] or time.time(),
+                "IDS_PER_SECOND": 0.0,
+                "ETA_SECONDS": None,
+            }
+        )
+
+    is_job_running: bool = job_dict["STATE"] == "RUNNING"
+    processed_ids_count: int = (
+        job_progress_dict["IDS_SHORTENED"] + job_progress_dict["DEAD_LETTERS"]
+    )
+    progress_percent: float = (
+        100.0 * processed_ids_count / max(1, job_progress_dict["TOTAL_IDS_COUNT"])
+    )
+
+    # Running job without any update for a while is shown as stalled, for e.g. when short links API stopped responding.
+    seconds_since_update: float = max(
+        0.0, time.time() - job_progress_dict["UPDATED_TIMESTAMP"]
+    )
+    is_job_stalled: bool = (
+        is_job_running and seconds_since_update > constants.JOB_PROGRESS_STALL_SECONDS
+    )
+
+    progress_color_str: str = "green"
+    if job_dict["STATE"] == "FAILED" or is_job_stalled:
+        progress_color_str = "red"
+    elif is_job_running:
+        progress_color_str = "blue"
+
+    eta_str: str = "estimating..."
+    if not is_job_running:
+        eta_str = "-"
+    elif job_progress_dict["ETA_SECONDS"] is not None:
+        eta_str = str(datetime.timedelta(seconds=int(job_progress_dict["ETA_SECONDS"])))
+
+    status_children_list: list = [
+        dmc.Text(job_title_str, size="sm", weight=500),
+        dmc.Progress(
+            value=progress_percent,
+            label=f"{progress_percent:.1f}%",
+            size="xl",
+            radius="lg",
+            color=progress_color_str,
+            animate=is_job_running and not is_job_stalled,
+            striped=is_job_running,
+        ),
+        dmc.Text(
+            f"Generated {job_progress_dict['IDS_GENERATED']}, encrypted {job_progress_dict['IDS_ENCRYPTED']}, shortened {job_progress_dict['IDS_SHORTENED']}, written {job_progress_dict['ROWS_WRITTEN']} of {job_progress_dict['TOTAL_IDS_COUNT']} IDs.",
+            size="xs",
+        ),
+        dmc.Text(
+            f"Dead letters: {job_progress_dict['DEAD_LETTERS']}, speed: {job_progress_dict['IDS_PER_SECOND']:.2f} IDs/second, ETA: {eta_str}",
+            size="xs",
+        ),
+    ]
+
+    if is_job_running:
+        status_children_list.append(
+            dmc.Text(
+                f"Last update {int(seconds_since_update)} seconds ago"
+                + (", job seems stalled!" if is_job_stalled else "."),
+                size="xs",
+                color="red" if is_job_stalled else "gray",
+            )
+        )
+    elif job_dict["STATE"] == "FAILED":
+        status_children_list.append(
+            dmc.Text(f"Error: {job_dict['ERROR']}", size="xs", color="red")
+        )
+
+    # Finished job doesn't change anymore, so stop polling.
+    return (
+        dmc.Stack(spacing="xs", children=status_children_list),
+        not is_job_running,
     )
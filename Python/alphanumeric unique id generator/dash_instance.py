@@ -1,24 +1,27 @@
-import os
 import multiprocessing
+import os
+import sys
 
 import dash
 import dash_mantine_components as dmc
+import werkzeug.serving
 
+import batch_jobs
 import constants
+import file_downloads
+import job_queue
+import task_log
 import utility_functions
 
 
 class DashInstance:
     """
-    Class that create & hold the `dash` application instance, layout and other shared objects for easy access.
+    Class that create & hold the `dash` application instance and layout for easy access.
     """
 
     # Dash application object.
     _dashAppInstance: dash.Dash = None
 
-    # Multiprocessing lock object to protect from data race conditions.
-    _multiprocessing_lock: multiprocessing.Lock = None
-
     @staticmethod
     def _create_instance() -> None:
         """`Private method.`"""
@@ -34,6 +37,41 @@ class DashInstance:
             external_stylesheets=[os.path.join("assets", "app_style.css")],
         )
 
+        # Batch jobs can also be queued without the web page, using REST API on the same server.
+        batch_jobs.register_batch_api(server=DashInstance._dashAppInstance.server)
+
+        # Generated result & tracking files can be downloaded with the same API token.
+        file_downloads.register_download_routes(
+            server=DashInstance._dashAppInstance.server
+        )
+
+        # Only the process serving the requests runs background threads.
+        if DashInstance._is_serving_process():
+            # Expired task log segments & quota reservations are removed in background, never by the callbacks.
+            task_log.TaskLogCompactor.start()
+
+            # Queued jobs are run by the process which becomes job queue host.
+            job_queue.JobQueueHost.start()
+
+    @staticmethod
+    def _is_serving_process() -> bool:
+        """`Private method.`"""
+
+        # Spawned worker processes import the application again.
+        if multiprocessing.parent_process() is not None:
+            return False
+
+        # With debug reloader (when launched as `python3 app.py`), the first process only watches the files and
+        # restarts a child process which serves the requests.
+        main_file_path: str = getattr(sys.modules["__main__"], "__file__", None) or ""
+        if (
+            constants.IS_DASH_DEBUG_MODE
+            and os.path.basename(main_file_path) == "app.py"
+        ):
+            return werkzeug.serving.is_running_from_reloader()
+
+        return True
+
     @staticmethod
     def get_instance() -> dash.Dash:
         """
@@ -46,18 +84,6 @@ class DashInstance:
 
         return DashInstance._dashAppInstance
 
-    @staticmethod
-    def get_multiprocessing_lock() -> multiprocessing.Lock:
-        """
-        Return the multiprocessing lock object for avoiding data race conditions.
-
-        `Public method.`
-        """
-        if DashInstance._multiprocessing_lock is None:
-            DashInstance._multiprocessing_lock = multiprocessing.Lock()
-
-        return DashInstance._multiprocessing_lock
-
     @staticmethod
     def get_main_layout() -> dash.html.Div:
         """
@@ -65,6 +91,7 @@ class DashInstance:
 
         `Public method.`
         """
+        remaining_quota: int = utility_functions.get_google_api_remaining_quota()
 
         return dash.html.Div(
             children=[
@@ -155,15 +182,12 @@ class DashInstance:
                                                 ),
                                                 dmc.Highlight(
                                                     id="remaining-quota-highlight",
-                                                    children=f"Remaining quota: {utility_functions.get_google_api_remaining_quota()}",
+                                                    children=f"Remaining quota: {remaining_quota}",
                                                     color="black",
                                                     highlightColor="yellow"
-                                                    if (
-                                                        utility_functions.get_google_api_remaining_quota()
-                                                        > 0
-                                                    )
+                                                    if (remaining_quota > 0)
                                                     else "red",
-                                                    highlight=f"Remaining quota: {utility_functions.get_google_api_remaining_quota()}",
+                                                    highlight=f"Remaining quota: {remaining_quota}",
                                                 ),
                                             ],
                                         ),
@@ -172,12 +196,9 @@ class DashInstance:
                                         stepHoldInterval=100,
                                         value=0,
                                         min=10
-                                        if (
-                                            10
-                                            < utility_functions.get_google_api_remaining_quota()
-                                        )
-                                        else utility_functions.get_google_api_remaining_quota(),
-                                        max=utility_functions.get_google_api_remaining_quota(),
+                                        if (10 < remaining_quota)
+                                        else remaining_quota,
+                                        max=remaining_quota,
                                     ),
                                     dmc.Space(),
                                     dmc.Button(
@@ -188,6 +209,17 @@ class DashInstance:
                                         size="md",
                                         radius="lg",
                                     ),
+                                    # Last queued job is kept for the browser tab, so its progress is shown even after reload.
+                                    dash.dcc.Store(
+                                        id="job-id-store",
+                                        storage_type="session",
+                                    ),
+                                    dash.dcc.Interval(
+                                        id="job-progress-interval",
+                                        interval=constants.JOB_PROGRESS_POLL_INTERVAL_MILLISECONDS,
+                                        disabled=True,
+                                    ),
+                                    dash.html.Div(id="job-progress-view"),
                                     dmc.Alert(
                                         children=dmc.Stack(
                                             children=[
@@ -0,0 +1,283 @@
+"""
+Persisted dead letters of unique IDs whose short URLs couldn't be received even after retries, and the command to resume them.
+
+Dead letters of every generation job are stored as a CSV file inside `DEAD_LETTERS_DIR_PATH` (from `constants` module),
+named same as the result Excel file of that job. Resuming requests their short URLs again and writes the received ones
+to a supplementary result Excel file, without generating the whole job again. Quota of the requested short URLs is
+reserved in `quota_ledger` module before, and the quota of ones still missing is released after.
+
+To resume all the stored dead letters, run command: `python3 dead_letter_queue.py`
+"""
+
+import argparse
+import glob
+import os
+import typing
+
+import pandas as pd
+
+import constants
+import file_lock
+import quota_ledger
+import result_writer
+import short_url_retry
+import utility_functions
+
+
+# Columns of dead letters CSV files.
+DEAD_LETTER_COLUMNS: typing.List[str] = [
+    "RESULT_FILE_NAME",
+    "PRODUCT_CATEGORY",
+    "CAP_COLOUR",
+    "GENERATION_DATE",
+    "UNIQUE_ID",
+    "ENCRYPTED_ENCODED",
+    "LAST_STATUS_CODE",
+    "DEAD_LETTERED_DATETIME",
+]
+
+
+# Prefix of lock names of dead letters CSV files.
+_LOCK_NAME_PREFIX: str = "DEAD_LETTERS_"
+
+
+def _get_lock_name(dead_letter_file_path: str) -> str:
+    """`Private method.`"""
+
+    return f"{_LOCK_NAME_PREFIX}{os.path.basename(dead_letter_file_path)}"
+
+
+def get_dead_letter_file_path(result_file_path: str) -> str:
+    """
+    Returns the dead letters CSV file path for the generation job writing its result at `result_file_path`.
+    """
+    os.makedirs(name=constants.DEAD_LETTERS_DIR_PATH, exist_ok=True)
+
+    result_file_name: str = os.path.splitext(os.path.basename(result_file_path))[0]
+
+    return os.path.join(constants.DEAD_LETTERS_DIR_PATH, f"{result_file_name}.csv")
+
+
+def append_dead_letters(
+    result_file_path: str,
+    dead_letters_df: pd.DataFrame,
+) -> None:
+    """
+    Appends `dead_letters_df` (having `DEAD_LETTER_COLUMNS` except "RESULT_FILE_NAME" and "DEAD_LETTERED_DATETIME")
+    to dead letters CSV file of the generation job writing its result at `result_file_path`.
+    """
+    if len(dead_letters_df.index) <= 0:
+        return
+
+    dead_letter_file_path: str = get_dead_letter_file_path(
+        result_file_path=result_file_path
+    )
+
+    dead_letters_df = dead_letters_df.assign(
+        RESULT_FILE_NAME=os.path.basename(result_file_path),
+        DEAD_LETTERED_DATETIME=utility_functions.get_current_datetime_for_IST().strftime(
+            constants.ID_GENERATION_TRACKING_DATETIME_FORMAT
+        ),
+    )[DEAD_LETTER_COLUMNS]
+
+    with file_lock.acquire_file_lock(
+        lock_name=_get_lock_name(dead_letter_file_path=dead_letter_file_path)
+    ):
+        dead_letters_df.to_csv(
+            dead_letter_file_path,
+            mode="a",
+            index=False,
+            header=not os.path.isfile(dead_letter_file_path)
+            or os.path.getsize(dead_letter_file_path) <= 0,
+        )
+
+    print(
+        f"[!] Moved {len(dead_letters_df.index)} Unique IDs without short URLs to dead letters: {dead_letter_file_path}"
+    )
+
+
+def resume_dead_letters(
+    dead_letter_file_path: str,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+) -> str:
+    """
+    Requests the short URLs for all Unique IDs stored at `dead_letter_file_path` again, and writes the received ones
+    to a supplementary result Excel file next to the original result file of that job.
+
+    Unique IDs still missing their short URLs are kept in `dead_letter_file_path`, which is removed once none are left.
+    Returns the supplementary result file path, or empty string if no short URL was received (or remaining quota isn't
+    enough to request all of them).
+
+    Args:
+
+    `dead_letter_file_path` - The dead letters CSV file path to be resumed.
+    `requests_per_second` - The maximum number of POST requests per second.
+    """
+    # Lock is held till the end, so a dead letter is never lost or resumed twice in parallel.
+    with file_lock.acquire_file_lock(
+        lock_name=_get_lock_name(dead_letter_file_path=dead_letter_file_path)
+    ):
+        if not os.path.isfile(dead_letter_file_path):
+            return ""
+
+        dead_letters_df: pd.DataFrame = pd.read_csv(
+            dead_letter_file_path,
+            dtype=str,
+            keep_default_na=False,
+        )
+
+        # Short URLs requested again cost the daily quota as well, so those are reserved like a new job.
+        dead_letters_count: int = len(dead_letters_df.index)
+        quota_reservation_timestamp: float = (
+            quota_ledger.QuotaLedger.get_instance().reserve(count=dead_letters_count)
+        )
+        if quota_reservation_timestamp is None:
+            print(
+                f"[!] Remaining quota is {quota_ledger.QuotaLedger.get_instance().get_remaining_quota()}, which isn't enough to resume {dead_letters_count} Unique IDs : {dead_letter_file_path}"
+            )
+            return ""
+
+        unique_ids_to_short_url_dict: dict = {}
+        missing_statuses_dict: typing.Dict[
+            str, int
+        ] = short_url_retry.retry_missing_short_urls(
+            encrypted_encoded_coupon_codes_list=dead_letters_df[
+                "ENCRYPTED_ENCODED"
+            ].tolist(),
+            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+            circuit_breaker=short_url_retry.CircuitBreaker(),
+            requests_per_second=requests_per_second,
+        )
+
+        dead_letters_df["SHORT_URL"] = (
+            dead_letters_df["ENCRYPTED_ENCODED"]
+            .map(unique_ids_to_short_url_dict)
+            .fillna("")
+        )
+        resumed_df: pd.DataFrame = dead_letters_df.loc[
+            dead_letters_df["SHORT_URL"] != ""
+        ]
+
+        # Quota of the ones still missing is given back, as those stay in dead letters for the next resume.
+        quota_ledger.QuotaLedger.get_instance().release(
+            count=dead_letters_count - len(resumed_df.index),
+            reservation_timestamp=quota_reservation_timestamp,
+        )
+
+        supplementary_file_path: str = ""
+
+        if len(resumed_df.index) > 0:
+            result_file_name: str = os.path.splitext(
+                resumed_df["RESULT_FILE_NAME"].iat[0]
+            )[0]
+            supplementary_file_path = utility_functions.reserve_file_path(
+                dir_path=constants.RESULT_EXCEL_DIRPATH,
+                file_name=f"{result_file_name}_RESUMED",
+                file_extension="xlsx",
+            )
+
+            result_excel_writer: result_writer.ResultExcelWriter = (
+                result_writer.ResultExcelWriter(
+                    file_path=supplementary_file_path,
+                    sheet_title="RESUMED",
+                )
+            )
+            result_excel_writer.append_rows(
+                rows_iter=resumed_df[
+                    ["PRODUCT_CATEGORY", "CAP_COLOUR", "SHORT_URL", "GENERATION_DATE"]
+                ].itertuples(index=False, name=None)
+            )
+            result_excel_writer.close()
+
+        # Keep only the ones still missing, with their latest status code.
+        remaining_df: pd.DataFrame = dead_letters_df.loc[
+            dead_letters_df["SHORT_URL"] == "", DEAD_LETTER_COLUMNS
+        ].copy()
+        remaining_df["LAST_STATUS_CODE"] = [
+            str(missing_statuses_dict.get(encrypted_encoded_id, last_status_code))
+            for encrypted_encoded_id, last_status_code in zip(
+                remaining_df["ENCRYPTED_ENCODED"], remaining_df["LAST_STATUS_CODE"]
+            )
+        ]
+
+        if len(remaining_df.index) > 0:
+            temp_file_path: str = f"{dead_letter_file_path}.{os.getpid()}.tmp"
+            remaining_df.to_csv(temp_file_path, index=False)
+            os.replace(temp_file_path, dead_letter_file_path)
+        else:
+            os.remove(dead_letter_file_path)
+
+    print(
+        f"- Resumed {len(resumed_df.index)} Unique IDs, still missing {len(remaining_df.index)} : {dead_letter_file_path}"
+    )
+
+    return supplementary_file_path
+
+
+def resume_all_dead_letters(
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+) -> typing.List[str]:
+    """
+    Resumes every dead letters CSV file stored inside `DEAD_LETTERS_DIR_PATH` and returns the list of supplementary result file paths.
+    """
+    os.makedirs(name=constants.DEAD_LETTERS_DIR_PATH, exist_ok=True)
+
+    supplementary_file_paths_list: typing.List[str] = []
+
+    for dead_letter_file_path in sorted(
+        glob.glob(os.path.join(constants.DEAD_LETTERS_DIR_PATH, "*.csv"))
+    ):
+        supplementary_file_path: str = resume_dead_letters(
+            dead_letter_file_path=dead_letter_file_path,
+            requests_per_second=requests_per_second,
+        )
+        if supplementary_file_path != "":
+            supplementary_file_paths_list.append(supplementary_file_path)
+
+    return supplementary_file_paths_list
+
+
+def remove_unused_lock_files() -> int:
+    """
+    Removes the lock files of dead letters CSV files which don't exist anymore (i.e. resumed completely), and returns
+    the number of removed lock files.
+    """
+    existing_lock_names_set: typing.Set[str] = {
+        _get_lock_name(dead_letter_file_path=dead_letter_file_path).upper()
+        for dead_letter_file_path in glob.glob(
+            os.path.join(constants.DEAD_LETTERS_DIR_PATH, "*.csv")
+        )
+    }
+    removed_files_count: int = 0
+
+    for lock_file_path in glob.glob(
+        os.path.join(constants.LOCKS_DIR_PATH, f"{_LOCK_NAME_PREFIX}*.lock")
+    ):
+        lock_name: str = os.path.splitext(os.path.basename(lock_file_path))[0]
+        if lock_name in existing_lock_names_set:
+            continue
+
+        # Lock held by a job or resume in progress is kept, and removed in a later sweep.
+        if file_lock.remove_lock_file(lock_name=lock_name):
+            removed_files_count += 1
+
+    return removed_files_count
+
+
+# Handle execution in case launched as a stand-alone script, to resume the dead letters.
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Request the short URLs again for Unique IDs stored in dead letters."
+    )
+    argument_parser.add_argument(
+        "dead_letter_file_paths",
+        nargs="*",
+        help="Dead letters CSV file paths to resume. Default is all files inside dead letters directory.",
+    )
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    if len(arguments.dead_letter_file_paths) > 0:
+        for dead_letter_file_path in arguments.dead_letter_file_paths:
+            print(resume_dead_letters(dead_letter_file_path=dead_letter_file_path))
+    else:
+        print(resume_all_dead_letters())
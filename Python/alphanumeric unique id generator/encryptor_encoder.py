@@ -1,54 +1,484 @@
+import abc
 import base64
+import binascii
+import concurrent.futures
+import hashlib
+import hmac
+import math
 import os
+import secrets
+import typing
 
 import rsa
 
 import constants
+import file_lock
+
+
+class EncryptionKeys:
+    """
+    Class that load (or generate if not exist) the RSA public and private keys only once per process, and hold them for easy access.
+    """
+
+    # RSA public key object used for encryption.
+    _public_key: rsa.PublicKey = None
+
+    # RSA private key object used for decryption.
+    _private_key: rsa.PrivateKey = None
+
+    @staticmethod
+    def _write_key_file(file_path: str, key_data: bytes) -> None:
+        """`Private method.`"""
+
+        # Write to a temporary file first and then replace, so other processes never read a partially written key.
+        temp_file_path: str = f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_file_path, "wb") as key_file:
+            key_file.write(key_data)
+        os.replace(temp_file_path, file_path)
+
+    @staticmethod
+    def _load_keys() -> None:
+        """`Private method.`"""
+
+        # Create a sub-directory where all public and private secret key files are stored.
+        secret_keys_dir_name: str = constants.SECRET_KEYS_DIR_PATH
+        os.makedirs(name=secret_keys_dir_name, exist_ok=True)
+
+        # Create file names for public and private key files.
+        public_encryptor_file_path: str = os.path.join(
+            secret_keys_dir_name, f"public_encryptor.pem"
+        )
+        private_decryptor_file_path: str = os.path.join(
+            secret_keys_dir_name, f"private_decryptor.pem"
+        )
+
+        # Lock ensures that only one process generates the new keys, if those are not found.
+        with file_lock.acquire_file_lock(lock_name="SECRET_KEYS"):
+            if not os.path.exists(public_encryptor_file_path) or not os.path.exists(
+                private_decryptor_file_path
+            ):
+                # If any one of keys not found, then generate and store new keys.
+                public_key, private_key = rsa.newkeys(256)
+
+                EncryptionKeys._write_key_file(
+                    file_path=private_decryptor_file_path,
+                    key_data=private_key.save_pkcs1(),
+                )
+                EncryptionKeys._write_key_file(
+                    file_path=public_encryptor_file_path,
+                    key_data=public_key.save_pkcs1(),
+                )
+
+            else:
+                # Otherwise, read key data from existing files.
+                with open(public_encryptor_file_path, "rb") as public_file:
+                    public_key = rsa.PublicKey.load_pkcs1(public_file.read())
+
+                with open(private_decryptor_file_path, "rb") as private_file:
+                    private_key = rsa.PrivateKey.load_pkcs1(private_file.read())
+
+        EncryptionKeys._public_key = public_key
+        EncryptionKeys._private_key = private_key
+
+    @staticmethod
+    def get_public_key() -> rsa.PublicKey:
+        """
+        Return the RSA public key, ensuring key files are read only once per process.
+
+        `Public method.`
+        """
+        if EncryptionKeys._public_key is None:
+            EncryptionKeys._load_keys()
+
+        return EncryptionKeys._public_key
+
+    @staticmethod
+    def get_private_key() -> rsa.PrivateKey:
+        """
+        Return the RSA private key, ensuring key files are read only once per process.
+
+        `Public method.`
+        """
+        if EncryptionKeys._private_key is None:
+            EncryptionKeys._load_keys()
+
+        return EncryptionKeys._private_key
+
+
+class SymmetricTokenKeys:
+    """
+    Class that load (or generate if not exist) the versioned secret keys for symmetric token cipher only once per process, and hold them for easy access.
+    """
+
+    # Mapping of key version with its (tag key, stream key) pair.
+    _keys_dict: typing.Dict[int, typing.Tuple[bytes, bytes]] = {}
+
+    @staticmethod
+    def _load_keys(key_version: int) -> None:
+        """`Private method.`"""
+
+        os.makedirs(name=constants.SECRET_KEYS_DIR_PATH, exist_ok=True)
+
+        key_file_path: str = os.path.join(
+            constants.SECRET_KEYS_DIR_PATH, f"symmetric_token_key_v{key_version}.bin"
+        )
+
+        # Lock ensures that only one process generates the new key, if it's not found.
+        with file_lock.acquire_file_lock(lock_name="SECRET_KEYS"):
+            if not os.path.exists(key_file_path):
+                if key_version != constants.SYMMETRIC_TOKEN_KEY_VERSION:
+                    raise ValueError(
+                        f"Symmetric token key not found for version: {key_version}"
+                    )
+
+                EncryptionKeys._write_key_file(
+                    file_path=key_file_path,
+                    key_data=secrets.token_bytes(64),
+                )
+
+            with open(key_file_path, "rb") as key_file:
+                key_data: bytes = key_file.read()
+
+        SymmetricTokenKeys._keys_dict[key_version] = (key_data[:32], key_data[32:])
+
+    @staticmethod
+    def get_keys(key_version: int) -> typing.Tuple[bytes, bytes]:
+        """
+        Return the (tag key, stream key) pair for `key_version`, ensuring key file is read only once per process.
+
+        `Public method.`
+        """
+        if key_version not in SymmetricTokenKeys._keys_dict:
+            SymmetricTokenKeys._load_keys(key_version=key_version)
+
+        return SymmetricTokenKeys._keys_dict[key_version]
+
+
+class TokenCipher(abc.ABC):
+    """
+    Abstract base class for ciphers that convert a Unique ID to URL-safe token and back. A cipher not implementing
+    `encrypt_encode()` and `decode_decrypt()` fails as soon as it's instantiated.
+
+    Every cipher other than RSA (which predates the token prefixes) starts its tokens with a prefix naming the cipher
+    and its key version, so tokens created by any cipher can still be decoded after the configured cipher changes.
+    """
+
+    # Whether encryption is CPU heavy enough to be worth splitting across worker processes.
+    IS_CPU_HEAVY: bool = False
+
+    def load_keys(self) -> None:
+        """
+        Loads the keys needed for encryption, so later calls won't wait for it.
+        """
+
+    @abc.abstractmethod
+    def encrypt_encode(self, unique_id_str: str) -> str:
+        """
+        Returns URL-safe token for `unique_id_str`.
+        """
+
+    def encrypt_encode_many(
+        self, unique_ids_list: typing.List[str]
+    ) -> typing.List[str]:
+        """
+        Returns URL-safe tokens for all `unique_ids_list`, in the same order.
+        """
+        return [self.encrypt_encode(unique_id_str) for unique_id_str in unique_ids_list]
+
+    @abc.abstractmethod
+    def decode_decrypt(self, token_str: str) -> str:
+        """
+        Returns the Unique ID from `token_str`. Raises `ValueError` if the token is not valid.
+        """
+
+
+class RSATokenCipher(TokenCipher):
+    """
+    Random-padded RSA (256 bits key) encryption, with URL-safe Base64 encoding. Creates 44 characters long tokens without any prefix.
+    """
+
+    IS_CPU_HEAVY: bool = True
+
+    def load_keys(self) -> None:
+        EncryptionKeys.get_public_key()
+
+    def encrypt_encode(self, unique_id_str: str) -> str:
+        encrypted_message: bytes = rsa.encrypt(
+            unique_id_str.encode(), EncryptionKeys.get_public_key()
+        )
+        base64_encoded: bytes = base64.urlsafe_b64encode(encrypted_message)
+
+        return base64_encoded.decode()
+
+    def encrypt_encode_many(
+        self, unique_ids_list: typing.List[str]
+    ) -> typing.List[str]:
+        public_key: rsa.PublicKey = EncryptionKeys.get_public_key()
+
+        return [
+            base64.urlsafe_b64encode(
+                rsa.encrypt(unique_id_str.encode(), public_key)
+            ).decode()
+            for unique_id_str in unique_ids_list
+        ]
+
+    def decode_decrypt(self, token_str: str) -> str:
+        try:
+            return rsa.decrypt(
+                base64.urlsafe_b64decode(token_str.encode()),
+                EncryptionKeys.get_private_key(),
+            ).decode()
+        except (binascii.Error, rsa.DecryptionError, UnicodeDecodeError) as ex:
+            raise ValueError(f"Invalid RSA token: {token_str}") from ex
+
+
+class Blake2SIVTokenCipher(TokenCipher):
+    """
+    Deterministic authenticated encryption following SIV (synthetic initialization vector) construction using keyed BLAKE2b.
+
+    An 8 bytes tag is computed from the Unique ID, then the Unique ID is XOR-ed with a key stream derived from that tag.
+    Token is the prefix ("s" with key version, for e.g. "s1.") followed by unpadded URL-safe Base64 of tag and cipher text,
+    which is 29 characters for an 11 characters Unique ID. Tampered tokens fail the tag verification while decoding.
+
+    Threat model: tokens are printed on products and seen by anyone, while the keys never leave the server and tokens
+    are verified only by this server (there's no offline verification). The cipher has to stop forged tokens, i.e. tokens
+    of Unique IDs never generated, from decoding as genuine. Hiding the Unique IDs is secondary, as those are sequential.
+
+    Forgery bound: keyed BLAKE2b is a PRF, so each forged token sent for decoding is accepted with probability at most
+    2^-64, i.e. at most q / 2^64 for q attempts. Even 10^9 attempts (far more than the decode service can be sent
+    unnoticed) succeed with probability below 6 * 10^-11, which is why an 8 bytes tag (keeping tokens short enough
+    for the QR codes) is enough. Tag also acts as the IV, so two Unique IDs having the same tag share their key stream.
+    For n tokens of a key version that happens with probability about n^2 / 2^65 (below 3 * 10^-4 for 10^8 tokens),
+    and only reveals the XOR of two sequential Unique IDs, never lets a token be forged. Increasing
+    `SYMMETRIC_TOKEN_KEY_VERSION` (from `constants` module) starts a new key, which resets n.
+    """
+
+    TAG_SIZE: int = 8
+    PREFIX_LETTER: str = "s"
+
+    def __init__(self, key_version: int = None) -> None:
+        self.key_version: int = (
+            constants.SYMMETRIC_TOKEN_KEY_VERSION
+            if key_version is None
+            else key_version
+        )
+        self.token_prefix: str = f"{self.PREFIX_LETTER}{self.key_version}."
+
+    def load_keys(self) -> None:
+        SymmetricTokenKeys.get_keys(key_version=self.key_version)
+
+    @staticmethod
+    def _get_key_stream(stream_key: bytes, tag: bytes, length: int) -> bytes:
+        """
+        Returns `length` bytes of key stream derived from `tag`.
+        """
+        key_stream: bytes = b""
+        block_idx: int = 0
+        while len(key_stream) < length:
+            key_stream += hashlib.blake2b(
+                tag + block_idx.to_bytes(4, "big"), key=stream_key, digest_size=64
+            ).digest()
+            block_idx += 1
+        return key_stream[:length]
+
+    def encrypt_encode(self, unique_id_str: str) -> str:
+        tag_key, stream_key = SymmetricTokenKeys.get_keys(key_version=self.key_version)
+
+        plain_bytes: bytes = unique_id_str.encode()
+        tag: bytes = hashlib.blake2b(
+            plain_bytes, key=tag_key, digest_size=self.TAG_SIZE
+        ).digest()
+        key_stream: bytes = self._get_key_stream(
+            stream_key=stream_key, tag=tag, length=len(plain_bytes)
+        )
+        cipher_bytes: bytes = bytes(
+            plain_byte ^ stream_byte
+            for plain_byte, stream_byte in zip(plain_bytes, key_stream)
+        )
+
+        return self.token_prefix + base64.urlsafe_b64encode(
+            tag + cipher_bytes
+        ).decode().rstrip("=")
+
+    def decode_decrypt(self, token_str: str) -> str:
+        if not token_str.startswith(self.token_prefix):
+            raise ValueError(f"Invalid token prefix: {token_str}")
+
+        encoded_str: str = token_str[len(self.token_prefix) :]
+        try:
+            token_bytes: bytes = base64.urlsafe_b64decode(
+                encoded_str + "=" * (-len(encoded_str) % 4)
+            )
+        except binascii.Error as ex:
+            raise ValueError(f"Invalid token encoding: {token_str}") from ex
+
+        if len(token_bytes) <= self.TAG_SIZE:
+            raise ValueError(f"Invalid token length: {token_str}")
+
+        tag_key, stream_key = SymmetricTokenKeys.get_keys(key_version=self.key_version)
+        tag: bytes = token_bytes[: self.TAG_SIZE]
+        cipher_bytes: bytes = token_bytes[self.TAG_SIZE :]
+        key_stream: bytes = self._get_key_stream(
+            stream_key=stream_key, tag=tag, length=len(cipher_bytes)
+        )
+        plain_bytes: bytes = bytes(
+            cipher_byte ^ stream_byte
+            for cipher_byte, stream_byte in zip(cipher_bytes, key_stream)
+        )
+
+        expected_tag: bytes = hashlib.blake2b(
+            plain_bytes, key=tag_key, digest_size=self.TAG_SIZE
+        ).digest()
+        if not hmac.compare_digest(tag, expected_tag):
+            raise ValueError(f"Invalid token tag: {token_str}")
+
+        try:
+            return plain_bytes.decode()
+        except UnicodeDecodeError as ex:
+            raise ValueError(f"Invalid token content: {token_str}") from ex
+
+
+# Mapping of names (used by `TOKEN_CIPHER_BACKEND` in `constants` module) with their cipher classes.
+TOKEN_CIPHERS_DICT: typing.Dict[str, typing.Type[TokenCipher]] = {
+    "rsa": RSATokenCipher,
+    "blake2-siv": Blake2SIVTokenCipher,
+}
+
+
+def get_token_cipher(backend_name: str = None) -> TokenCipher:
+    """
+    Returns the cipher object for `backend_name`. Default is `TOKEN_CIPHER_BACKEND` from `constants` module.
+    """
+    if backend_name is None:
+        backend_name = constants.TOKEN_CIPHER_BACKEND
+
+    if backend_name not in TOKEN_CIPHERS_DICT:
+        raise ValueError(f"Unknown token cipher backend: {backend_name}")
+
+    return TOKEN_CIPHERS_DICT[backend_name]()
+
+
+def get_token_cipher_for_token(token_str: str) -> TokenCipher:
+    """
+    Returns the cipher object which created `token_str`, based on its prefix. Tokens without any prefix are RSA tokens.
+    """
+    prefix_str, separator_str, _ = token_str.partition(".")
+
+    if separator_str == "":
+        return RSATokenCipher()
+
+    if (
+        prefix_str.startswith(Blake2SIVTokenCipher.PREFIX_LETTER)
+        and prefix_str[1:].isdigit()
+    ):
+        return Blake2SIVTokenCipher(key_version=int(prefix_str[1:]))
+
+    raise ValueError(f"Unknown token prefix: {token_str}")
+
+
+class EncryptionProcessPool:
+    """
+    Class that create & hold the process pool used to encrypt large batches of Unique IDs on multiple CPU cores.
+    """
+
+    # Process pool executor whose workers load the RSA keys once, when they start.
+    _process_pool_executor: concurrent.futures.ProcessPoolExecutor = None
+
+    # Number of worker processes in above process pool.
+    _max_workers: int = 0
+
+    @staticmethod
+    def get_instance(max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+        """
+        Return the process pool with `max_workers` worker processes, ensuring it's created only once per process.
+
+        `Public method.`
+        """
+        if (
+            EncryptionProcessPool._process_pool_executor is None
+            or EncryptionProcessPool._max_workers != max_workers
+        ):
+            if EncryptionProcessPool._process_pool_executor is not None:
+                EncryptionProcessPool._process_pool_executor.shutdown(wait=True)
+
+            EncryptionProcessPool._process_pool_executor = (
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_initialize_encryption_worker,
+                )
+            )
+            EncryptionProcessPool._max_workers = max_workers
+
+        return EncryptionProcessPool._process_pool_executor
+
+
+def _initialize_encryption_worker() -> None:
+    """
+    Loads the keys of configured cipher once, when a worker process of encryption pool starts.
+    """
+    get_token_cipher().load_keys()
 
 
 def encrypt_encode_unique_id(
     unique_id_str: str,
 ) -> str:
     """
-    Returns encrypted and URL-safe Base64 encoded representation of `unique_id_str` in string format.
+    Returns encrypted and URL-safe encoded representation of `unique_id_str` in string format, using the cipher configured
+    by `TOKEN_CIPHER_BACKEND` in `constants` module.
     """
+    return get_token_cipher().encrypt_encode(unique_id_str)
 
-    # Create a sub-directory where all public and private secret key files are stored.
-    secret_keys_dir_name: str = constants.SECRET_KEYS_DIR_PATH
-    os.makedirs(name=secret_keys_dir_name, exist_ok=True)
 
-    # Create file names for public and private key files.
-    public_encryptor_file_path: str = os.path.join(
-        secret_keys_dir_name, f"public_encryptor.pem"
-    )
-    private_decryptor_file_path: str = os.path.join(
-        secret_keys_dir_name, f"private_decryptor.pem"
-    )
+def decode_decrypt_token(
+    token_str: str,
+) -> str:
+    """
+    Returns the Unique ID from `token_str` created by any of the ciphers. Raises `ValueError` if the token is not valid.
+    """
+    return get_token_cipher_for_token(token_str=token_str).decode_decrypt(token_str)
+
 
-    public_key: rsa.PublicKey = None
-    private_key: rsa.PrivateKey = None
+def _encrypt_encode_unique_ids_in_process(
+    unique_ids_list: typing.List[str],
+) -> typing.List[str]:
+    """
+    Returns encrypted and URL-safe encoded representations of all `unique_ids_list`, using current process only.
+    """
+    return get_token_cipher().encrypt_encode_many(unique_ids_list)
 
-    if not os.path.exists(public_encryptor_file_path) or not os.path.exists(
-        private_decryptor_file_path
-    ):
-        # If any one of keys not found, then generate and store new keys.
-        public_key, private_key = rsa.newkeys(256)
 
-        with open(public_encryptor_file_path, "wb") as public_file:
-            public_file.write(public_key.save_pkcs1())
+def encrypt_encode_unique_ids(
+    unique_ids_list: typing.List[str],
+    max_workers: int = 1,
+) -> typing.List[str]:
+    """
+    Returns encrypted and URL-safe encoded representations of all `unique_ids_list` in string format, in the same order.
 
-        with open(private_decryptor_file_path, "wb") as private_file:
-            private_file.write(private_key.save_pkcs1())
+    Args:
 
-    else:
-        # Otherwise, read key data from existing files.
-        with open(public_encryptor_file_path, "rb") as public_file:
-            public_key = rsa.PublicKey.load_pkcs1(public_file.read())
+    `unique_ids_list` - The list of Unique IDs to be encrypted and encoded.
+    `max_workers` - The number of worker processes used to split the encryption across CPU cores. Default is `1`, i.e. encrypt in current process.
+    """
+    # Small batches (or fast ciphers) are faster in current process, than sending them to worker processes.
+    if (
+        max_workers <= 1
+        or not get_token_cipher().IS_CPU_HEAVY
+        or len(unique_ids_list) < max_workers * 100
+    ):
+        return _encrypt_encode_unique_ids_in_process(unique_ids_list=unique_ids_list)
 
-        with open(private_decryptor_file_path, "rb") as private_file:
-            private_key = rsa.PrivateKey.load_pkcs1(private_file.read())
+    # Split into few contiguous sub-batches per worker, so the results can be joined back in the same order
+    # while the workers finishing early can pick the remaining sub-batches.
+    sub_batch_size: int = math.ceil(len(unique_ids_list) / (max_workers * 4))
+    sub_batches_list: typing.List[typing.List[str]] = [
+        unique_ids_list[start_idx : start_idx + sub_batch_size]
+        for start_idx in range(0, len(unique_ids_list), sub_batch_size)
+    ]
 
-    encrypted_message: bytes = rsa.encrypt(unique_id_str.encode(), public_key)
-    base64_encoded: bytes = base64.urlsafe_b64encode(encrypted_message)
+    encrypted_encoded_ids_list: typing.List[str] = []
+    for encrypted_encoded_sub_batch in EncryptionProcessPool.get_instance(
+        max_workers=max_workers
+    ).map(_encrypt_encode_unique_ids_in_process, sub_batches_list):
+        encrypted_encoded_ids_list.extend(encrypted_encoded_sub_batch)
 
-    return base64_encoded.decode()
+    return encrypted_encoded_ids_list
@@ -0,0 +1,180 @@
+"""
+Authenticated downloads of generated result Excel files and tracking CSV files, served by the Flask server of Dash application.
+
+Files are streamed from disk in blocks, so even the largest of them are never loaded into memory. Responses support
+conditional requests ("If-None-Match" & "If-Modified-Since"), and "Range" requests to resume a broken download.
+CSV files are compressed on the fly for clients accepting "gzip", unless they request a range.
+
+Routes are under "/api/", so they require the same API token as the batch API of `batch_jobs` module.
+"""
+
+import os
+import typing
+import zlib
+
+import flask
+import werkzeug.security
+
+import constants
+
+
+DOWNLOAD_DIR_PATHS_DICT: typing.Dict[str, str] = {
+    "result": constants.RESULT_EXCEL_DIRPATH,
+    "tracking": constants.TRACKING_INDEXING_DIRPATH,
+}
+""" Directories of downloadable files, against the file kinds used in download routes. """
+
+
+def _get_download_file_path(file_kind: str, file_name: str) -> str:
+    """
+    Returns the path of downloadable file `file_name` of `file_kind`, or `None` if there's no such file.
+    """
+    if file_kind not in DOWNLOAD_DIR_PATHS_DICT:
+        return None
+
+    # Joined path is `None` if the file name tries to reach outside of the directory, for e.g. "../constants.py".
+    file_path: str = werkzeug.security.safe_join(
+        os.path.abspath(DOWNLOAD_DIR_PATHS_DICT[file_kind]), file_name
+    )
+    if file_path is None or not os.path.isfile(file_path):
+        return None
+
+    return file_path
+
+
+def list_download_files(file_kind: str) -> typing.List[dict]:
+    """
+    Returns the downloadable files of `file_kind` (from `DOWNLOAD_DIR_PATHS_DICT`) as `dict`s with their "FILE_NAME",
+    "SIZE_BYTES" & "MODIFIED_TIMESTAMP", newest first.
+
+    Result Excel file of a running job stays empty until the job is finished.
+    """
+    files_list: typing.List[dict] = []
+
+    try:
+        dir_entries_iter: typing.Iterator[os.DirEntry] = os.scandir(
+            DOWNLOAD_DIR_PATHS_DICT[file_kind]
+        )
+    except FileNotFoundError:
+        # Nothing is generated yet.
+        return files_list
+
+    with dir_entries_iter:
+        for dir_entry in dir_entries_iter:
+            if not dir_entry.is_file():
+                continue
+
+            file_stat: os.stat_result = dir_entry.stat()
+            files_list.append(
+                {
+                    "FILE_NAME": dir_entry.name,
+                    "SIZE_BYTES": file_stat.st_size,
+                    "MODIFIED_TIMESTAMP": file_stat.st_mtime,
+                }
+            )
+
+    return sorted(
+        files_list, key=lambda file_dict: file_dict["MODIFIED_TIMESTAMP"], reverse=True
+    )
+
+
+def _stream_gzip_file(file_path: str) -> typing.Iterator[bytes]:
+    """
+    Yields the content of file at `file_path` compressed as gzip, reading `DOWNLOAD_GZIP_CHUNK_SIZE_BYTES`
+    (from `constants` module) at once.
+    """
+    # Window bits above 16 write the gzip header & trailer, instead of zlib ones.
+    compressor: typing.Any = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+
+    with open(file_path, mode="rb") as download_file:
+        while True:
+            file_chunk: bytes = download_file.read(
+                constants.DOWNLOAD_GZIP_CHUNK_SIZE_BYTES
+            )
+            if not file_chunk:
+                break
+
+            compressed_chunk: bytes = compressor.compress(file_chunk)
+            if compressed_chunk:
+                yield compressed_chunk
+
+    yield compressor.flush()
+
+
+def _send_gzip_file(file_path: str) -> flask.Response:
+    """
+    Returns the streamed response of file at `file_path` compressed as gzip, or "304 Not Modified" if client has it already.
+    """
+    file_stat: os.stat_result = os.stat(file_path)
+
+    download_response: flask.Response = flask.Response(
+        _stream_gzip_file(file_path=file_path),
+        mimetype="text/csv",
+        direct_passthrough=True,
+    )
+    download_response.headers["Content-Encoding"] = "gzip"
+    download_response.headers[
+        "Content-Disposition"
+    ] = f'attachment; filename="{os.path.basename(file_path)}"'
+    download_response.vary.add("Accept-Encoding")
+    download_response.cache_control.no_cache = True
+    download_response.last_modified = file_stat.st_mtime
+
+    # Compressed content differs from the file, so it has its own entity tag.
+    download_response.set_etag(
+        f"{file_stat.st_mtime_ns}-{file_stat.st_size}-gzip", weak=True
+    )
+
+    return download_response.make_conditional(flask.request)
+
+
+def register_download_routes(server: flask.Flask) -> None:
+    """
+    Adds the download routes to `server`, i.e. the Flask server of Dash application.
+
+    - `GET /api/files/<file_kind>` : Responds with the downloadable files of `file_kind` ("result" or "tracking").
+    - `GET /api/files/<file_kind>/<file_name>` : Responds with the content of a file, as an attachment.
+    """
+
+    @server.route("/api/files/<file_kind>", methods=["GET"])
+    def list_files(file_kind: str) -> flask.Response:
+        if file_kind not in DOWNLOAD_DIR_PATHS_DICT:
+            return flask.jsonify({"errors": [f"Unknown file kind '{file_kind}'."]}), 404
+
+        return flask.jsonify({"files": list_download_files(file_kind=file_kind)}), 200
+
+    @server.route("/api/files/<file_kind>/<file_name>", methods=["GET"])
+    def download_file(file_kind: str, file_name: str) -> flask.Response:
+        file_path: str = _get_download_file_path(
+            file_kind=file_kind, file_name=file_name
+        )
+        if file_path is None:
+            return flask.jsonify({"errors": [f"File {file_name} not found."]}), 404
+
+        is_csv_file: bool = file_name.lower().endswith(".csv")
+
+        # Ranges refer to the bytes of file itself, so those are served uncompressed.
+        if (
+            is_csv_file
+            and "gzip" in flask.request.accept_encodings
+            and flask.request.range is None
+        ):
+            return _send_gzip_file(file_path=file_path)
+
+        # Streams the file & handles the conditional and range requests.
+        download_response: flask.Response = flask.send_file(
+            file_path,
+            as_attachment=True,
+            conditional=True,
+            max_age=0,
+        )
+        if is_csv_file:
+            download_response.vary.add("Accept-Encoding")
+
+        return download_response
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(list_download_files(file_kind="result"))
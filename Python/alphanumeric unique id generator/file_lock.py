@@ -0,0 +1,245 @@
+import contextlib
+import copy
+import os
+import threading
+import time
+import typing
+
+import constants
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class LockTimeoutError(TimeoutError):
+    """
+    Raised when a file lock couldn't be acquired within the given timeout.
+    """
+
+
+# Contention metrics of every lock acquired by current process, against lock names.
+_lock_metrics_dict: typing.Dict[str, typing.Dict[str, float]] = {}
+_lock_metrics_thread_lock: threading.Lock = threading.Lock()
+
+# Delays between the attempts to acquire a contended lock, growing upto the maximum.
+_MIN_RETRY_DELAY_SECONDS: float = 0.005
+_MAX_RETRY_DELAY_SECONDS: float = 0.1
+
+
+def _get_lock_file_path(lock_name: str) -> str:
+    """
+    Returns the lock file path for `lock_name`.
+    """
+    os.makedirs(name=constants.LOCKS_DIR_PATH, exist_ok=True)
+
+    return os.path.join(constants.LOCKS_DIR_PATH, f"{lock_name.upper()}.lock")
+
+
+def _try_lock(lock_file_ptr: typing.IO) -> bool:
+    """
+    Tries to acquire the lock on `lock_file_ptr` without waiting, and returns whether it's acquired.
+    """
+    try:
+        if os.name == "nt":
+            lock_file_ptr.seek(0)
+            msvcrt.locking(lock_file_ptr.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file_ptr.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+
+    return True
+
+
+def _unlock(lock_file_ptr: typing.IO) -> None:
+    """
+    Releases the lock on `lock_file_ptr`.
+    """
+    if os.name == "nt":
+        lock_file_ptr.seek(0)
+        with contextlib.suppress(OSError):
+            msvcrt.locking(lock_file_ptr.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(lock_file_ptr.fileno(), fcntl.LOCK_UN)
+
+
+def _is_lock_file_current(lock_file_ptr: typing.IO, lock_file_path: str) -> bool:
+    """
+    Returns whether `lock_file_ptr` is still the lock file at `lock_file_path`, i.e. it isn't removed by
+    `remove_lock_file()` while waiting for its lock.
+    """
+    # Open file can't be removed on Windows.
+    if os.name == "nt":
+        return True
+
+    try:
+        lock_file_stat: os.stat_result = os.stat(lock_file_path)
+    except FileNotFoundError:
+        return False
+
+    opened_file_stat: os.stat_result = os.fstat(lock_file_ptr.fileno())
+
+    return (opened_file_stat.st_dev, opened_file_stat.st_ino) == (
+        lock_file_stat.st_dev,
+        lock_file_stat.st_ino,
+    )
+
+
+def _record_lock_metrics(
+    lock_name: str,
+    is_contended: bool,
+    is_timed_out: bool,
+    wait_seconds: float,
+    held_seconds: float,
+) -> None:
+    """
+    Adds an acquisition (or timeout) of `lock_name` to the contention metrics of current process.
+    """
+    with _lock_metrics_thread_lock:
+        metrics_dict: typing.Dict[str, float] = _lock_metrics_dict.setdefault(
+            lock_name.upper(),
+            {
+                "ACQUIRED_COUNT": 0,
+                "CONTENDED_COUNT": 0,
+                "TIMEOUT_COUNT": 0,
+                "TOTAL_WAIT_SECONDS": 0.0,
+                "MAX_WAIT_SECONDS": 0.0,
+                "TOTAL_HELD_SECONDS": 0.0,
+            },
+        )
+        metrics_dict["ACQUIRED_COUNT"] += 0 if is_timed_out else 1
+        metrics_dict["CONTENDED_COUNT"] += 1 if is_contended else 0
+        metrics_dict["TIMEOUT_COUNT"] += 1 if is_timed_out else 0
+        metrics_dict["TOTAL_WAIT_SECONDS"] += wait_seconds
+        metrics_dict["MAX_WAIT_SECONDS"] = max(
+            metrics_dict["MAX_WAIT_SECONDS"], wait_seconds
+        )
+        metrics_dict["TOTAL_HELD_SECONDS"] += held_seconds
+
+
+def get_lock_metrics() -> typing.Dict[str, typing.Dict[str, float]]:
+    """
+    Returns a copy of contention metrics of every lock acquired by current process, against lock names.
+
+    Metrics of each lock are "ACQUIRED_COUNT", "CONTENDED_COUNT" (acquisitions which had to wait), "TIMEOUT_COUNT",
+    "TOTAL_WAIT_SECONDS", "MAX_WAIT_SECONDS" and "TOTAL_HELD_SECONDS".
+    """
+    with _lock_metrics_thread_lock:
+        return copy.deepcopy(_lock_metrics_dict)
+
+
+@contextlib.contextmanager
+def acquire_file_lock(
+    lock_name: str,
+    timeout_seconds: float = constants.FILE_LOCK_TIMEOUT_SECONDS,
+) -> typing.Iterator[None]:
+    """
+    Context manager that holds an exclusive OS-level lock on the lock file for `lock_name`.
+
+    Unlike `multiprocessing.Lock`, this lock is shared by every process opening the same lock file,
+    so it also works across separately started processes. The lock is released by the OS if the process dies.
+    Every resource has its own lock file, so the processes using different resources never wait for each other.
+
+    Raises `LockTimeoutError` if the lock couldn't be acquired within `timeout_seconds`.
+
+    Args:
+
+    `lock_name` - Name of the resource to be locked, for e.g. "AL_RED".
+    `timeout_seconds` - The maximum time to wait for the lock, or `None` to wait as long as it takes.
+    Default is `FILE_LOCK_TIMEOUT_SECONDS` from `constants` module.
+    """
+    lock_file_path: str = _get_lock_file_path(lock_name=lock_name)
+    lock_file_ptr: typing.IO = open(lock_file_path, mode="a+")
+
+    try:
+        start_time: float = time.monotonic()
+        is_contended: bool = not _try_lock(lock_file_ptr=lock_file_ptr)
+
+        # Keep retrying with growing delays, until the lock is acquired or timeout is reached.
+        retry_delay_seconds: float = _MIN_RETRY_DELAY_SECONDS
+        is_acquired: bool = not is_contended
+        while not is_acquired or not _is_lock_file_current(
+            lock_file_ptr=lock_file_ptr, lock_file_path=lock_file_path
+        ):
+            # Lock file is removed while waiting for it, so other processes lock the new one from now on.
+            if is_acquired:
+                _unlock(lock_file_ptr=lock_file_ptr)
+                lock_file_ptr.close()
+                lock_file_ptr = open(lock_file_path, mode="a+")
+                is_acquired = _try_lock(lock_file_ptr=lock_file_ptr)
+                continue
+
+            if (
+                timeout_seconds is not None
+                and time.monotonic() - start_time >= timeout_seconds
+            ):
+                _record_lock_metrics(
+                    lock_name=lock_name,
+                    is_contended=True,
+                    is_timed_out=True,
+                    wait_seconds=time.monotonic() - start_time,
+                    held_seconds=0.0,
+                )
+                raise LockTimeoutError(
+                    f"Couldn't acquire lock '{lock_name}' within {timeout_seconds} seconds."
+                )
+
+            time.sleep(retry_delay_seconds)
+            retry_delay_seconds = min(retry_delay_seconds * 2, _MAX_RETRY_DELAY_SECONDS)
+            is_acquired = _try_lock(lock_file_ptr=lock_file_ptr)
+
+        acquired_time: float = time.monotonic()
+
+        try:
+            yield
+        finally:
+            _unlock(lock_file_ptr=lock_file_ptr)
+            _record_lock_metrics(
+                lock_name=lock_name,
+                is_contended=is_contended,
+                is_timed_out=False,
+                wait_seconds=acquired_time - start_time,
+                held_seconds=time.monotonic() - acquired_time,
+            )
+
+    finally:
+        lock_file_ptr.close()
+
+
+def remove_lock_file(lock_name: str) -> bool:
+    """
+    Removes the lock file for `lock_name` if its lock isn't held at the moment, and returns whether it's removed.
+
+    Processes already waiting for the removed lock file notice it after acquiring its lock, and lock the newly
+    created lock file instead. So it's safe to remove the lock files of resources not used anymore.
+
+    Args:
+
+    `lock_name` - Name of the resource whose lock file to be removed, for e.g. "AL_RED".
+    """
+    lock_file_path: str = _get_lock_file_path(lock_name=lock_name)
+    if not os.path.isfile(lock_file_path):
+        return False
+
+    try:
+        with open(lock_file_path, mode="a+") as lock_file_ptr:
+            if not _try_lock(lock_file_ptr=lock_file_ptr):
+                return False
+
+            try:
+                # Already removed & created again by other process, which may hold the lock of new one.
+                if not _is_lock_file_current(
+                    lock_file_ptr=lock_file_ptr, lock_file_path=lock_file_path
+                ):
+                    return False
+
+                os.remove(lock_file_path)
+            finally:
+                _unlock(lock_file_ptr=lock_file_ptr)
+    except OSError:
+        # Open file can't be removed on Windows, and it's removed in a later attempt.
+        return False
+
+    return True
@@ -1,14 +1,27 @@
-import typing
+import asyncio
 import json
+import time
+import typing
 import warnings
 
-import requests_ratelimiter
+import aiohttp
 
 import constants
+import request_rate_limiter
+import short_link_cache
+
+if typing.TYPE_CHECKING:
+    import short_url_retry
 
 # Ignore warnings to be printed.
 warnings.filterwarnings("ignore")
 
+# Placeholder put in place of encrypted encoded coupon code, while serializing the data only once.
+_CODE_PLACEHOLDER: str = "__ENCRYPTED_ENCODED_COUPON_CODE__"
+
+# Number of received short URLs collected before writing them to the short links cache together.
+_CACHE_WRITE_BATCH_SIZE: int = 20
+
 
 def _get_data_dict_for_firebase_url(
     encrypted_encoded_coupon_code: str,
@@ -27,100 +40,263 @@ def _get_data_dict_for_firebase_url(
 
     # If `IS_USING_GOOGLE_SHORT_LINK_DEV_API` is set to `True`, return data related to Dev subscription.
     if constants.IS_USING_GOOGLE_SHORT_LINK_DEV_API:
-        print("[-] Returning data for DEV subscription...")
-
         # TODO: Edit below data dictionary for Dev subscription.
         return {
             "dynamicLinkInfo": {
                 "domainUriPrefix": "DOMAIN_URI_PREFIX_URL",
-                "link": f"https://LINK_TO_BE_SHORTENED/{encrypted_encoded_coupon_code}",
+                "link": f"{constants.SHORT_URL_LINK_PREFIX}{encrypted_encoded_coupon_code}",
                 "androidInfo": {"androidPackageName": "ANDROID_PACKAGE_NAME"},
                 "iosInfo": {"iosBundleId": "IOS_PACKAGE_NAME"},
             }
         }
 
     # Otherwise return data related to Prod subscription.
-    print("[-] Returning data for PROD subscription...")
 
     # TODO: Edit below data dictionary for Prod subscription.
     return {
         "dynamicLinkInfo": {
             "domainUriPrefix": "DOMAIN_URI_PREFIX_URL",
-            "link": f"https://LINK_TO_BE_SHORTENED/{encrypted_encoded_coupon_code}",
+            "link": f"{constants.SHORT_URL_LINK_PREFIX}{encrypted_encoded_coupon_code}",
             "androidInfo": {"androidPackageName": "ANDROID_PACKAGE_NAME"},
             "iosInfo": {"iosBundleId": "IOS_PACKAGE_NAME"},
         }
     }
 
 
-def collect_firebase_short_urls(
-    encrypted_encoded_coupon_codes_list: typing.List[str],
-    unique_ids_to_short_url_dict: dict,
-) -> None:
+def _get_serialized_data_parts() -> typing.Tuple[bytes, bytes]:
     """
-    Fetches the Firebase short URLs using pre-defined `rate_limiter_session`.
+    Returns the serialized data (from `_get_data_dict_for_firebase_url()`) split in two parts around the
+    encrypted encoded coupon code. So the request body for any code is just `first_part + code + second_part`.
 
-    Args:
+    Encrypted encoded coupon codes only contain URL-safe characters, which never need escaping in JSON.
+    """
+    serialized_data: str = json.dumps(
+        _get_data_dict_for_firebase_url(
+            encrypted_encoded_coupon_code=_CODE_PLACEHOLDER,
+        )
+    )
+    first_part, second_part = serialized_data.split(_CODE_PLACEHOLDER)
 
-    `encrypted_encoded_coupon_codes_list` - This is list of Unique ID strings in encrypted and encoded format.
-    `unique_ids_to_short_url_dict` - This is a mapping to store Unique ID with created short URLs. This will be useful to check which short URL is mapped against which encrypted encoded Unique ID.
+    return first_part.encode(), second_part.encode()
+
+
+class _AsyncTokenBucket:
     """
-    headers_dict: dict = {
-        "Content-Type": "application/json",
-    }
+    Token bucket that allows `rate` acquisitions per second, counted together with all other processes sending requests
+    to short links API (see `request_rate_limiter` module).
 
-    params_dict: dict = {
-        "key": "CUSTOM_KEY",  # TODO: Use appropriate key.
-    }
+    Acquisitions are spaced exactly `1 / rate` seconds apart, so the rate limit is saturated without ever exceeding it
+    in any one second window.
+    """
 
-    firebase_url: str = "CUSTOM_FIREBASE_ENDPOINT"  # TODO: Use appropriate endpoint.
+    def __init__(self, rate: float) -> None:
+        self.rate: float = rate
+        self.lock: asyncio.Lock = asyncio.Lock()
 
-    # A `LimiterSession` that will be used to control the POST requests per second.
-    rate_limited_session: requests_ratelimiter.LimiterSession = (
-        requests_ratelimiter.LimiterSession(
-            per_second=constants.GOOGLE_API_REQUESTS_PER_SECOND,
-        )
-    )
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and takes it.
+        """
+        # Lock keeps the waiting callers in order, so no one is starved and only one slot is reserved ahead.
+        async with self.lock:
+            # Reserved in a separate thread, so waiting for the database doesn't block the responses being received.
+            slot_timestamp: float = await asyncio.to_thread(
+                request_rate_limiter.reserve_request_slot,
+                limit_name=request_rate_limiter.SHORT_LINKS_API_LIMIT_NAME,
+                requests_per_second=self.rate,
+            )
 
-    # Iterate over all of encrypted encoded codes to get and store short URLs.
-    for encrypted_encoded_coupon_code in encrypted_encoded_coupon_codes_list:
-        # Prepare the data to pass in POST request.
-        data_dict: dict = _get_data_dict_for_firebase_url(
-            encrypted_encoded_coupon_code=encrypted_encoded_coupon_code,
-        )
+            await asyncio.sleep(max(0.0, slot_timestamp - time.time()))
+
+
+async def _fetch_firebase_short_url(
+    client_session: aiohttp.ClientSession,
+    token_bucket: _AsyncTokenBucket,
+    in_flight_semaphore: asyncio.Semaphore,
+    serialized_data_parts: typing.Tuple[bytes, bytes],
+    pending_short_urls_dict: typing.Dict[str, str],
+    encrypted_encoded_coupon_code: str,
+    short_urls_received_callback: typing.Callable[[int], None],
+    circuit_breaker: "short_url_retry.CircuitBreaker",
+) -> typing.Tuple[str, int]:
+    """
+    Sends a POST request for `encrypted_encoded_coupon_code` and returns a `tuple` of the short URL (or empty string if not received)
+    and HTTP status code of response (or `0` if no response is received, for e.g. due to connection error or timeout,
+    and `-1` if the request isn't sent because `circuit_breaker` is open).
+
+    Received short URL is added to `pending_short_urls_dict`, which is written to short links cache once it has enough of them,
+    and reported to `short_urls_received_callback` (if it's not `None`).
+    """
+    async with in_flight_semaphore:
+        # Checked again after waiting for the rate limit, as the circuit may open meanwhile by other responses.
+        if circuit_breaker is not None and circuit_breaker.is_open():
+            return "", -1
+
+        await token_bucket.acquire()
+
+        if circuit_breaker is not None and circuit_breaker.is_open():
+            return "", -1
 
         try:
-            # Send POST request using rate limited session.
-            response_obj: requests_ratelimiter.Response = rate_limited_session.post(
-                url=firebase_url,
-                params=params_dict,
-                headers=headers_dict,
-                data=json.dumps(data_dict),
-                timeout=60.0,  # https://stackoverflow.com/a/56941261
-                verify=False,  # https://stackoverflow.com/a/51768580
-            )
+            async with client_session.post(
+                url=constants.FIREBASE_SHORT_LINKS_API_URL,
+                params={"key": constants.FIREBASE_API_KEY},
+                data=serialized_data_parts[0]
+                + encrypted_encoded_coupon_code.encode()
+                + serialized_data_parts[1],
+            ) as response_obj:
+                status_code: int = response_obj.status
+                response_text: str = await response_obj.text()
+
+        except Exception:
+            status_code = 0
+            response_text = ""
+
+        if circuit_breaker is not None:
+            circuit_breaker.record_response(status_code=status_code)
+
+        if status_code == 0:
+            return "", 0
 
-            response_dict: dict = json.loads(response_obj.text)
+        try:
+            short_url: str = str(json.loads(response_text).get("shortLink", ""))
+        except (ValueError, AttributeError):
+            short_url = ""
+
+        # Write through the received short URLs, so those won't be requested again even if the process dies.
+        if short_url != "":
+            pending_short_urls_dict[encrypted_encoded_coupon_code] = short_url
 
-            if "shortLink" in response_dict:
-                unique_ids_to_short_url_dict[
-                    encrypted_encoded_coupon_code
-                ] = response_dict["shortLink"]
-            else:
-                unique_ids_to_short_url_dict[encrypted_encoded_coupon_code] = ""
-                print(
-                    f"[!] Short link not received for: {encrypted_encoded_coupon_code}"
+            if len(pending_short_urls_dict) >= _CACHE_WRITE_BATCH_SIZE:
+                short_link_cache.store_short_urls(
+                    tokens_to_short_url_dict=pending_short_urls_dict
                 )
+                pending_short_urls_dict.clear()
+
+            if short_urls_received_callback is not None:
+                short_urls_received_callback(1)
 
-            print(f"- URLs mapped : {len(unique_ids_to_short_url_dict.keys())}")
+        return short_url, status_code
 
-        except Exception as ex:
-            if encrypted_encoded_coupon_code not in unique_ids_to_short_url_dict:
-                unique_ids_to_short_url_dict[encrypted_encoded_coupon_code] = ""
 
-            print(
-                "\n (!) Unable to get url for {} due to {}.".format(
-                    encrypted_encoded_coupon_code, ex.__class__
+async def _collect_firebase_short_urls_async(
+    encrypted_encoded_coupon_codes_list: typing.List[str],
+    unique_ids_to_short_url_dict: dict,
+    requests_per_second: float,
+    max_in_flight_requests: int,
+    response_statuses_dict: dict,
+    short_urls_received_callback: typing.Callable[[int], None],
+    circuit_breaker: "short_url_retry.CircuitBreaker",
+) -> None:
+    """
+    Asynchronous implementation of `collect_firebase_short_urls()`.
+    """
+    token_bucket: _AsyncTokenBucket = _AsyncTokenBucket(rate=requests_per_second)
+    in_flight_semaphore: asyncio.Semaphore = asyncio.Semaphore(max_in_flight_requests)
+    serialized_data_parts: typing.Tuple[bytes, bytes] = _get_serialized_data_parts()
+    pending_short_urls_dict: typing.Dict[str, str] = {}
+
+    # Single session keeps its connections open and reuses them for all the requests.
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=max_in_flight_requests,
+            ssl=False,  # https://stackoverflow.com/a/51768580
+        ),
+        headers={"Content-Type": "application/json"},
+        # https://stackoverflow.com/a/56941261
+        timeout=aiohttp.ClientTimeout(total=60.0),
+    ) as client_session:
+        responses_list: typing.List[typing.Tuple[str, int]] = await asyncio.gather(
+            *[
+                _fetch_firebase_short_url(
+                    client_session=client_session,
+                    token_bucket=token_bucket,
+                    in_flight_semaphore=in_flight_semaphore,
+                    serialized_data_parts=serialized_data_parts,
+                    pending_short_urls_dict=pending_short_urls_dict,
+                    encrypted_encoded_coupon_code=encrypted_encoded_coupon_code,
+                    short_urls_received_callback=short_urls_received_callback,
+                    circuit_breaker=circuit_breaker,
                 )
+                for encrypted_encoded_coupon_code in encrypted_encoded_coupon_codes_list
+            ]
+        )
+
+    short_link_cache.store_short_urls(tokens_to_short_url_dict=pending_short_urls_dict)
+
+    for encrypted_encoded_coupon_code, (short_url, status_code) in zip(
+        encrypted_encoded_coupon_codes_list, responses_list
+    ):
+        unique_ids_to_short_url_dict[encrypted_encoded_coupon_code] = short_url
+        response_statuses_dict[encrypted_encoded_coupon_code] = status_code
+
+
+def collect_firebase_short_urls(
+    encrypted_encoded_coupon_codes_list: typing.List[str],
+    unique_ids_to_short_url_dict: dict,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+    max_in_flight_requests: int = constants.SHORT_URL_MAX_IN_FLIGHT_REQUESTS,
+    response_statuses_dict: dict = None,
+    short_urls_received_callback: typing.Callable[[int], None] = None,
+    circuit_breaker: "short_url_retry.CircuitBreaker" = None,
+) -> None:
+    """
+    Fetches the Firebase short URLs, keeping up to `max_in_flight_requests` POST requests waiting for their response
+    at the same time while never sending more than `requests_per_second` together with all other processes.
+
+    Args:
+
+    `encrypted_encoded_coupon_codes_list` - This is list of Unique ID strings in encrypted and encoded format.
+    `unique_ids_to_short_url_dict` - This is a mapping to store Unique ID with created short URLs. This will be useful to check which short URL is mapped against which encrypted encoded Unique ID. Empty string is stored if the short URL is not received.
+    `requests_per_second` - The maximum number of POST requests per second, shared with all other processes. Default is `GOOGLE_API_REQUESTS_PER_SECOND` from `constants` module.
+    `max_in_flight_requests` - The maximum number of POST requests waiting for their response at the same time. Default is `SHORT_URL_MAX_IN_FLIGHT_REQUESTS` from `constants` module.
+    `response_statuses_dict` - Optional mapping to store HTTP status code of response against each requested encrypted encoded Unique ID, or `0` if no response is received (`-1` if skipped by `circuit_breaker`). Unique IDs taken from short links cache are not requested, so not stored here.
+    `short_urls_received_callback` - Optional function called with the number of short URLs received (including those taken from cache), as soon as those are received.
+    `circuit_breaker` - Optional circuit breaker recording every response as it arrives. Once it opens, requests not sent yet are skipped with status code `-1`.
+    """
+    if response_statuses_dict is None:
+        response_statuses_dict = {}
+
+    if len(encrypted_encoded_coupon_codes_list) <= 0:
+        return
+
+    # Short URLs already received earlier (for e.g. before a crash or a retry) are taken from cache, without any request.
+    cached_short_urls_dict: typing.Dict[
+        str, str
+    ] = short_link_cache.get_cached_short_urls(
+        tokens_list=encrypted_encoded_coupon_codes_list
+    )
+    unique_ids_to_short_url_dict.update(cached_short_urls_dict)
+
+    if short_urls_received_callback is not None and len(cached_short_urls_dict) > 0:
+        short_urls_received_callback(len(cached_short_urls_dict))
+
+    uncached_codes_list: typing.List[str] = list(
+        dict.fromkeys(
+            encrypted_encoded_coupon_code
+            for encrypted_encoded_coupon_code in encrypted_encoded_coupon_codes_list
+            if encrypted_encoded_coupon_code not in cached_short_urls_dict
+        )
+    )
+
+    if len(uncached_codes_list) > 0:
+        asyncio.run(
+            _collect_firebase_short_urls_async(
+                encrypted_encoded_coupon_codes_list=uncached_codes_list,
+                unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+                requests_per_second=requests_per_second,
+                max_in_flight_requests=max(1, max_in_flight_requests),
+                response_statuses_dict=response_statuses_dict,
+                short_urls_received_callback=short_urls_received_callback,
+                circuit_breaker=circuit_breaker,
             )
-            print(f"[!] URLs mapped : {len(unique_ids_to_short_url_dict.keys())}")
+        )
+
+    short_urls_missing_count: int = sum(
+        1
+        for encrypted_encoded_coupon_code in encrypted_encoded_coupon_codes_list
+        if unique_ids_to_short_url_dict[encrypted_encoded_coupon_code] == ""
+    )
+    print(
+        f"- URLs mapped : {len(encrypted_encoded_coupon_codes_list) - short_urls_missing_count}, missing : {short_urls_missing_count}, from cache : {len(cached_short_urls_dict)}"
+    )
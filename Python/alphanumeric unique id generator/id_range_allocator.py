@@ -0,0 +1,129 @@
+"""
+Allocator that hands out disjoint ranges (leases) of alpha-numeric sequences per part category and cap color code.
+
+Each lease reads and advances the stored high-water mark of the part category and cap color code by the leased count
+in a single transaction of `state_store` module. So any number of generation processes
+(or App Service instances sharing the same storage) can generate in parallel and still get unique IDs.
+"""
+
+import glob
+import os
+import typing
+
+import pandas as pd
+
+import constants
+import sequence_engine
+import state_store
+
+
+def _read_last_unique_id_from_track(
+    part_category: str,
+    cap_color_code: str,
+) -> str:
+    """
+    Reads the last Unique ID from the latest file stored in tracking directory
+    for `part_category` and `cap_color_code`. Returns empty string if nothing was tracked yet.
+    """
+    # Create a sub-directory where all files of Unique IDs are stored.
+    sub_dir_name: str = constants.TRACKING_INDEXING_DIRPATH  # "Track_Unique_IDs"
+    os.makedirs(name=sub_dir_name, exist_ok=True)
+
+    # Get file path for latest file stored belonging to current part category and cap color code.
+    # Implementation Reference: https://stackoverflow.com/a/168424
+    csv_files_path: list = list(
+        filter(
+            os.path.isfile,
+            glob.glob(
+                os.path.join(sub_dir_name, f"{part_category}_{cap_color_code}_*.csv")
+            ),
+        )
+    )
+    csv_files_path.sort(key=lambda x: os.path.getmtime(x), reverse=False)
+
+    if len(csv_files_path) <= 0:
+        return ""
+
+    # Read as strings, otherwise sequences having only digits (for e.g. "000010") will lose their leading zeros.
+    result_df: pd.DataFrame = pd.read_csv(
+        csv_files_path[-1],
+        dtype=str,
+        keep_default_na=False,
+    )
+
+    if len(result_df.index) <= 0 or "UNIQUE_ID" not in result_df.columns:
+        return ""
+
+    return result_df["UNIQUE_ID"].iat[-1].strip()
+
+
+def lease_unique_id_range(
+    part_category: str,
+    cap_color_code: str,
+    special_code: str,
+    count: int,
+) -> typing.Tuple[int, int]:
+    """
+    Leases `count` consecutive alpha-numeric sequences for `part_category` and `cap_color_code`.
+
+    Returns a `tuple` of integer value for the first leased sequence and the alpha-numeric digit length to render it.
+    The leased range is never handed out again, even if the process using it fails before storing its results.
+
+    Args:
+
+    `part_category` - The part category string which is the first prefix for Unique ID.
+    `cap_color_code` - The cap color code which is the second prefix for Unique ID.
+    `special_code` - The special code for which this range is leased, recorded along with high-water mark.
+    `count` - The number of sequences to be leased.
+    """
+    if count <= 0:
+        raise ValueError(f"Number of sequences to lease must be positive: {count}")
+
+    with state_store.update_sequence_state(
+        part_category=part_category,
+        cap_color_code=cap_color_code,
+    ) as sequence_state_dict:
+        alpha_numeric_digit_length: int = sequence_state_dict["DIGIT_LENGTH"]
+        next_unique_id: str = sequence_state_dict["NEXT_UNIQUE_ID"]
+
+        # If high-water mark isn't stored yet, then backfill it once from existing tracking files.
+        if next_unique_id == "":
+            last_unique_id: str = _read_last_unique_id_from_track(
+                part_category=part_category,
+                cap_color_code=cap_color_code,
+            )
+            if last_unique_id != "":
+                next_unique_id = sequence_engine.next_unique_id(last_unique_id)
+
+        start_value: int = sequence_engine.unique_id_to_int(next_unique_id)
+        end_value: int = start_value + count
+
+        # Length of alpha-numeric digits grows, if the leased range crosses the limit of current length.
+        start_digit_length: int = sequence_engine.get_digit_length(
+            value=start_value,
+            alpha_numeric_digit_length=alpha_numeric_digit_length,
+        )
+        end_digit_length: int = sequence_engine.get_digit_length(
+            value=end_value,
+            alpha_numeric_digit_length=alpha_numeric_digit_length,
+        )
+
+        # Stored in the same transaction, so the leased range is never handed out again.
+        sequence_state_dict["NEXT_UNIQUE_ID"] = sequence_engine.int_to_unique_id(
+            value=end_value,
+            alpha_numeric_digit_length=end_digit_length,
+        )
+        sequence_state_dict["DIGIT_LENGTH"] = end_digit_length
+        sequence_state_dict["SPECIAL_CODE"] = special_code
+        sequence_state_dict["LAST_UNIQUE_ID"] = sequence_engine.int_to_unique_id(
+            value=end_value - 1,
+            alpha_numeric_digit_length=alpha_numeric_digit_length,
+        )
+
+    return start_value, start_digit_length
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(lease_unique_id_range(part_category="AL", cap_color_code="RED", special_code="", count=100))
@@ -0,0 +1,234 @@
+"""
+Live progress of running ID generation jobs, published as small JSON status files.
+
+Every cap color code of a job is processed by its own process, so each of them writes its own file named
+"<job ID>_<cap color code>.json" and no process ever waits for another to update the counters. Files are replaced
+atomically and at most once per `JOB_PROGRESS_WRITE_INTERVAL_SECONDS` (from `constants` module), so readers never
+see a partially written file and the generation isn't slowed down by frequent writes.
+"""
+
+import glob
+import json
+import os
+import time
+import typing
+
+import constants
+
+
+PROGRESS_COUNTER_NAMES: typing.List[str] = [
+    "IDS_GENERATED",
+    "IDS_ENCRYPTED",
+    "IDS_SHORTENED",
+    "ROWS_WRITTEN",
+    "DEAD_LETTERS",
+]
+""" Counters of every stage of generation process, stored in each progress file. """
+
+
+def _get_progress_file_path(job_id: str, cap_color_code: str) -> str:
+    """
+    Returns the path of progress file of `cap_color_code` in the job `job_id`.
+    """
+    return os.path.join(
+        constants.JOB_PROGRESS_DIR_PATH, f"{job_id}_{cap_color_code.upper()}.json"
+    )
+
+
+class JobProgressReporter:
+    """
+    Class that hold the stage counters of a single cap color code in a job, and publishes those to its progress file.
+
+    Reporter created with `job_id` as `None` (for e.g. when generator is called directly) only keeps the counters.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        cap_color_code: str,
+        total_ids_count: int,
+    ) -> None:
+        self._file_path: str = None
+        if job_id is not None:
+            self._file_path = _get_progress_file_path(
+                job_id=job_id, cap_color_code=cap_color_code
+            )
+
+        self._progress_dict: dict = {
+            "CAP_COLOR_CODE": cap_color_code.upper(),
+            "TOTAL_IDS_COUNT": total_ids_count,
+            "STARTED_TIMESTAMP": time.time(),
+            "UPDATED_TIMESTAMP": time.time(),
+            "IS_FINISHED": False,
+        }
+        self._progress_dict.update(dict.fromkeys(PROGRESS_COUNTER_NAMES, 0))
+
+        # Monotonic time of last write, so the file is written again only after the interval.
+        self._last_write_time: float = None
+
+    def _write_file(self) -> None:
+        """`Private method.`"""
+
+        os.makedirs(name=constants.JOB_PROGRESS_DIR_PATH, exist_ok=True)
+
+        temp_file_path: str = f"{self._file_path}.{os.getpid()}.tmp"
+        with open(temp_file_path, mode="w") as temp_file:
+            json.dump(self._progress_dict, temp_file)
+
+        os.replace(temp_file_path, self._file_path)
+
+    def add(self, **counters_dict: int) -> None:
+        """
+        Increments the given counters (for e.g. `ids_shortened=1`), and publishes them if the write interval is passed.
+        """
+        for counter_name, count in counters_dict.items():
+            self._progress_dict[counter_name.upper()] += count
+
+        self.publish(is_forced=False)
+
+    def update(self, **counters_dict: int) -> None:
+        """
+        Sets the given counters (for e.g. `rows_written=10000`) to their new values, and publishes them at once.
+        """
+        for counter_name, value in counters_dict.items():
+            self._progress_dict[counter_name.upper()] = value
+
+        self.publish(is_forced=True)
+
+    def finish(self) -> None:
+        """
+        Marks the cap color code as finished, and publishes its final counters.
+        """
+        self._progress_dict["IS_FINISHED"] = True
+
+        self.publish(is_forced=True)
+
+    def publish(self, is_forced: bool = False) -> None:
+        """
+        Writes the counters to progress file, unless it's written within `JOB_PROGRESS_WRITE_INTERVAL_SECONDS`
+        (from `constants` module) and `is_forced` is `False`.
+        """
+        self._progress_dict["UPDATED_TIMESTAMP"] = time.time()
+
+        if self._file_path is None:
+            return
+
+        if (
+            not is_forced
+            and self._last_write_time is not None
+            and time.monotonic() - self._last_write_time
+            < constants.JOB_PROGRESS_WRITE_INTERVAL_SECONDS
+        ):
+            return
+
+        try:
+            self._write_file()
+        except OSError as error:
+            # Progress is only informative, so a failed write mustn't stop the generation.
+            print(f"[!] Couldn't write job progress: {error}")
+
+        self._last_write_time = time.monotonic()
+
+
+def read_job_progress(job_id: str, total_ids_count: int = None) -> dict:
+    """
+    Returns the progress of job `job_id` summed over all its cap color codes as a `dict`,
+    or `None` if none of its cap color codes is started yet.
+
+    Along with the counters in `PROGRESS_COUNTER_NAMES`, it contains "TOTAL_IDS_COUNT", "STARTED_TIMESTAMP" & "UPDATED_TIMESTAMP"
+    (of the earliest & latest cap color codes), "IDS_PER_SECOND", "ETA_SECONDS" (`None` until it can be estimated)
+    and "CAP_COLORS" which has the progress of every started cap color code against it.
+
+    Args:
+
+    `job_id` - The ID of job from `job_queue` module.
+    `total_ids_count` - The number of Unique IDs to be generated by whole job. Default is the sum of started cap color codes.
+    """
+    cap_colors_dict: typing.Dict[str, dict] = {}
+
+    for progress_file_path in sorted(
+        glob.glob(os.path.join(constants.JOB_PROGRESS_DIR_PATH, f"{job_id}_*.json"))
+    ):
+        try:
+            with open(progress_file_path, mode="r") as progress_file:
+                progress_dict: dict = json.load(progress_file)
+        except (OSError, ValueError):
+            # Being replaced on a platform where it's not atomic, it'll be read in next poll.
+            continue
+
+        cap_colors_dict[progress_dict["CAP_COLOR_CODE"]] = progress_dict
+
+    if len(cap_colors_dict) <= 0:
+        return None
+
+    job_progress_dict: dict = {
+        counter_name: sum(
+            progress_dict[counter_name] for progress_dict in cap_colors_dict.values()
+        )
+        for counter_name in PROGRESS_COUNTER_NAMES
+    }
+    job_progress_dict["TOTAL_IDS_COUNT"] = (
+        total_ids_count
+        if total_ids_count is not None
+        else sum(
+            progress_dict["TOTAL_IDS_COUNT"]
+            for progress_dict in cap_colors_dict.values()
+        )
+    )
+    job_progress_dict["STARTED_TIMESTAMP"] = min(
+        progress_dict["STARTED_TIMESTAMP"] for progress_dict in cap_colors_dict.values()
+    )
+    job_progress_dict["UPDATED_TIMESTAMP"] = max(
+        progress_dict["UPDATED_TIMESTAMP"] for progress_dict in cap_colors_dict.values()
+    )
+    job_progress_dict["CAP_COLORS"] = cap_colors_dict
+
+    # Short URLs are the slowest stage, and every Unique ID ends up either shortened or in dead letters.
+    # So their sum grows smoothly even within a chunk, unlike the rows written once per chunk.
+    processed_ids_count: int = (
+        job_progress_dict["IDS_SHORTENED"] + job_progress_dict["DEAD_LETTERS"]
+    )
+    elapsed_seconds: float = (
+        job_progress_dict["UPDATED_TIMESTAMP"] - job_progress_dict["STARTED_TIMESTAMP"]
+    )
+
+    job_progress_dict["IDS_PER_SECOND"] = 0.0
+    job_progress_dict["ETA_SECONDS"] = None
+    if processed_ids_count > 0 and elapsed_seconds > 0:
+        job_progress_dict["IDS_PER_SECOND"] = processed_ids_count / elapsed_seconds
+        job_progress_dict["ETA_SECONDS"] = (
+            max(0, job_progress_dict["TOTAL_IDS_COUNT"] - processed_ids_count)
+            / job_progress_dict["IDS_PER_SECOND"]
+        )
+
+    return job_progress_dict
+
+
+def remove_expired_progress_files() -> int:
+    """
+    Removes the progress files not updated within `JOB_PROGRESS_RETENTION_HOURS` (from `constants` module),
+    and returns the number of removed files.
+    """
+    expiry_timestamp: float = (
+        time.time() - constants.JOB_PROGRESS_RETENTION_HOURS * 60 * 60
+    )
+    removed_files_count: int = 0
+
+    for progress_file_path in glob.glob(
+        os.path.join(constants.JOB_PROGRESS_DIR_PATH, "*.json")
+    ):
+        try:
+            if os.path.getmtime(progress_file_path) < expiry_timestamp:
+                os.remove(progress_file_path)
+                removed_files_count += 1
+        except FileNotFoundError:
+            # Already removed by compactor of another process.
+            pass
+
+    return removed_files_count
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(read_job_progress(job_id=""))
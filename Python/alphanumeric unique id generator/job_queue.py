@@ -0,0 +1,505 @@
+"""
+Persistent queue of ID generation jobs, run by a fixed-size pool of warm worker processes.
+
+Jobs are stored in a SQLite database, so queued jobs survive a restart of the Dash server. Any process can enqueue
+the jobs, but only one process (the "host", elected using a non-blocking file lock) runs them, so the number of
+jobs running together never exceeds `JOB_WORKERS_COUNT` even with several gunicorn workers. Workers are started once
+with `pandas` imported & encryption keys loaded, and reused for the next jobs.
+
+Jobs left running by a stopped host are marked as failed by the next host, instead of running them again. A rerun
+would lease new ID ranges and request short URLs again for the quota reserved once, so only the quota of Unique IDs
+which weren't generated yet is released. Quota of a job failing with an error is released the same way.
+
+Generator and encryption modules are imported only by the workers, so the web server starts without loading them.
+"""
+
+import concurrent.futures
+import importlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import typing
+import uuid
+
+import constants
+import file_lock
+import job_progress
+import quota_ledger
+import sqlite_connections
+
+
+# States of a job, in the order those are reached.
+JOB_STATES_LIST: typing.List[str] = ["QUEUED", "RUNNING", "COMPLETED", "FAILED"]
+
+# Schema of the job queue database, created once per process.
+_SCHEMA_SQL: str = """
+CREATE TABLE IF NOT EXISTS JOBS (
+    JOB_SEQUENCE INTEGER PRIMARY KEY AUTOINCREMENT,
+    JOB_ID TEXT NOT NULL UNIQUE,
+    PART_CATEGORY TEXT NOT NULL,
+    CAP_COLOR_CODES TEXT NOT NULL,
+    SPECIAL_CODE TEXT NOT NULL,
+    MAX_GENERATE_LIMIT INTEGER NOT NULL,
+    STATE TEXT NOT NULL,
+    ENQUEUED_TIMESTAMP REAL NOT NULL,
+    STARTED_TIMESTAMP REAL,
+    FINISHED_TIMESTAMP REAL,
+    ERROR TEXT NOT NULL DEFAULT ''
+);
+
+CREATE INDEX IF NOT EXISTS JOBS_STATE_INDEX ON JOBS (STATE, JOB_SEQUENCE);
+
+-- Kept in its own table, so it's also added to the databases created before it.
+CREATE TABLE IF NOT EXISTS JOB_QUOTA_RESERVATIONS (
+    JOB_ID TEXT PRIMARY KEY,
+    RESERVATION_TIMESTAMP REAL NOT NULL
+);
+"""
+
+# Connection is shared by all threads of current process, so its use is serialized.
+_connection_lock: threading.Lock = threading.Lock()
+
+
+class JobQueueFullError(Exception):
+    """
+    Raised when the jobs being enqueued would exceed `JOB_QUEUE_MAX_LENGTH` waiting jobs.
+    """
+
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Returns the SQLite connection to job queue database of current process.
+    """
+    return sqlite_connections.SQLiteConnections.get_connection(
+        database_file_path=constants.JOB_QUEUE_FILE_PATH,
+        schema_sql=_SCHEMA_SQL,
+    )
+
+
+def enqueue_job(
+    part_category: str,
+    cap_color_codes: typing.List[str],
+    special_code: str,
+    max_generate_limit: int,
+    quota_reservation_timestamp: float = None,
+) -> str:
+    """
+    Adds a job to generate the Unique IDs at the end of queue, and returns its job ID.
+
+    Raises `JobQueueFullError` if `JOB_QUEUE_MAX_LENGTH` (from `constants` module) jobs are already waiting.
+
+    Args:
+
+    `part_category` - The part category string which is the first prefix for Unique ID.
+    `cap_color_codes` - The list of cap color codes which will be the second prefix for Unique ID.
+    `special_code` - The special code used to indicate generated Unique IDs for some festival-like purpose.
+    `max_generate_limit` - The number of Unique IDs to be generated for each cap color code.
+    `quota_reservation_timestamp` - The timestamp returned by `reserve()` of `quota_ledger` module for quota of this job,
+    to release its unused quota if the job is interrupted. Default is `None`, i.e. no quota is reserved.
+    """
+    return enqueue_jobs(
+        jobs_list=[
+            {
+                "PART_CATEGORY": part_category,
+                "CAP_COLOR_CODES": cap_color_codes,
+                "SPECIAL_CODE": special_code,
+                "MAX_GENERATE_LIMIT": max_generate_limit,
+                "QUOTA_RESERVATION_TIMESTAMP": quota_reservation_timestamp,
+            }
+        ]
+    )[0]
+
+
+def enqueue_jobs(jobs_list: typing.List[dict]) -> typing.List[str]:
+    """
+    Adds all the jobs to generate the Unique IDs at the end of queue in the same order, and returns their job IDs.
+    Either all of them are enqueued or none, so a batch is never started partially.
+
+    Raises `JobQueueFullError` if there's no room for all of them within `JOB_QUEUE_MAX_LENGTH` (from `constants` module).
+
+    Args:
+
+    `jobs_list` - The list of jobs, each as a `dict` with same keys as arguments of `enqueue_job()` in upper case,
+    for e.g. "PART_CATEGORY" and "MAX_GENERATE_LIMIT". "QUOTA_RESERVATION_TIMESTAMP" is optional.
+    """
+    job_ids_list: typing.List[str] = [uuid.uuid4().hex for _ in jobs_list]
+
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+
+        # Count and insert in the same transaction, so the jobs enqueued together can't exceed the limit.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            queued_jobs_count: int = connection.execute(
+                "SELECT COUNT(*) FROM JOBS WHERE STATE = 'QUEUED'"
+            ).fetchone()[0]
+            if queued_jobs_count + len(jobs_list) > constants.JOB_QUEUE_MAX_LENGTH:
+                raise JobQueueFullError(
+                    f"{queued_jobs_count} jobs are already waiting in queue, so {len(jobs_list)} more can't be added."
+                    if len(jobs_list) > 1
+                    else f"{queued_jobs_count} jobs are already waiting in queue."
+                )
+
+            enqueued_timestamp: float = time.time()
+            connection.executemany(
+                "INSERT INTO JOBS (JOB_ID, PART_CATEGORY, CAP_COLOR_CODES, SPECIAL_CODE, MAX_GENERATE_LIMIT, STATE, ENQUEUED_TIMESTAMP)"
+                " VALUES (?, ?, ?, ?, ?, 'QUEUED', ?)",
+                [
+                    (
+                        job_id,
+                        job_dict["PART_CATEGORY"],
+                        json.dumps(list(job_dict["CAP_COLOR_CODES"])),
+                        job_dict["SPECIAL_CODE"],
+                        int(job_dict["MAX_GENERATE_LIMIT"]),
+                        enqueued_timestamp,
+                    )
+                    for job_id, job_dict in zip(job_ids_list, jobs_list)
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO JOB_QUOTA_RESERVATIONS (JOB_ID, RESERVATION_TIMESTAMP) VALUES (?, ?)",
+                [
+                    (job_id, job_dict["QUOTA_RESERVATION_TIMESTAMP"])
+                    for job_id, job_dict in zip(job_ids_list, jobs_list)
+                    if job_dict.get("QUOTA_RESERVATION_TIMESTAMP") is not None
+                ],
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    return job_ids_list
+
+
+def get_job(job_id: str) -> dict:
+    """
+    Returns the details of job as a `dict`, or `None` if there's no job with `job_id`.
+
+    Along with the stored columns, "QUEUE_POSITION" is the number of jobs to be started before it (starting from `1`)
+    while it's queued, and `0` otherwise.
+    """
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+        job_cursor: sqlite3.Cursor = connection.execute(
+            "SELECT * FROM JOBS WHERE JOB_ID = ?", (job_id,)
+        )
+        job_row: tuple = job_cursor.fetchone()
+
+        if job_row is None:
+            return None
+
+        job_dict: dict = dict(
+            zip([column[0] for column in job_cursor.description], job_row)
+        )
+        job_dict["CAP_COLOR_CODES"] = json.loads(job_dict["CAP_COLOR_CODES"])
+        job_dict["QUEUE_POSITION"] = 0
+
+        if job_dict["STATE"] == "QUEUED":
+            job_dict["QUEUE_POSITION"] = connection.execute(
+                "SELECT COUNT(*) FROM JOBS WHERE STATE = 'QUEUED' AND JOB_SEQUENCE <= ?",
+                (job_dict["JOB_SEQUENCE"],),
+            ).fetchone()[0]
+
+    return job_dict
+
+
+def _claim_next_job() -> dict:
+    """
+    Marks the oldest queued job as running and returns its details, or `None` if no job is queued.
+    """
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            job_row: tuple = connection.execute(
+                "SELECT JOB_ID, PART_CATEGORY, CAP_COLOR_CODES, SPECIAL_CODE, MAX_GENERATE_LIMIT FROM JOBS"
+                " WHERE STATE = 'QUEUED' ORDER BY JOB_SEQUENCE LIMIT 1"
+            ).fetchone()
+            if job_row is not None:
+                connection.execute(
+                    "UPDATE JOBS SET STATE = 'RUNNING', STARTED_TIMESTAMP = ? WHERE JOB_ID = ?",
+                    (time.time(), job_row[0]),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    if job_row is None:
+        return None
+
+    return {
+        "JOB_ID": job_row[0],
+        "PART_CATEGORY": job_row[1],
+        "CAP_COLOR_CODES": json.loads(job_row[2]),
+        "SPECIAL_CODE": job_row[3],
+        "MAX_GENERATE_LIMIT": job_row[4],
+    }
+
+
+def _finish_job(job_id: str, error_message: str = "") -> None:
+    """
+    Marks the running job as completed, or as failed if `error_message` is given.
+    """
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+        connection.execute(
+            "UPDATE JOBS SET STATE = ?, FINISHED_TIMESTAMP = ?, ERROR = ? WHERE JOB_ID = ?",
+            (
+                "FAILED" if error_message != "" else "COMPLETED",
+                time.time(),
+                error_message,
+                job_id,
+            ),
+        )
+        # Quota of a finished job is either used or already released, so its reservation isn't needed anymore.
+        connection.execute(
+            "DELETE FROM JOB_QUOTA_RESERVATIONS WHERE JOB_ID = ?", (job_id,)
+        )
+        connection.commit()
+
+
+def _release_unused_job_quota(job_id: str) -> typing.Tuple[int, int]:
+    """
+    Releases the quota reserved for job `job_id` of its Unique IDs which weren't generated yet, and returns a `tuple` of
+    the number of generated Unique IDs and the number of all Unique IDs of the job.
+
+    Reservation of the job is removed once released, so its quota is never released twice.
+    """
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+        (
+            part_category,
+            cap_color_codes_json,
+            special_code,
+            max_generate_limit,
+            quota_reservation_timestamp,
+        ) = connection.execute(
+            "SELECT PART_CATEGORY, CAP_COLOR_CODES, SPECIAL_CODE, MAX_GENERATE_LIMIT, RESERVATION_TIMESTAMP"
+            " FROM JOBS LEFT JOIN JOB_QUOTA_RESERVATIONS ON JOBS.JOB_ID = JOB_QUOTA_RESERVATIONS.JOB_ID"
+            " WHERE JOBS.JOB_ID = ?",
+            (job_id,),
+        ).fetchone()
+
+    total_ids_count: int = max_generate_limit * len(json.loads(cap_color_codes_json))
+
+    # Generated Unique IDs are published before their short URLs are requested, so counting all of them as used
+    # never overdraws quota.
+    job_progress_dict: dict = job_progress.read_job_progress(
+        job_id=job_id, total_ids_count=total_ids_count
+    )
+    generated_ids_count: int = (
+        0
+        if job_progress_dict is None
+        else min(total_ids_count, job_progress_dict["IDS_GENERATED"])
+    )
+
+    if quota_reservation_timestamp is not None:
+        quota_ledger.QuotaLedger.get_instance().release(
+            count=total_ids_count - generated_ids_count,
+            reservation_timestamp=quota_reservation_timestamp,
+            part_category=part_category,
+            special_code=special_code,
+        )
+
+        with _connection_lock:
+            connection = _get_connection()
+            connection.execute(
+                "DELETE FROM JOB_QUOTA_RESERVATIONS WHERE JOB_ID = ?", (job_id,)
+            )
+            connection.commit()
+
+    return generated_ids_count, total_ids_count
+
+
+def _fail_job(job_id: str, reason: str) -> None:
+    """
+    Marks the running job as failed with `reason`, after releasing the quota of its Unique IDs which weren't generated yet.
+    """
+    generated_ids_count, total_ids_count = _release_unused_job_quota(job_id=job_id)
+
+    _finish_job(
+        job_id=job_id,
+        error_message=f"{reason} after generating {generated_ids_count}/{total_ids_count} Unique IDs."
+        f" Quota of remaining {total_ids_count - generated_ids_count} is released, queue the job again to generate those.",
+    )
+
+
+def _fail_interrupted_jobs() -> int:
+    """
+    Marks the jobs left running by previous host (which stopped before those finished) as failed, and releases the quota
+    of their Unique IDs which weren't generated yet. Returns the number of failed jobs.
+    """
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+        interrupted_job_ids_list: typing.List[str] = [
+            job_row[0]
+            for job_row in connection.execute(
+                "SELECT JOB_ID FROM JOBS WHERE STATE = 'RUNNING'"
+            ).fetchall()
+        ]
+
+    for job_id in interrupted_job_ids_list:
+        _fail_job(job_id=job_id, reason="Interrupted by restart")
+
+    return len(interrupted_job_ids_list)
+
+
+def _initialize_job_worker() -> None:
+    """
+    Initializer of job worker processes, which imports the generator (along with `pandas`) and loads encryption keys once,
+    so those are ready before the first job arrives.
+    """
+    import encryptor_encoder
+
+    importlib.import_module("uid_generator")
+    encryptor_encoder.get_token_cipher().load_keys()
+
+
+def _run_job(job_dict: dict, running_jobs_count: int) -> None:
+    """
+    Generates the Unique IDs of job described by `job_dict`, inside a job worker process.
+
+    Args:
+
+    `job_dict` - The details of job, as returned by `_claim_next_job()`.
+    `running_jobs_count` - The number of jobs running when this job is started (including it), to share the CPU cores.
+    """
+    # Already imported by `_initialize_job_worker()`, so it doesn't take any time here.
+    import uid_generator
+
+    # Google API limit is shared by all job workers through `request_rate_limiter` module, so a job running alone gets
+    # all of it. CPU cores are split among the jobs running when this one starts.
+    uid_generator.generate_unique_ids(
+        part_category=job_dict["PART_CATEGORY"],
+        cap_color_codes=job_dict["CAP_COLOR_CODES"],
+        special_code=job_dict["SPECIAL_CODE"],
+        max_generate_limit=job_dict["MAX_GENERATE_LIMIT"],
+        requests_per_second=constants.GOOGLE_API_REQUESTS_PER_SECOND,
+        encryption_max_workers=max(
+            1, constants.ENCRYPTION_MAX_WORKERS // max(1, running_jobs_count)
+        ),
+        job_id=job_dict["JOB_ID"],
+    )
+
+
+class JobQueueHost:
+    """
+    Class that create & hold the background thread which tries to become the job queue host of current process,
+    and runs the queued jobs once it's the host.
+    """
+
+    # Host thread of current process.
+    _host_thread: threading.Thread = None
+
+    # Process ID which started `_host_thread`, as threads aren't copied to forked processes.
+    _host_pid: int = None
+
+    @staticmethod
+    def _run_jobs() -> None:
+        """`Private method.`"""
+
+        failed_jobs_count: int = _fail_interrupted_jobs()
+        if failed_jobs_count > 0:
+            print(f"- Marked {failed_jobs_count} jobs interrupted by restart as failed")
+
+        # Workers are spawned instead of forked, so they don't inherit the host lock (which would stay held by them
+        # if the host stops) or the threads & connections of Dash server.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=constants.JOB_WORKERS_COUNT,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_job_worker,
+        ) as process_pool_executor:
+            # Start all workers now, instead of when the jobs arrive.
+            concurrent.futures.wait(
+                [
+                    process_pool_executor.submit(time.sleep, 0.1)
+                    for _ in range(constants.JOB_WORKERS_COUNT)
+                ]
+            )
+
+            running_jobs_dict: typing.Dict[concurrent.futures.Future, str] = {}
+
+            while True:
+                # Fill the idle workers with the oldest queued jobs.
+                while len(running_jobs_dict) < constants.JOB_WORKERS_COUNT:
+                    job_dict: dict = _claim_next_job()
+                    if job_dict is None:
+                        break
+                    running_jobs_dict[
+                        process_pool_executor.submit(
+                            _run_job, job_dict, len(running_jobs_dict) + 1
+                        )
+                    ] = job_dict["JOB_ID"]
+
+                done_futures_set, _ = concurrent.futures.wait(
+                    running_jobs_dict.keys(),
+                    timeout=constants.JOB_QUEUE_POLL_INTERVAL_SECONDS,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                # Waiting for nothing returns at once, so wait for the next poll here.
+                if len(running_jobs_dict) <= 0:
+                    time.sleep(constants.JOB_QUEUE_POLL_INTERVAL_SECONDS)
+
+                for done_future in done_futures_set:
+                    job_id: str = running_jobs_dict.pop(done_future)
+                    job_error: BaseException = done_future.exception()
+                    if job_error is None:
+                        _finish_job(job_id=job_id)
+                    else:
+                        _fail_job(job_id=job_id, reason=f"Failed with {job_error!r}")
+                    print(
+                        f"- Job {job_id} {'completed' if job_error is None else f'failed: {job_error!r}'}"
+                    )
+
+    @staticmethod
+    def _run_host_election() -> None:
+        """`Private method.`"""
+
+        while True:
+            try:
+                # Non-blocking, so the processes which aren't the host only enqueue the jobs.
+                with file_lock.acquire_file_lock(
+                    lock_name="JOB_QUEUE_HOST", timeout_seconds=0
+                ):
+                    JobQueueHost._run_jobs()
+            except file_lock.LockTimeoutError:
+                pass
+            except Exception as error:
+                # Become the host again in next round, for e.g. when a worker process was killed.
+                print(f"[!] Job queue host stopped: {error!r}")
+
+            time.sleep(constants.JOB_QUEUE_HOST_ELECTION_INTERVAL_SECONDS)
+
+    @staticmethod
+    def start() -> None:
+        """
+        Starts the host thread, ensuring only one is running per process.
+
+        `Public method.`
+        """
+        if (
+            JobQueueHost._host_thread is not None
+            and JobQueueHost._host_pid == os.getpid()
+        ):
+            return
+
+        # Daemon thread doesn't keep the application running after it's stopped.
+        JobQueueHost._host_thread = threading.Thread(
+            target=JobQueueHost._run_host_election,
+            name="JobQueueHost",
+            daemon=True,
+        )
+        JobQueueHost._host_pid = os.getpid()
+        JobQueueHost._host_thread.start()
+
+
+# Handle execution in case launched as a stand-alone script, to run the queued jobs without Dash server.
+if __name__ == "__main__":
+    with file_lock.acquire_file_lock(lock_name="JOB_QUEUE_HOST", timeout_seconds=None):
+        JobQueueHost._run_jobs()
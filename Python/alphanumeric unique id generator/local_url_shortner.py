@@ -0,0 +1,234 @@
+"""
+Self-hosted short URL backend, which is an alternative to Firebase short links API without its rate limit.
+
+Short codes are random base62 strings stored (with their encrypted encoded unique IDs) in a local SQLite database,
+so large batches are shortened at local disk speed. The redirect service in this module resolves the short codes
+to the long link, i.e. `SHORT_URL_LINK_PREFIX` followed by the encrypted encoded unique ID.
+
+To start the redirect service, run command: `python3 local_url_shortner.py`
+"""
+
+import re
+import secrets
+import sqlite3
+import threading
+import typing
+
+import flask
+
+import constants
+import sqlite_connections
+
+
+BASE62_CHARS: str = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+""" Characters used by the short codes. """
+
+SHORT_CODE_LENGTH: int = 8
+""" Length of short codes, which gives 62^8 (over 218 trillion) possible codes, so they can't be guessed. """
+
+# Maximum number of tokens passed in a single "IN (...)" query, kept below SQLite's limit of host parameters.
+_QUERY_BATCH_SIZE: int = 500
+
+_SHORT_CODE_PATTERN: re.Pattern = re.compile(f"^[0-9A-Za-z]{{{SHORT_CODE_LENGTH}}}$")
+
+# Schema of the short links database, created once per process.
+_SCHEMA_SQL: str = """
+CREATE TABLE IF NOT EXISTS SHORT_CODES (
+    SHORT_CODE TEXT PRIMARY KEY,
+    TOKEN TEXT NOT NULL UNIQUE,
+    CREATED_TIMESTAMP REAL NOT NULL DEFAULT (julianday('now'))
+) WITHOUT ROWID;
+"""
+
+# Connection is shared by all threads of redirect service, so its use is serialized.
+_connection_lock: threading.Lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Returns the SQLite connection to short links database of current process.
+    """
+    return sqlite_connections.SQLiteConnections.get_connection(
+        database_file_path=constants.LOCAL_SHORT_LINKS_FILE_PATH,
+        schema_sql=_SCHEMA_SQL,
+    )
+
+
+def _create_short_code() -> str:
+    """
+    Returns a random short code of `SHORT_CODE_LENGTH` base62 characters.
+    """
+    value: int = secrets.randbelow(len(BASE62_CHARS) ** SHORT_CODE_LENGTH)
+    short_code_chars: typing.List[str] = []
+
+    for _ in range(SHORT_CODE_LENGTH):
+        value, char_idx = divmod(value, len(BASE62_CHARS))
+        short_code_chars.append(BASE62_CHARS[char_idx])
+
+    return "".join(short_code_chars)
+
+
+def _get_short_codes(
+    connection: sqlite3.Connection,
+    tokens_list: typing.List[str],
+) -> typing.Dict[str, str]:
+    """
+    Returns the `dict` of tokens from `tokens_list` which already have a short code, mapped with that short code.
+    """
+    short_codes_dict: typing.Dict[str, str] = {}
+
+    for start_idx in range(0, len(tokens_list), _QUERY_BATCH_SIZE):
+        tokens_batch: typing.List[str] = tokens_list[
+            start_idx : start_idx + _QUERY_BATCH_SIZE
+        ]
+        short_codes_dict.update(
+            connection.execute(
+                "SELECT TOKEN, SHORT_CODE FROM SHORT_CODES WHERE TOKEN IN ({})".format(
+                    ",".join("?" * len(tokens_batch))
+                ),
+                tokens_batch,
+            ).fetchall()
+        )
+
+    return short_codes_dict
+
+
+def shorten_tokens(
+    tokens_list: typing.List[str],
+) -> typing.Dict[str, str]:
+    """
+    Returns the `dict` of all `tokens_list` mapped with their short URLs, creating short codes for the ones not having it yet.
+
+    Tokens shortened earlier keep their short code, so calling it again for the same tokens never creates new short URLs.
+    """
+    tokens_list = list(dict.fromkeys(tokens_list))
+
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+
+        # "IMMEDIATE" takes the write lock at once, so processes shortening together are serialized.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            short_codes_dict: typing.Dict[str, str] = _get_short_codes(
+                connection=connection,
+                tokens_list=tokens_list,
+            )
+            new_tokens_list: typing.List[str] = [
+                token_str
+                for token_str in tokens_list
+                if token_str not in short_codes_dict
+            ]
+
+            # Insert is ignored for rare collisions of random short codes, so those tokens get new codes in next round.
+            while len(new_tokens_list) > 0:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO SHORT_CODES (SHORT_CODE, TOKEN) VALUES (?, ?)",
+                    [
+                        (_create_short_code(), token_str)
+                        for token_str in new_tokens_list
+                    ],
+                )
+                short_codes_dict.update(
+                    _get_short_codes(
+                        connection=connection,
+                        tokens_list=new_tokens_list,
+                    )
+                )
+                new_tokens_list = [
+                    token_str
+                    for token_str in new_tokens_list
+                    if token_str not in short_codes_dict
+                ]
+
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    return {
+        token_str: constants.LOCAL_SHORT_LINKS_BASE_URL + short_code
+        for token_str, short_code in short_codes_dict.items()
+    }
+
+
+def resolve_short_code(short_code: str) -> str:
+    """
+    Returns the token for `short_code`, or empty string if it's not a known short code.
+    """
+    # Reject the malformed codes without any database lookup.
+    if _SHORT_CODE_PATTERN.match(short_code) is None:
+        return ""
+
+    with _connection_lock:
+        token_row: tuple = (
+            _get_connection()
+            .execute(
+                "SELECT TOKEN FROM SHORT_CODES WHERE SHORT_CODE = ?",
+                (short_code,),
+            )
+            .fetchone()
+        )
+
+    return "" if token_row is None else token_row[0]
+
+
+def collect_local_short_urls(
+    encrypted_encoded_coupon_codes_list: typing.List[str],
+    unique_ids_to_short_url_dict: dict,
+    response_statuses_dict: dict = None,
+    short_urls_received_callback: typing.Callable[[int], None] = None,
+) -> None:
+    """
+    Creates the short URLs using local short codes, with the same arguments as `collect_firebase_short_urls()` of `firebase_url_shortner` module.
+
+    Args:
+
+    `encrypted_encoded_coupon_codes_list` - This is list of Unique ID strings in encrypted and encoded format.
+    `unique_ids_to_short_url_dict` - This is a mapping to store Unique ID with created short URLs.
+    `response_statuses_dict` - Optional mapping to store status code against each encrypted encoded Unique ID, which is always `200`.
+    `short_urls_received_callback` - Optional function called with the number of short URLs created, once all those are created.
+    """
+    if len(encrypted_encoded_coupon_codes_list) <= 0:
+        return
+
+    tokens_to_short_url_dict: typing.Dict[str, str] = shorten_tokens(
+        tokens_list=encrypted_encoded_coupon_codes_list
+    )
+    unique_ids_to_short_url_dict.update(tokens_to_short_url_dict)
+
+    if response_statuses_dict is not None:
+        response_statuses_dict.update(
+            dict.fromkeys(tokens_to_short_url_dict.keys(), 200)
+        )
+
+    if short_urls_received_callback is not None:
+        short_urls_received_callback(len(tokens_to_short_url_dict))
+
+    print(f"- URLs mapped : {len(tokens_to_short_url_dict)}, using local short codes")
+
+
+def create_redirect_app() -> flask.Flask:
+    """
+    Returns the `flask` application of redirect service, which redirects every known short code to its long link.
+    """
+    redirect_app: flask.Flask = flask.Flask(__name__)
+
+    @redirect_app.route("/<short_code>")
+    def redirect_short_code(short_code: str) -> flask.Response:
+        token_str: str = resolve_short_code(short_code=short_code)
+
+        if token_str == "":
+            flask.abort(404)
+
+        return flask.redirect(constants.SHORT_URL_LINK_PREFIX + token_str, code=302)
+
+    return redirect_app
+
+
+# Handle execution in case launched as a stand-alone script, to start the redirect service.
+if __name__ == "__main__":
+    create_redirect_app().run(
+        host=constants.HOST_ADDRESS,
+        port=constants.LOCAL_SHORT_LINKS_PORT_NO,
+        debug=constants.IS_DASH_DEBUG_MODE,
+    )
@@ -0,0 +1,397 @@
+"""
+Ledger of Google API quota reserved by the generation jobs, over a sliding window of last 24 hours.
+
+Reservations are persisted in an append-only log file, and every process keeps the reservations of last 24 hours
+in memory along with their running total. A release is logged with the timestamp of reservation it gives back, and
+is subtracted from that reservation, so both of them expire together. Only the lines appended after the last read are read again, so the
+remaining quota is answered without reading the whole log.
+
+First line of the log file is a header with its generation, which is changed whenever the file is rewritten by
+compaction, so other processes know that their read position is no more valid & read the new file from start.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+import typing
+import uuid
+
+import constants
+import file_lock
+
+
+# Length of sliding window of quota, in seconds.
+QUOTA_WINDOW_SECONDS: float = 24 * 60 * 60
+
+# Key of generation in the header line of log file.
+GENERATION_KEY: str = "GENERATION"
+
+
+class QuotaLedger:
+    """
+    Class that create & hold the quota ledger of current process, for easy access.
+    """
+
+    # Quota ledger object of current process.
+    _ledger_instance: "QuotaLedger" = None
+
+    # Process ID which created `_ledger_instance`, as forked processes must read the log on their own.
+    _ledger_pid: int = None
+
+    @staticmethod
+    def get_instance() -> "QuotaLedger":
+        """
+        Return the quota ledger, ensuring only one instance exist per process.
+
+        `Public method.`
+        """
+        if (
+            QuotaLedger._ledger_instance is None
+            or QuotaLedger._ledger_pid != os.getpid()
+        ):
+            QuotaLedger._ledger_instance = QuotaLedger()
+            QuotaLedger._ledger_pid = os.getpid()
+
+        return QuotaLedger._ledger_instance
+
+    def __init__(self) -> None:
+        # Reservations of last 24 hours as (timestamp, count) tuples, oldest first.
+        self._reservations_deque: typing.Deque[
+            typing.Tuple[float, int]
+        ] = collections.deque()
+        # Running total of counts in `_reservations_deque`.
+        self._reserved_count: int = 0
+
+        # Position upto which the log file is read, and the generation of log file it belongs to.
+        self._file_offset: int = 0
+        self._file_generation: str = None
+
+        # Dash callbacks run in multiple threads of same process.
+        self._thread_lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def _get_log_file_path() -> str:
+        """`Private method.`"""
+
+        os.makedirs(name=constants.INTERNAL_DATA_DIRPATH, exist_ok=True)
+
+        return os.path.join(constants.INTERNAL_DATA_DIRPATH, "quota_ledger.log")
+
+    def _reset(self) -> None:
+        """`Private method.`"""
+
+        self._reservations_deque.clear()
+        self._reserved_count = 0
+        self._file_offset = 0
+
+    @staticmethod
+    def _format_header(generation: str) -> bytes:
+        """`Private method.`"""
+
+        return (json.dumps({GENERATION_KEY: generation}) + "\n").encode()
+
+    @staticmethod
+    def _parse_generation(first_line_bytes: bytes) -> str:
+        """`Private method.`"""
+
+        # Header isn't written completely yet by the process creating the log file.
+        if not first_line_bytes.endswith(b"\n"):
+            return None
+
+        first_line_dict: dict = json.loads(first_line_bytes)
+
+        # Log file of earlier format starts with a reservation, and it's never compacted.
+        return str(first_line_dict.get(GENERATION_KEY, ""))
+
+    def _sync(self) -> None:
+        """`Private method.`"""
+
+        try:
+            with open(QuotaLedger._get_log_file_path(), mode="rb") as log_file:
+                file_generation: str = QuotaLedger._parse_generation(
+                    first_line_bytes=log_file.readline()
+                )
+                if file_generation is None:
+                    return
+
+                # Log file is rewritten by compaction, so read it again from start.
+                if file_generation != self._file_generation:
+                    self._reset()
+                    self._file_generation = file_generation
+
+                log_file.seek(self._file_offset)
+                appended_bytes: bytes = log_file.read()
+        except FileNotFoundError:
+            self._reset()
+            self._file_generation = None
+            return
+
+        # Read only complete lines, a line being appended by other process is read next time.
+        complete_length: int = appended_bytes.rfind(b"\n") + 1
+        for line_bytes in appended_bytes[:complete_length].splitlines():
+            if line_bytes.strip() == b"":
+                continue
+            reservation_dict: dict = json.loads(line_bytes)
+            if GENERATION_KEY in reservation_dict:
+                continue
+            if int(reservation_dict["COUNT"]) < 0:
+                self._subtract_release(
+                    reservation_timestamp=float(reservation_dict["TIMESTAMP"]),
+                    count=-int(reservation_dict["COUNT"]),
+                )
+                continue
+
+            self._reservations_deque.append(
+                (float(reservation_dict["TIMESTAMP"]), int(reservation_dict["COUNT"]))
+            )
+            self._reserved_count += int(reservation_dict["COUNT"])
+
+        self._file_offset += complete_length
+
+    def _subtract_release(self, reservation_timestamp: float, count: int) -> None:
+        """`Private method.`"""
+
+        # Releases are mostly of recent reservations, so search from the newest one.
+        for idx in range(len(self._reservations_deque) - 1, -1, -1):
+            timestamp, reserved_count = self._reservations_deque[idx]
+            if timestamp == reservation_timestamp:
+                released_count: int = min(count, reserved_count)
+                self._reservations_deque[idx] = (
+                    timestamp,
+                    reserved_count - released_count,
+                )
+                self._reserved_count -= released_count
+                return
+
+        # Reservation is already expired (or it's a release of earlier format without reservation timestamp),
+        # so there's nothing left to give back.
+
+    def _expire(self) -> None:
+        """`Private method.`"""
+
+        expiry_timestamp: float = time.time() - QUOTA_WINDOW_SECONDS
+
+        while (
+            len(self._reservations_deque) > 0
+            and self._reservations_deque[0][0] <= expiry_timestamp
+        ):
+            self._reserved_count -= self._reservations_deque.popleft()[1]
+
+    @staticmethod
+    def _create_log_file(log_file_path: str) -> None:
+        """`Private method.`"""
+
+        # Create the log file with its header, so it's seeded only once.
+        with open(log_file_path, mode="wb") as log_file:
+            log_file.write(QuotaLedger._format_header(generation=uuid.uuid4().hex))
+
+        # Carry the jobs tracked (before the ledger existed) in last 24 hours, so their quota isn't given again.
+        id_generation_tracking_csv_filepath: str = os.path.join(
+            constants.INTERNAL_DATA_DIRPATH,
+            constants.ID_GENERATION_TRACKING_CSV_FILENAME,
+        )
+        if not os.path.isfile(id_generation_tracking_csv_filepath):
+            return
+
+        # Needed only once to read the earlier tracking CSV file, so it isn't imported with the web server.
+        import pandas as pd
+
+        id_tracking_df: pd.DataFrame = pd.read_csv(id_generation_tracking_csv_filepath)
+        if len(id_tracking_df.index) <= 0:
+            return
+
+        start_timestamps: pd.Series = (
+            pd.to_datetime(
+                id_tracking_df["GENERATION_START_DATETIME"],
+                format=constants.ID_GENERATION_TRACKING_DATETIME_FORMAT,
+            )
+            .dt.tz_localize("Asia/Kolkata")
+            .map(lambda start_datetime: start_datetime.timestamp())
+        )
+
+        with open(log_file_path, mode="a") as log_file:
+            for start_timestamp, total_ids_count, part_category, special_code in zip(
+                start_timestamps,
+                id_tracking_df["TOTAL_IDS_TO_GENERATE"],
+                id_tracking_df["PART_CATEGORY"],
+                id_tracking_df["SPECIAL_CODE"].fillna(""),
+            ):
+                if start_timestamp > time.time() - QUOTA_WINDOW_SECONDS:
+                    log_file.write(
+                        json.dumps(
+                            {
+                                "TIMESTAMP": start_timestamp,
+                                "COUNT": int(total_ids_count),
+                                "PART_CATEGORY": str(part_category),
+                                "SPECIAL_CODE": str(special_code),
+                            }
+                        )
+                        + "\n"
+                    )
+
+    def get_remaining_quota(self) -> int:
+        """
+        Returns the quota remaining from `MAX_UNIQUE_ID_GENERATION_LIMIT` (from `constants` module) in last 24 hours.
+        """
+        with self._thread_lock:
+            log_file_path: str = QuotaLedger._get_log_file_path()
+            if not os.path.isfile(log_file_path):
+                with file_lock.acquire_file_lock(lock_name="QUOTA_LEDGER"):
+                    if not os.path.isfile(log_file_path):
+                        QuotaLedger._create_log_file(log_file_path=log_file_path)
+
+            self._sync()
+            self._expire()
+
+            remaining_quota: int = (
+                constants.MAX_UNIQUE_ID_GENERATION_LIMIT - self._reserved_count
+            )
+
+        return remaining_quota if (remaining_quota >= 0) else 0
+
+    def reserve(
+        self,
+        count: int,
+        part_category: str = "",
+        special_code: str = "",
+    ) -> float:
+        """
+        Reserves `count` quota if that much is remaining, and returns the timestamp of reservation (to release it later),
+        or `None` if it's not reserved.
+
+        Check and reservation are done while holding a file lock, so the jobs started together by any process
+        can never reserve more than the remaining quota.
+
+        Args:
+
+        `count` - The quota to be reserved, i.e. number of short URLs to be requested.
+        `part_category` - The part category of job, stored along with reservation.
+        `special_code` - The special code of job, stored along with reservation.
+        """
+        if count <= 0:
+            return time.time()
+
+        with self._thread_lock, file_lock.acquire_file_lock(lock_name="QUOTA_LEDGER"):
+            log_file_path: str = QuotaLedger._get_log_file_path()
+            if not os.path.isfile(log_file_path):
+                QuotaLedger._create_log_file(log_file_path=log_file_path)
+
+            self._sync()
+            self._expire()
+
+            if constants.MAX_UNIQUE_ID_GENERATION_LIMIT - self._reserved_count < count:
+                return None
+
+            reservation_timestamp: float = time.time()
+            with open(log_file_path, mode="a") as log_file:
+                log_file.write(
+                    json.dumps(
+                        {
+                            "TIMESTAMP": reservation_timestamp,
+                            "COUNT": count,
+                            "PART_CATEGORY": part_category,
+                            "SPECIAL_CODE": special_code,
+                        }
+                    )
+                    + "\n"
+                )
+                log_file.flush()
+                os.fsync(log_file.fileno())
+
+            self._sync()
+
+        return reservation_timestamp
+
+    def release(
+        self,
+        count: int,
+        reservation_timestamp: float,
+        part_category: str = "",
+        special_code: str = "",
+    ) -> None:
+        """
+        Gives back `count` quota reserved earlier, for e.g. when the job couldn't be started after reserving it.
+
+        Released quota is appended as a negative reservation stamped with `reservation_timestamp`, and subtracted from
+        that reservation, so the window never counts the release after its reservation is expired.
+
+        Args:
+
+        `count` - The quota to be released.
+        `reservation_timestamp` - The timestamp returned by `reserve()`, when this quota was reserved.
+        `part_category` - The part category of job, stored along with release.
+        `special_code` - The special code of job, stored along with release.
+        """
+        if count <= 0:
+            return
+
+        with self._thread_lock, file_lock.acquire_file_lock(lock_name="QUOTA_LEDGER"):
+            with open(QuotaLedger._get_log_file_path(), mode="a") as log_file:
+                log_file.write(
+                    json.dumps(
+                        {
+                            "TIMESTAMP": reservation_timestamp,
+                            "COUNT": -count,
+                            "PART_CATEGORY": part_category,
+                            "SPECIAL_CODE": special_code,
+                        }
+                    )
+                    + "\n"
+                )
+                log_file.flush()
+                os.fsync(log_file.fileno())
+
+            self._sync()
+
+    def compact(self) -> None:
+        """
+        Rewrites the log file with reservations of last 24 hours only, if any of its reservations are expired.
+
+        Log file is replaced at once with a new generation in its header, so other processes notice the change and read
+        the new file from start.
+        """
+        with self._thread_lock, file_lock.acquire_file_lock(lock_name="QUOTA_LEDGER"):
+            log_file_path: str = QuotaLedger._get_log_file_path()
+            if not os.path.isfile(log_file_path):
+                return
+
+            expiry_timestamp: float = time.time() - QUOTA_WINDOW_SECONDS
+
+            with open(log_file_path, mode="rb") as log_file:
+                lines_list: typing.List[bytes] = [
+                    line_bytes
+                    for line_bytes in log_file.read().splitlines(keepends=True)
+                    if line_bytes.strip() != b""
+                    and GENERATION_KEY not in json.loads(line_bytes)
+                ]
+            valid_lines_list: typing.List[bytes] = [
+                line_bytes
+                for line_bytes in lines_list
+                if float(json.loads(line_bytes)["TIMESTAMP"]) > expiry_timestamp
+            ]
+
+            if len(valid_lines_list) == len(lines_list):
+                return
+
+            compacted_file_path: str = f"{log_file_path}.compacted"
+            with open(compacted_file_path, mode="wb") as compacted_file:
+                compacted_file.write(
+                    QuotaLedger._format_header(generation=uuid.uuid4().hex)
+                )
+                compacted_file.writelines(valid_lines_list)
+                compacted_file.flush()
+                os.fsync(compacted_file.fileno())
+
+            os.replace(compacted_file_path, log_file_path)
+
+            self._sync()
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(QuotaLedger.get_instance().get_remaining_quota())
+    # print(QuotaLedger.get_instance().reserve(count=100, part_category="AL"))
+    # print(QuotaLedger.get_instance().get_remaining_quota())
@@ -0,0 +1,83 @@
+"""
+Rate limit of short links API requests, shared by all processes sending them.
+
+Every request takes the next free slot on a timeline stored in a SQLite database, and consecutive slots are
+`1 / requests_per_second` apart. So the jobs (and their cap color codes) sending requests together never exceed the
+rate, while a job running alone gets the whole of it.
+"""
+
+import sqlite3
+import threading
+import time
+
+import constants
+import sqlite_connections
+
+
+SHORT_LINKS_API_LIMIT_NAME: str = "SHORT_LINKS_API"
+""" Name of the rate limit of Google's short links API, shared by generation, retries and resumed dead letters. """
+
+# Schema of the rate limits database, created once per process.
+_SCHEMA_SQL: str = """
+CREATE TABLE IF NOT EXISTS RATE_LIMITS (
+    LIMIT_NAME TEXT PRIMARY KEY,
+    NEXT_SLOT_TIMESTAMP REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Connection is shared by all threads of current process, so its use is serialized.
+_connection_lock: threading.Lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Returns the SQLite connection to rate limits database of current process.
+    """
+    return sqlite_connections.SQLiteConnections.get_connection(
+        database_file_path=constants.REQUEST_RATE_LIMITS_FILE_PATH,
+        schema_sql=_SCHEMA_SQL,
+    )
+
+
+def reserve_request_slot(limit_name: str, requests_per_second: float) -> float:
+    """
+    Reserves the next free slot of `limit_name` for a single request, and returns its timestamp (comparable with
+    `time.time()`), at which the request can be sent.
+
+    Args:
+
+    `limit_name` - The name of rate limit, for e.g. `SHORT_LINKS_API_LIMIT_NAME`.
+    `requests_per_second` - The maximum number of requests per second, counted together with all other processes.
+    """
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+
+        # Read and move the next free slot in the same transaction, so no two processes get the same slot.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            limit_row: tuple = connection.execute(
+                "SELECT NEXT_SLOT_TIMESTAMP FROM RATE_LIMITS WHERE LIMIT_NAME = ?",
+                (limit_name,),
+            ).fetchone()
+
+            # Slots left unused while idle aren't saved up, so requests never burst above the rate.
+            slot_timestamp: float = time.time()
+            if limit_row is not None:
+                slot_timestamp = max(slot_timestamp, limit_row[0])
+
+            connection.execute(
+                "INSERT OR REPLACE INTO RATE_LIMITS (LIMIT_NAME, NEXT_SLOT_TIMESTAMP) VALUES (?, ?)",
+                (limit_name, slot_timestamp + 1.0 / requests_per_second),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    return slot_timestamp
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(reserve_request_slot(limit_name=SHORT_LINKS_API_LIMIT_NAME, requests_per_second=5))
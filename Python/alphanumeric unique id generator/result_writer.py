@@ -0,0 +1,137 @@
+"""
+Constant-memory writer of user downloadable result Excel files.
+
+Rows are streamed using write-only workbook of `openpyxl`, which writes every appended row to a temporary file instead of
+keeping the whole workbook in memory. A worksheet continues in the next one once it has `RESULT_EXCEL_MAX_SHEET_ROWS`
+(from `constants` module) rows, and a file continues in the next one once it has `RESULT_EXCEL_MAX_SHEETS_PER_FILE`
+worksheets, so results of any size stay within the row limit of Excel.
+"""
+
+import os
+import typing
+
+import openpyxl
+
+import constants
+import utility_functions
+
+
+RESULT_COLUMNS: typing.List[str] = [
+    "Product category",
+    "Cap colour",
+    "Unique record",
+    "Date of generation",
+]
+""" Header row of every worksheet in result Excel files. """
+
+
+class ResultExcelWriter:
+    """
+    Class that streams the rows of `RESULT_COLUMNS` to result Excel file at `file_path` (already reserved), along with
+    the next files and worksheets it continues in. Worksheets are titled as `sheet_title`, numbered from the second one.
+
+    Rows are only saved once `close()` is called, which returns the paths of all written files.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        sheet_title: str,
+    ) -> None:
+        self._file_path: str = file_path
+        self._sheet_title: str = sheet_title
+
+        # Header row takes one row of Excel's limit as well.
+        self._max_sheet_rows: int = max(
+            1,
+            min(
+                constants.RESULT_EXCEL_MAX_SHEET_ROWS,
+                constants.EXCEL_MAX_SHEET_ROWS - 1,
+            ),
+        )
+        self._max_sheets_per_file: int = max(
+            1, constants.RESULT_EXCEL_MAX_SHEETS_PER_FILE
+        )
+
+        self._file_paths_list: typing.List[str] = [file_path]
+        self._workbook: openpyxl.Workbook = None
+        self._worksheet: "openpyxl.worksheet._write_only.WriteOnlyWorksheet" = None
+        self._file_sheets_count: int = 0
+        self._total_sheets_count: int = 0
+        self._sheet_rows_count: int = 0
+
+        self._create_worksheet()
+
+    def _create_worksheet(self) -> None:
+        """`Private method.`"""
+
+        if self._workbook is None:
+            self._workbook = openpyxl.Workbook(write_only=True)
+            self._file_sheets_count = 0
+
+        self._total_sheets_count += 1
+        self._file_sheets_count += 1
+        self._sheet_rows_count = 0
+
+        self._worksheet = self._workbook.create_sheet(
+            title=(
+                self._sheet_title
+                if self._total_sheets_count <= 1
+                else f"{self._sheet_title}_{self._total_sheets_count}"
+            )
+        )
+        self._worksheet.append(RESULT_COLUMNS)
+
+    def _roll_over(self) -> None:
+        """`Private method.`"""
+
+        if self._file_sheets_count < self._max_sheets_per_file:
+            self._create_worksheet()
+            return
+
+        # Write-only workbook can be saved only once, so current file is finished and the next one is started.
+        self._workbook.save(self._file_paths_list[-1])
+        self._workbook = None
+
+        self._file_paths_list.append(
+            utility_functions.reserve_file_path(
+                dir_path=os.path.dirname(self._file_path),
+                file_name=f"{os.path.splitext(os.path.basename(self._file_path))[0]}_PART_{len(self._file_paths_list) + 1}",
+                file_extension="xlsx",
+            )
+        )
+        self._create_worksheet()
+
+    def append_rows(self, rows_iter: typing.Iterable[tuple]) -> int:
+        """
+        Appends every row of `rows_iter` (with values in the order of `RESULT_COLUMNS`), and returns the number of appended rows.
+        """
+        appended_rows_count: int = 0
+
+        for row_values in rows_iter:
+            if self._sheet_rows_count >= self._max_sheet_rows:
+                self._roll_over()
+
+            self._worksheet.append(row_values)
+            self._sheet_rows_count += 1
+            appended_rows_count += 1
+
+        return appended_rows_count
+
+    def close(self) -> typing.List[str]:
+        """
+        Saves the current file, and returns the paths of all written files in order.
+        """
+        if self._workbook is not None:
+            self._workbook.save(self._file_paths_list[-1])
+            self._workbook = None
+
+        return list(self._file_paths_list)
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # result_writer = ResultExcelWriter(file_path="Result/TEST.xlsx", sheet_title="TEST")
+    # result_writer.append_rows([("Category", "Color", "https://example.com", "01/01/2024")])
+    # print(result_writer.close())
@@ -0,0 +1,146 @@
+"""
+Integer-backed engine for the alpha-numeric part of Unique IDs.
+
+The alpha-numeric sequence (for e.g. "00001A") uses the characters `0-9` followed by `A-Z`,
+so it is just a base-36 number rendered with upper case digits and left padded with zeros
+up to the current alpha-numeric digit length. When the sequence crosses the largest value
+for current length (for e.g. "ZZZZZZ"), the next value naturally becomes one digit longer ("1000000").
+
+Treating the sequence as an integer lets us render large blocks of IDs without incrementing
+them character by character.
+"""
+
+import typing
+
+
+ALPHA_NUMERIC_CHARS: str = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+""" Characters used by the alpha-numeric sequence, in the order of their digit values. """
+
+ALPHA_NUMERIC_BASE: int = len(ALPHA_NUMERIC_CHARS)
+""" Base of the alpha-numeric sequence, i.e. 36. """
+
+# Pre-rendered last 2 characters for all the values from "00" to "ZZ" (i.e. 1296 values).
+# Rendering of a block only needs to compute the remaining (leading) characters once per 1296 IDs.
+_SUFFIX_LENGTH: int = 2
+_SUFFIX_BASE: int = ALPHA_NUMERIC_BASE**_SUFFIX_LENGTH
+_SUFFIXES: typing.Tuple[str, ...] = tuple(
+    first_char + second_char
+    for first_char in ALPHA_NUMERIC_CHARS
+    for second_char in ALPHA_NUMERIC_CHARS
+)
+
+
+def unique_id_to_int(unique_id_str: str) -> int:
+    """
+    Returns the integer value of alpha-numeric sequence `unique_id_str`. For e.g., "00001A" returns 46.
+    """
+    unique_id_str = unique_id_str.strip().upper()
+    if unique_id_str == "":
+        return 0
+    return int(unique_id_str, ALPHA_NUMERIC_BASE)
+
+
+def get_digit_length(value: int, alpha_numeric_digit_length: int) -> int:
+    """
+    Returns the digit length needed to render `value`, which is never less than `alpha_numeric_digit_length`.
+    """
+    digit_length: int = alpha_numeric_digit_length
+    while value >= ALPHA_NUMERIC_BASE**digit_length:
+        digit_length += 1
+    return digit_length
+
+
+def int_to_unique_id(value: int, alpha_numeric_digit_length: int) -> str:
+    """
+    Returns alpha-numeric sequence for `value`, left padded with zeros up to `alpha_numeric_digit_length`.
+    For e.g., 46 with digit length 6 returns "00001A".
+    """
+    if value < 0:
+        raise ValueError(f"Alpha-numeric sequence value can't be negative: {value}")
+
+    chars: typing.List[str] = []
+    while value > 0:
+        value, remainder = divmod(value, ALPHA_NUMERIC_BASE)
+        chars.append(ALPHA_NUMERIC_CHARS[remainder])
+
+    return "".join(reversed(chars)).rjust(alpha_numeric_digit_length, "0")
+
+
+def next_unique_id(unique_id_str: str) -> str:
+    """
+    Returns the alpha-numeric sequence coming just after `unique_id_str`, keeping its length
+    or growing it by one digit when the limit is crossed. For e.g., "00001Z" returns "000020" and "ZZZZZZ" returns "1000000".
+    """
+    return int_to_unique_id(
+        value=unique_id_to_int(unique_id_str) + 1,
+        alpha_numeric_digit_length=len(unique_id_str.strip()),
+    )
+
+
+def render_unique_ids_block(
+    start_value: int,
+    count: int,
+    alpha_numeric_digit_length: int,
+) -> typing.Tuple[typing.List[str], int, int]:
+    """
+    Renders `count` consecutive alpha-numeric sequences starting from `start_value`.
+
+    Returns a `tuple` of rendered sequences list, the next value to be used after this block and
+    the alpha-numeric digit length for that next value (which grows when the block crosses the limit of current length).
+
+    Args:
+
+    `start_value` - The integer value of first alpha-numeric sequence in the block.
+    `count` - The number of sequences to be rendered.
+    `alpha_numeric_digit_length` - The current digit length used to fill left un-used positions with zeros.
+    """
+    unique_ids_list: typing.List[str] = []
+    value: int = start_value
+    end_value: int = start_value + count
+    digit_length: int = get_digit_length(
+        value=start_value, alpha_numeric_digit_length=alpha_numeric_digit_length
+    )
+
+    while value < end_value:
+        # Render up to the limit of current digit length, after that the length grows by one digit.
+        segment_end_value: int = min(end_value, ALPHA_NUMERIC_BASE**digit_length)
+
+        if digit_length < _SUFFIX_LENGTH:
+            unique_ids_list.extend(
+                int_to_unique_id(
+                    value=segment_value, alpha_numeric_digit_length=digit_length
+                )
+                for segment_value in range(value, segment_end_value)
+            )
+        else:
+            # Render the leading characters once and join them with pre-rendered suffixes.
+            prefix_value, suffix_start = divmod(value, _SUFFIX_BASE)
+            while value < segment_end_value:
+                prefix_str: str = int_to_unique_id(
+                    value=prefix_value,
+                    alpha_numeric_digit_length=digit_length - _SUFFIX_LENGTH,
+                )
+                suffix_end: int = min(
+                    _SUFFIX_BASE, segment_end_value - prefix_value * _SUFFIX_BASE
+                )
+                unique_ids_list.extend(
+                    [
+                        prefix_str + suffix
+                        for suffix in _SUFFIXES[suffix_start:suffix_end]
+                    ]
+                )
+                value = prefix_value * _SUFFIX_BASE + suffix_end
+                prefix_value += 1
+                suffix_start = 0
+
+        value = segment_end_value
+        if value == ALPHA_NUMERIC_BASE**digit_length:
+            digit_length += 1
+
+    return unique_ids_list, end_value, digit_length
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(render_unique_ids_block(start_value=0, count=10, alpha_numeric_digit_length=6))
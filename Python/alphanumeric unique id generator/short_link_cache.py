@@ -0,0 +1,87 @@
+"""
+On-disk cache of short URLs, mapping the encrypted encoded unique ID (token) to its short URL.
+
+Every short URL costs the daily quota of Google API, so once received it's stored here and never requested again,
+even if the generation process crashes or the missing short URLs are retried.
+"""
+
+import sqlite3
+import typing
+
+import constants
+import sqlite_connections
+
+
+# Maximum number of tokens passed in a single "IN (...)" query, kept below SQLite's limit of host parameters.
+_QUERY_BATCH_SIZE: int = 500
+
+
+# Schema of the cache database, created once per process.
+_SCHEMA_SQL: str = """
+CREATE TABLE IF NOT EXISTS SHORT_LINKS (
+    TOKEN TEXT PRIMARY KEY,
+    SHORT_URL TEXT NOT NULL,
+    CREATED_TIMESTAMP REAL NOT NULL DEFAULT (julianday('now'))
+) WITHOUT ROWID;
+"""
+
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Returns the SQLite connection to short links cache of current process.
+    """
+    return sqlite_connections.SQLiteConnections.get_connection(
+        database_file_path=constants.SHORT_LINKS_CACHE_FILE_PATH,
+        schema_sql=_SCHEMA_SQL,
+    )
+
+
+def get_cached_short_urls(
+    tokens_list: typing.List[str],
+) -> typing.Dict[str, str]:
+    """
+    Returns the `dict` of tokens from `tokens_list` which have a cached short URL, mapped with that short URL.
+    """
+    connection: sqlite3.Connection = _get_connection()
+    cached_short_urls_dict: typing.Dict[str, str] = {}
+
+    for start_idx in range(0, len(tokens_list), _QUERY_BATCH_SIZE):
+        tokens_batch: typing.List[str] = tokens_list[
+            start_idx : start_idx + _QUERY_BATCH_SIZE
+        ]
+        cached_short_urls_dict.update(
+            connection.execute(
+                "SELECT TOKEN, SHORT_URL FROM SHORT_LINKS WHERE TOKEN IN ({})".format(
+                    ",".join("?" * len(tokens_batch))
+                ),
+                tokens_batch,
+            ).fetchall()
+        )
+
+    return cached_short_urls_dict
+
+
+def store_short_urls(
+    tokens_to_short_url_dict: typing.Dict[str, str],
+) -> None:
+    """
+    Stores all non-empty short URLs from `tokens_to_short_url_dict` in cache, in a single transaction.
+    """
+    connection: sqlite3.Connection = _get_connection()
+
+    with connection:
+        connection.executemany(
+            "INSERT OR IGNORE INTO SHORT_LINKS (TOKEN, SHORT_URL) VALUES (?, ?)",
+            [
+                (token_str, short_url)
+                for token_str, short_url in tokens_to_short_url_dict.items()
+                if short_url != ""
+            ],
+        )
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # store_short_urls(tokens_to_short_url_dict={"TOKEN_1": "https://short.link/1"})
+    # print(get_cached_short_urls(tokens_list=["TOKEN_1", "TOKEN_2"]))
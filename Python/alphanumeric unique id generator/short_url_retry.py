@@ -0,0 +1,153 @@
+"""
+Bounded retries of missing short URLs, with exponential backoff, random jitter and a circuit breaker.
+
+During an outage of short links API, retries stop once the circuit breaker opens, so the generation process still
+finishes and the unique IDs left without short URLs are moved to dead letters (see `dead_letter_queue` module).
+"""
+
+import random
+import time
+import typing
+
+import constants
+import url_shortner
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    """
+    Returns `True` if a request which failed with `status_code` is worth sending again.
+    Status code `0` means no response was received, for e.g. due to connection error or timeout, and `-1` means
+    the request wasn't sent at all because circuit breaker was open.
+    """
+    return status_code in (-1, 0, 200, 408, 429) or status_code >= 500
+
+
+def _is_outage_status(status_code: int) -> bool:
+    """
+    Returns `True` if `status_code` indicates that short links API is throttling or unavailable.
+    """
+    return status_code in (0, 429) or status_code >= 500
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that opens after `SHORT_URL_CIRCUIT_BREAKER_THRESHOLD` (from `constants` module) consecutive
+    responses throttled or failed, counted as the responses arrive.
+
+    While open, no requests should be sent, so the requests of a round not sent yet are skipped at once. Once
+    `SHORT_URL_CIRCUIT_BREAKER_COOLDOWN_SECONDS` pass, requests are allowed as a trial, and the circuit opens again
+    with the first of those failing too.
+    """
+
+    def __init__(
+        self,
+        threshold: int = constants.SHORT_URL_CIRCUIT_BREAKER_THRESHOLD,
+        cooldown_seconds: float = constants.SHORT_URL_CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+    ) -> None:
+        self.threshold: int = threshold
+        self.cooldown_seconds: float = cooldown_seconds
+        self.failed_responses_count: int = 0
+        self.open_until_time: float = 0.0
+
+    def is_open(self) -> bool:
+        """
+        Returns `True` if no requests should be sent now.
+        """
+        return time.monotonic() < self.open_until_time
+
+    def record_response(self, status_code: int) -> None:
+        """
+        Records the HTTP status code of a response as soon as it arrives, or `0` if no response was received.
+        """
+        # Count isn't reset after cooldown, so a failing trial request opens the circuit again.
+        if not _is_outage_status(status_code):
+            self.failed_responses_count = 0
+            return
+
+        self.failed_responses_count += 1
+
+        # Responses of requests already in flight may still arrive while open, those don't extend the cooldown.
+        if self.failed_responses_count >= self.threshold and not self.is_open():
+            self.open_until_time = time.monotonic() + self.cooldown_seconds
+            print(
+                f"[!] Short links API keeps failing, no requests will be sent for {self.cooldown_seconds:.0f} seconds."
+            )
+
+
+def get_backoff_delay_seconds(retry_idx: int) -> float:
+    """
+    Returns the delay before retry number `retry_idx` (starting from `0`), which grows exponentially
+    from `SHORT_URL_RETRY_BASE_DELAY_SECONDS` upto `SHORT_URL_RETRY_MAX_DELAY_SECONDS` with "full jitter",
+    so the processes retrying together don't send their requests at the same moments.
+    """
+    return random.uniform(
+        0.0,
+        min(
+            constants.SHORT_URL_RETRY_MAX_DELAY_SECONDS,
+            constants.SHORT_URL_RETRY_BASE_DELAY_SECONDS * (2**retry_idx),
+        ),
+    )
+
+
+def retry_missing_short_urls(
+    encrypted_encoded_coupon_codes_list: typing.List[str],
+    unique_ids_to_short_url_dict: dict,
+    circuit_breaker: CircuitBreaker,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+    max_retries: int = constants.SHORT_URL_MAX_RETRIES,
+) -> typing.Dict[str, int]:
+    """
+    Requests the short URLs for `encrypted_encoded_coupon_codes_list` again, upto `max_retries` times each,
+    waiting with exponential backoff between the retries.
+
+    Returns the `dict` of encrypted encoded Unique IDs still missing their short URLs, mapped with HTTP status code
+    of their last response (or `-1` if not requested because `circuit_breaker` was open).
+
+    Args:
+
+    `encrypted_encoded_coupon_codes_list` - The list of encrypted encoded Unique IDs missing their short URLs.
+    `unique_ids_to_short_url_dict` - The mapping to store encrypted encoded Unique IDs with received short URLs.
+    `circuit_breaker` - The circuit breaker shared by all requests of the generation process.
+    `requests_per_second` - The maximum number of POST requests per second.
+    `max_retries` - The maximum number of retries for each of encrypted encoded Unique ID.
+    """
+    last_statuses_dict: typing.Dict[str, int] = {
+        encrypted_encoded_coupon_code: -1
+        for encrypted_encoded_coupon_code in encrypted_encoded_coupon_codes_list
+    }
+    pending_codes_list: typing.List[str] = list(last_statuses_dict.keys())
+
+    for retry_idx in range(max_retries):
+        if len(pending_codes_list) <= 0 or circuit_breaker.is_open():
+            break
+
+        time.sleep(get_backoff_delay_seconds(retry_idx=retry_idx))
+
+        print(
+            f"\n -- Retry {retry_idx + 1}/{max_retries} for {len(pending_codes_list)} missing short URLs..."
+        )
+
+        response_statuses_dict: typing.Dict[str, int] = {}
+        url_shortner.collect_short_urls(
+            encrypted_encoded_coupon_codes_list=pending_codes_list,
+            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+            requests_per_second=requests_per_second,
+            response_statuses_dict=response_statuses_dict,
+            circuit_breaker=circuit_breaker,
+        )
+
+        last_statuses_dict.update(response_statuses_dict)
+
+        # Keep retrying only the ones still missing and failed for a temporary reason.
+        pending_codes_list = [
+            encrypted_encoded_coupon_code
+            for encrypted_encoded_coupon_code in pending_codes_list
+            if unique_ids_to_short_url_dict.get(encrypted_encoded_coupon_code, "") == ""
+            and _is_retryable_status(last_statuses_dict[encrypted_encoded_coupon_code])
+        ]
+
+    return {
+        encrypted_encoded_coupon_code: status_code
+        for encrypted_encoded_coupon_code, status_code in last_statuses_dict.items()
+        if unique_ids_to_short_url_dict.get(encrypted_encoded_coupon_code, "") == ""
+    }
@@ -0,0 +1,57 @@
+import os
+import sqlite3
+import typing
+
+
+class SQLiteConnections:
+    """
+    Class that create & hold a single SQLite connection per database file in each process, for easy access.
+    """
+
+    # Mapping of database file paths with their SQLite connection objects.
+    _connections_dict: typing.Dict[str, sqlite3.Connection] = {}
+
+    # Process ID which created `_connections_dict`, as connections must not be shared with the forked processes.
+    _connections_pid: int = None
+
+    @staticmethod
+    def _create_connection(database_file_path: str, schema_sql: str) -> None:
+        """`Private method.`"""
+
+        os.makedirs(name=os.path.dirname(database_file_path) or ".", exist_ok=True)
+
+        connection: sqlite3.Connection = sqlite3.connect(
+            database_file_path,
+            timeout=60.0,
+            check_same_thread=False,
+        )
+        # Write-ahead log lets the readers continue while some other process is writing.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(schema_sql)
+        connection.commit()
+
+        SQLiteConnections._connections_dict[database_file_path] = connection
+
+    @staticmethod
+    def get_connection(database_file_path: str, schema_sql: str) -> sqlite3.Connection:
+        """
+        Return the SQLite connection to `database_file_path`, ensuring only one connection exist per process.
+
+        `schema_sql` is executed once when the connection is created, so it should only contain statements
+        like "CREATE TABLE IF NOT EXISTS ...".
+
+        `Public method.`
+        """
+        # Drop the connections inherited from parent process, without closing those for the parent.
+        if SQLiteConnections._connections_pid != os.getpid():
+            SQLiteConnections._connections_dict = {}
+            SQLiteConnections._connections_pid = os.getpid()
+
+        if database_file_path not in SQLiteConnections._connections_dict:
+            SQLiteConnections._create_connection(
+                database_file_path=database_file_path,
+                schema_sql=schema_sql,
+            )
+
+        return SQLiteConnections._connections_dict[database_file_path]
@@ -0,0 +1,229 @@
+"""
+Transactional store of generator state, i.e. alpha-numeric digit lengths and high-water marks of every part category
+and cap color code pair, kept in a single SQLite database in WAL mode.
+
+Every read-modify-write of a pair's state runs in one "BEGIN IMMEDIATE" transaction, so it's atomic across processes
+(and App Service instances sharing the same storage). Those transactions only read & write one row, so the jobs
+of different pairs wait for each other only for a few microseconds, never for a whole job.
+
+State of pairs stored earlier as files in `ALPHA_NUM_DIGIT_LEN_DIR_PATH` and `HIGH_WATER_MARKS_DIR_PATH` is migrated
+once, when the pair is first accessed from this store. Those files are left as they're, but not read anymore.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import typing
+
+import constants
+import sqlite_connections
+
+
+# Schema of the state database, created once per process.
+_SCHEMA_SQL: str = """
+CREATE TABLE IF NOT EXISTS SEQUENCE_STATES (
+    PART_CATEGORY TEXT NOT NULL,
+    CAP_COLOR_CODE TEXT NOT NULL,
+    DIGIT_LENGTH INTEGER NOT NULL,
+    NEXT_UNIQUE_ID TEXT NOT NULL DEFAULT '',
+    UPDATED_TIMESTAMP REAL NOT NULL DEFAULT (julianday('now')),
+    PRIMARY KEY (PART_CATEGORY, CAP_COLOR_CODE)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS LAST_UNIQUE_IDS (
+    PART_CATEGORY TEXT NOT NULL,
+    CAP_COLOR_CODE TEXT NOT NULL,
+    SPECIAL_CODE TEXT NOT NULL,
+    LAST_UNIQUE_ID TEXT NOT NULL,
+    PRIMARY KEY (PART_CATEGORY, CAP_COLOR_CODE, SPECIAL_CODE)
+) WITHOUT ROWID;
+"""
+
+# Connection is shared by all threads of current process, so its use is serialized.
+_connection_lock: threading.Lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Returns the SQLite connection to state database of current process.
+    """
+    return sqlite_connections.SQLiteConnections.get_connection(
+        database_file_path=constants.STATE_STORE_FILE_PATH,
+        schema_sql=_SCHEMA_SQL,
+    )
+
+
+def _read_legacy_state(
+    part_category: str,
+    cap_color_code: str,
+) -> typing.Tuple[int, str, typing.Dict[str, str]]:
+    """
+    Returns the digit length, next Unique ID and last Unique IDs (against special codes) of the pair,
+    from the files where those were stored before this store.
+    """
+    digit_length: int = constants.DEFAULT_ALPHA_NUM_UNIQUE_ID_LENGTH
+    digit_length_file_path: str = os.path.join(
+        constants.ALPHA_NUM_DIGIT_LEN_DIR_PATH,
+        f"{part_category}_{cap_color_code}.txt",
+    )
+    if os.path.isfile(digit_length_file_path):
+        with open(digit_length_file_path, mode="r") as file_ptr:
+            digit_length = int(file_ptr.read())
+
+    high_water_mark_dict: dict = {}
+    high_water_mark_file_path: str = os.path.join(
+        constants.HIGH_WATER_MARKS_DIR_PATH,
+        f"{part_category}_{cap_color_code}.json",
+    )
+    if os.path.isfile(high_water_mark_file_path):
+        with open(high_water_mark_file_path, mode="r") as file_ptr:
+            high_water_mark_dict = json.load(file_ptr)
+
+    return (
+        digit_length,
+        str(high_water_mark_dict.get("NEXT_UNIQUE_ID", "")).strip(),
+        high_water_mark_dict.get("LAST_UNIQUE_IDS", {}),
+    )
+
+
+def _ensure_sequence_state(
+    connection: sqlite3.Connection,
+    part_category: str,
+    cap_color_code: str,
+) -> typing.Tuple[int, str]:
+    """
+    Returns the digit length and next Unique ID of the pair, inserting its row (migrated from earlier files) if it doesn't exist.
+    Must be called inside a write transaction, so the row is inserted only once.
+    """
+    state_row: tuple = connection.execute(
+        "SELECT DIGIT_LENGTH, NEXT_UNIQUE_ID FROM SEQUENCE_STATES WHERE PART_CATEGORY = ? AND CAP_COLOR_CODE = ?",
+        (part_category, cap_color_code),
+    ).fetchone()
+
+    if state_row is not None:
+        return state_row[0], state_row[1]
+
+    digit_length, next_unique_id, last_unique_ids_dict = _read_legacy_state(
+        part_category=part_category,
+        cap_color_code=cap_color_code,
+    )
+    connection.execute(
+        "INSERT INTO SEQUENCE_STATES (PART_CATEGORY, CAP_COLOR_CODE, DIGIT_LENGTH, NEXT_UNIQUE_ID) VALUES (?, ?, ?, ?)",
+        (part_category, cap_color_code, digit_length, next_unique_id),
+    )
+    connection.executemany(
+        "INSERT OR REPLACE INTO LAST_UNIQUE_IDS (PART_CATEGORY, CAP_COLOR_CODE, SPECIAL_CODE, LAST_UNIQUE_ID) VALUES (?, ?, ?, ?)",
+        [
+            (part_category, cap_color_code, special_code, last_unique_id)
+            for special_code, last_unique_id in last_unique_ids_dict.items()
+        ],
+    )
+
+    return digit_length, next_unique_id
+
+
+@contextlib.contextmanager
+def update_sequence_state(
+    part_category: str,
+    cap_color_code: str,
+) -> typing.Iterator[dict]:
+    """
+    Context manager that yields the state of `part_category` and `cap_color_code` as a `dict` to be updated,
+    and stores the updated values in the same transaction when the block exits without any error.
+
+    The yielded `dict` contains the keys "DIGIT_LENGTH" & "NEXT_UNIQUE_ID", and the "LAST_UNIQUE_ID" of "SPECIAL_CODE"
+    is also stored if the block sets both of those. The block must not call other functions of this module.
+
+    Args:
+
+    `part_category` - The part category string which is the first prefix for Unique ID.
+    `cap_color_code` - The cap color code which is the second prefix for Unique ID.
+    """
+    part_category = part_category.upper()
+    cap_color_code = cap_color_code.upper()
+
+    with _connection_lock:
+        connection: sqlite3.Connection = _get_connection()
+
+        # "IMMEDIATE" takes the write lock at once, so no other process can read the same state to update it.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            digit_length, next_unique_id = _ensure_sequence_state(
+                connection=connection,
+                part_category=part_category,
+                cap_color_code=cap_color_code,
+            )
+            sequence_state_dict: dict = {
+                "DIGIT_LENGTH": digit_length,
+                "NEXT_UNIQUE_ID": next_unique_id,
+            }
+
+            yield sequence_state_dict
+
+            connection.execute(
+                "UPDATE SEQUENCE_STATES SET DIGIT_LENGTH = ?, NEXT_UNIQUE_ID = ?, UPDATED_TIMESTAMP = julianday('now')"
+                " WHERE PART_CATEGORY = ? AND CAP_COLOR_CODE = ?",
+                (
+                    int(sequence_state_dict["DIGIT_LENGTH"]),
+                    str(sequence_state_dict["NEXT_UNIQUE_ID"]),
+                    part_category,
+                    cap_color_code,
+                ),
+            )
+            if (
+                "SPECIAL_CODE" in sequence_state_dict
+                and "LAST_UNIQUE_ID" in sequence_state_dict
+            ):
+                connection.execute(
+                    "INSERT OR REPLACE INTO LAST_UNIQUE_IDS (PART_CATEGORY, CAP_COLOR_CODE, SPECIAL_CODE, LAST_UNIQUE_ID) VALUES (?, ?, ?, ?)",
+                    (
+                        part_category,
+                        cap_color_code,
+                        str(sequence_state_dict["SPECIAL_CODE"]),
+                        str(sequence_state_dict["LAST_UNIQUE_ID"]),
+                    ),
+                )
+
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+
+def read_digit_length(
+    part_category: str,
+    cap_color_code: str,
+) -> int:
+    """
+    Returns the alpha-numeric digit length of `part_category` and `cap_color_code` using only a "SELECT" query,
+    so readers which must never take a write lock or change the generator state (for e.g. `token_decoder` module) can use it.
+
+    Pair not stored here yet isn't migrated, its digit length is read from earlier files instead (or the default one).
+    """
+    with _connection_lock:
+        state_row: tuple = (
+            _get_connection()
+            .execute(
+                "SELECT DIGIT_LENGTH FROM SEQUENCE_STATES WHERE PART_CATEGORY = ? AND CAP_COLOR_CODE = ?",
+                (part_category.upper(), cap_color_code.upper()),
+            )
+            .fetchone()
+        )
+
+    if state_row is not None:
+        return state_row[0]
+
+    digit_length, _, _ = _read_legacy_state(
+        part_category=part_category.upper(),
+        cap_color_code=cap_color_code.upper(),
+    )
+
+    return digit_length
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    pass
+    # print(read_digit_length(part_category="AL", cap_color_code="RED"))
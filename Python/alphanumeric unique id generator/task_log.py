@@ -0,0 +1,224 @@
+"""
+Append-only log of started ID generation tasks, stored as hourly segment files.
+
+Every task entry is appended as a single line to the segment of its starting hour, so writing it never reads or
+rewrites any file. Old entries are expired by deleting their whole segments, which is done by a background
+compactor thread instead of the request handlers.
+
+Segments are only a record of started tasks for the operators, the remaining quota is answered by `quota_ledger` module.
+"""
+
+import csv
+import datetime
+import glob
+import io
+import os
+import threading
+import time
+import typing
+
+import pytz
+
+import constants
+import job_progress
+import quota_ledger
+
+
+TASK_LOG_COLUMNS: typing.List[str] = [
+    "PART_CATEGORY",
+    "SPECIAL_CODE",
+    "TOTAL_IDS_TO_GENERATE",
+    "GENERATION_START_DATETIME",
+]
+""" Columns of every segment file, same as the earlier tracking CSV file. """
+
+# Segment files are named by their starting hour (in IST), for e.g. "tasks_2023-01-31_13.csv".
+_SEGMENT_FILE_PREFIX: str = "tasks_"
+_SEGMENT_HOUR_FORMAT: str = "%Y-%m-%d_%H"
+
+_IST: pytz.tzinfo.DstTzInfo = pytz.timezone("Asia/Kolkata")
+
+
+def _get_segment_file_path(start_datetime: datetime.datetime) -> str:
+    """
+    Returns the path of segment file holding the tasks started at `start_datetime`.
+    """
+    return os.path.join(
+        constants.TASK_LOG_DIR_PATH,
+        f"{_SEGMENT_FILE_PREFIX}{start_datetime.astimezone(_IST).strftime(_SEGMENT_HOUR_FORMAT)}.csv",
+    )
+
+
+def _get_segment_start_datetime(segment_file_path: str) -> datetime.datetime:
+    """
+    Returns the starting hour of segment file at `segment_file_path`, or `None` if it's not a segment file.
+    """
+    segment_name: str = os.path.splitext(os.path.basename(segment_file_path))[0]
+
+    try:
+        return _IST.localize(
+            datetime.datetime.strptime(
+                segment_name[len(_SEGMENT_FILE_PREFIX) :], _SEGMENT_HOUR_FORMAT
+            )
+        )
+    except ValueError:
+        return None
+
+
+def _get_segment_file_paths() -> typing.List[str]:
+    """
+    Returns the paths of all segment files, oldest first.
+    """
+    return sorted(
+        glob.glob(
+            os.path.join(constants.TASK_LOG_DIR_PATH, f"{_SEGMENT_FILE_PREFIX}*.csv")
+        )
+    )
+
+
+def append_task_entry(
+    part_category: str,
+    special_code: str,
+    max_generate_limit: int,
+    start_datetime: datetime.datetime,
+) -> None:
+    """
+    Appends the tracking details of an ID generation task to the segment of its starting hour.
+
+    Args:
+
+    `part_category` - The part category of task.
+    `special_code` - The special code of task.
+    `max_generate_limit` - The number of Unique IDs to be generated.
+    `start_datetime` - The timezone aware datetime when task is started.
+    """
+    os.makedirs(name=constants.TASK_LOG_DIR_PATH, exist_ok=True)
+
+    segment_file_path: str = _get_segment_file_path(start_datetime=start_datetime)
+
+    # Only the process creating the segment file writes its header.
+    try:
+        with open(segment_file_path, mode="x", newline="") as segment_file:
+            csv.writer(segment_file).writerow(TASK_LOG_COLUMNS)
+    except FileExistsError:
+        pass
+
+    entry_buffer: io.StringIO = io.StringIO()
+    csv.writer(entry_buffer).writerow(
+        [
+            part_category,
+            special_code,
+            max_generate_limit,
+            start_datetime.strftime(constants.ID_GENERATION_TRACKING_DATETIME_FORMAT),
+        ]
+    )
+
+    # Whole line is written with a single append, so lines of the tasks started together never get mixed.
+    with open(segment_file_path, mode="a", newline="") as segment_file:
+        segment_file.write(entry_buffer.getvalue())
+
+
+def remove_expired_segments() -> int:
+    """
+    Removes the segment files whose every task is older than `TASK_LOG_RETENTION_HOURS` (from `constants` module),
+    along with the earlier tracking CSV file once it's that old. Returns the number of removed files.
+    """
+    expiry_datetime: datetime.datetime = datetime.datetime.now(
+        tz=_IST
+    ) - datetime.timedelta(hours=constants.TASK_LOG_RETENTION_HOURS)
+    removed_files_count: int = 0
+
+    for segment_file_path in _get_segment_file_paths():
+        segment_start_datetime: datetime.datetime = _get_segment_start_datetime(
+            segment_file_path=segment_file_path
+        )
+        if segment_start_datetime is None:
+            continue
+
+        # Segments are sorted by their starting hour, so rest of them aren't expired either.
+        if segment_start_datetime + datetime.timedelta(hours=1) > expiry_datetime:
+            break
+
+        try:
+            os.remove(segment_file_path)
+            removed_files_count += 1
+        except FileNotFoundError:
+            # Already removed by compactor of another process.
+            pass
+
+    id_generation_tracking_csv_filepath: str = os.path.join(
+        constants.INTERNAL_DATA_DIRPATH,
+        constants.ID_GENERATION_TRACKING_CSV_FILENAME,
+    )
+    try:
+        # It's not written anymore, so all its tasks are expired once it's last modified before expiry.
+        if (
+            os.path.getmtime(id_generation_tracking_csv_filepath)
+            < expiry_datetime.timestamp()
+        ):
+            os.remove(id_generation_tracking_csv_filepath)
+            removed_files_count += 1
+    except FileNotFoundError:
+        pass
+
+    return removed_files_count
+
+
+class TaskLogCompactor:
+    """
+    Class that create & hold the background thread compacting the task log, job progress files, lock files of dead letters
+    and quota ledger of current process.
+    """
+
+    # Compactor thread of current process.
+    _compactor_thread: threading.Thread = None
+
+    # Process ID which started `_compactor_thread`, as threads aren't copied to forked processes.
+    _compactor_pid: int = None
+
+    @staticmethod
+    def _run_compaction_loop() -> None:
+        """`Private method.`"""
+
+        # Imported here, as `dead_letter_queue` module imports `utility_functions` module which imports this module.
+        import dead_letter_queue
+
+        while True:
+            try:
+                remove_expired_segments()
+                job_progress.remove_expired_progress_files()
+                dead_letter_queue.remove_unused_lock_files()
+                quota_ledger.QuotaLedger.get_instance().compact()
+            except Exception as error:
+                # Keep compacting in next rounds, for e.g. when storage was unavailable for a while.
+                print(f"[!] Task log compaction failed: {error}")
+
+            time.sleep(constants.TASK_LOG_COMPACTION_INTERVAL_SECONDS)
+
+    @staticmethod
+    def start() -> None:
+        """
+        Starts the compactor thread, ensuring only one is running per process.
+
+        `Public method.`
+        """
+        if (
+            TaskLogCompactor._compactor_thread is not None
+            and TaskLogCompactor._compactor_pid == os.getpid()
+        ):
+            return
+
+        # Daemon thread doesn't keep the application running after it's stopped.
+        TaskLogCompactor._compactor_thread = threading.Thread(
+            target=TaskLogCompactor._run_compaction_loop,
+            name="TaskLogCompactor",
+            daemon=True,
+        )
+        TaskLogCompactor._compactor_pid = os.getpid()
+        TaskLogCompactor._compactor_thread.start()
+
+
+# Handle execution in case launched as a stand-alone script, to compact once.
+if __name__ == "__main__":
+    print(f"- Removed files : {remove_expired_segments()}")
+    quota_ledger.QuotaLedger.get_instance().compact()
@@ -0,0 +1,259 @@
+"""
+Tests of `sequence_engine` module, cross-checking the block rendering against the legacy increment loop.
+
+Run from the application directory using command: `python3 -m pytest tests`
+"""
+
+import os
+import random
+import sys
+import typing
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sequence_engine
+
+
+def _legacy_generate_unique_ids(
+    starting_unique_id: str,
+    count: int,
+    alpha_numeric_digit_length: int,
+) -> typing.Tuple[typing.List[str], int]:
+    """
+    Character by character increment loop previously used in `uid_generator.generate_unique_ids()`, which
+    `render_unique_ids_block()` of `sequence_engine` module is cross-checked against.
+    """
+    last_char_ascii: int = ord(starting_unique_id[-1])
+    unique_id_chars: typing.List[str] = list(starting_unique_id)
+    unique_ids_list: typing.List[str] = []
+
+    for _ in range(count):
+        unique_ids_list.append(
+            "".join(unique_id_chars).rjust(alpha_numeric_digit_length, "0")
+        )
+
+        if last_char_ascii >= 48 and last_char_ascii < 58:
+            last_char_ascii += 1
+            if last_char_ascii == 58:
+                last_char_ascii = ord("A")
+            unique_id_chars[len(unique_id_chars) - 1] = chr(last_char_ascii)
+            continue
+
+        if last_char_ascii >= 65 and last_char_ascii < 91:
+            last_char_ascii += 1
+            if last_char_ascii == 91:
+                last_char_ascii = ord("0")
+                is_limit_crossed: bool = False
+                for prev_idx in range(len(unique_id_chars) - 2, -1, -1):
+                    prev_ascii: int = ord(unique_id_chars[prev_idx])
+                    is_set_first_alphabet: bool = False
+                    if prev_ascii >= 48 and prev_ascii < 58:
+                        prev_ascii += 1
+                        if prev_ascii == 58:
+                            prev_ascii = ord("A")
+                            is_set_first_alphabet = True
+                    if prev_ascii >= 65 and prev_ascii < 91:
+                        if not is_set_first_alphabet:
+                            prev_ascii += 1
+                        if prev_ascii == 91:
+                            unique_id_chars[prev_idx] = "0"
+                            if prev_idx == 0 and "".join(
+                                unique_id_chars[:-1]
+                            ) == "0" * (alpha_numeric_digit_length - 1):
+                                alpha_numeric_digit_length += 1
+                                is_limit_crossed = True
+                                break
+                            else:
+                                continue
+                    unique_id_chars[prev_idx] = chr(prev_ascii)
+                    break
+                if is_limit_crossed:
+                    unique_id_chars.insert(0, "1")
+            unique_id_chars[len(unique_id_chars) - 1] = chr(last_char_ascii)
+            continue
+
+    return unique_ids_list, alpha_numeric_digit_length
+
+
+# Starting alpha-numeric sequence, digit length and count of blocks crossing the edges of pre-rendered suffixes,
+# and the limits of digit length. Legacy loop carries over only from the last character to previous ones, so a single
+# character can't grow & isn't cross-checked.
+_EDGE_BLOCKS_LIST: typing.List[typing.Tuple[str, int, int]] = [
+    ("000000", 6, 5_000),
+    ("0000ZX", 6, 3_000),
+    ("000100", 6, 1),
+    ("0000ZZ", 6, 1),
+    ("00ZZZ0", 6, 50_000),
+    ("ZZZZX0", 6, 3_000),
+    ("ZZZZZZ", 6, 1),
+    ("ZZ", 2, 2_000),
+    ("ZZX", 3, 10),
+]
+
+# Random blocks are repeatable, so a failure can be reproduced.
+_random: random.Random = random.Random(20240101)
+_RANDOM_BLOCKS_LIST: typing.List[typing.Tuple[str, int, int]] = [
+    (
+        sequence_engine.int_to_unique_id(
+            value=_random.randrange(36**6), alpha_numeric_digit_length=6
+        ),
+        6,
+        _random.randrange(1, 5_000),
+    )
+    for _ in range(100)
+]
+
+
+@pytest.mark.parametrize(
+    "starting_unique_id, digit_length, count",
+    _EDGE_BLOCKS_LIST + _RANDOM_BLOCKS_LIST,
+)
+def test_render_unique_ids_block_matches_legacy_loop(
+    starting_unique_id: str,
+    digit_length: int,
+    count: int,
+) -> None:
+    (
+        expected_ids_list,
+        expected_digit_length,
+    ) = _legacy_generate_unique_ids(
+        starting_unique_id=starting_unique_id,
+        count=count,
+        alpha_numeric_digit_length=digit_length,
+    )
+    (
+        rendered_ids_list,
+        next_value,
+        rendered_digit_length,
+    ) = sequence_engine.render_unique_ids_block(
+        start_value=sequence_engine.unique_id_to_int(starting_unique_id),
+        count=count,
+        alpha_numeric_digit_length=digit_length,
+    )
+
+    assert rendered_ids_list == expected_ids_list
+    assert rendered_digit_length == expected_digit_length
+    assert next_value == sequence_engine.unique_id_to_int(starting_unique_id) + count
+
+
+def test_render_unique_ids_block_grows_digit_length() -> None:
+    (
+        rendered_ids_list,
+        next_value,
+        digit_length,
+    ) = sequence_engine.render_unique_ids_block(
+        start_value=sequence_engine.unique_id_to_int("ZZY"),
+        count=3,
+        alpha_numeric_digit_length=3,
+    )
+
+    assert rendered_ids_list == ["ZZY", "ZZZ", "1000"]
+    assert next_value == 36**3 + 1
+    assert digit_length == 4
+
+
+def test_render_unique_ids_block_grows_single_character() -> None:
+    (
+        rendered_ids_list,
+        next_value,
+        digit_length,
+    ) = sequence_engine.render_unique_ids_block(
+        start_value=sequence_engine.unique_id_to_int("Y"),
+        count=3,
+        alpha_numeric_digit_length=1,
+    )
+
+    assert rendered_ids_list == ["Y", "Z", "10"]
+    assert next_value == 37
+    assert digit_length == 2
+
+
+def test_render_unique_ids_block_ending_at_limit_grows_digit_length() -> None:
+    # Next block starts from "1000", so its digit length must already be grown.
+    (
+        rendered_ids_list,
+        next_value,
+        digit_length,
+    ) = sequence_engine.render_unique_ids_block(
+        start_value=sequence_engine.unique_id_to_int("ZZY"),
+        count=2,
+        alpha_numeric_digit_length=3,
+    )
+
+    assert rendered_ids_list == ["ZZY", "ZZZ"]
+    assert next_value == 36**3
+    assert digit_length == 4
+
+
+def test_render_unique_ids_blocks_continue_each_other() -> None:
+    (
+        single_block_ids_list,
+        _,
+        single_block_digit_length,
+    ) = sequence_engine.render_unique_ids_block(
+        start_value=0, count=50_000, alpha_numeric_digit_length=3
+    )
+
+    chunked_ids_list: typing.List[str] = []
+    next_value: int = 0
+    digit_length: int = 3
+    for count in (1, 1_295, 1_296, 7_000, 40_408):
+        (
+            rendered_ids_list,
+            next_value,
+            digit_length,
+        ) = sequence_engine.render_unique_ids_block(
+            start_value=next_value,
+            count=count,
+            alpha_numeric_digit_length=digit_length,
+        )
+        chunked_ids_list.extend(rendered_ids_list)
+
+    assert chunked_ids_list == single_block_ids_list
+    assert digit_length == single_block_digit_length
+
+
+def test_render_unique_ids_block_of_zero_count() -> None:
+    assert sequence_engine.render_unique_ids_block(
+        start_value=46, count=0, alpha_numeric_digit_length=6
+    ) == ([], 46, 6)
+
+
+@pytest.mark.parametrize(
+    "unique_id_str, expected_next_unique_id",
+    [
+        ("000009", "00000A"),
+        ("00001Z", "000020"),
+        ("0000ZZ", "000100"),
+        ("ZZZ", "1000"),
+        ("ZZZZZZ", "1000000"),
+    ],
+)
+def test_next_unique_id(unique_id_str: str, expected_next_unique_id: str) -> None:
+    assert sequence_engine.next_unique_id(unique_id_str) == expected_next_unique_id
+
+
+def test_int_conversions_round_trip() -> None:
+    assert sequence_engine.unique_id_to_int("00001A") == 46
+    assert sequence_engine.unique_id_to_int("") == 0
+    assert (
+        sequence_engine.int_to_unique_id(value=46, alpha_numeric_digit_length=6)
+        == "00001A"
+    )
+
+    for value in (0, 35, 36, 1_295, 1_296, 36**6 - 1, 36**6):
+        assert (
+            sequence_engine.unique_id_to_int(
+                sequence_engine.int_to_unique_id(
+                    value=value, alpha_numeric_digit_length=6
+                )
+            )
+            == value
+        )
+
+
+def test_int_to_unique_id_rejects_negative_value() -> None:
+    with pytest.raises(ValueError):
+        sequence_engine.int_to_unique_id(value=-1, alpha_numeric_digit_length=6)
@@ -0,0 +1,278 @@
+"""
+Batch decode service for scanned tokens, that reverses `encrypt_encode_unique_id()` of `encryptor_encoder` module.
+
+Malformed tokens are rejected with a regular expression check before any decryption. Well-formed tokens are decrypted
+(in parallel when the batch is large enough), and the resulting Unique IDs are split back into part category,
+cap color code, special code and alpha-numeric sequence.
+"""
+
+import math
+import re
+import typing
+
+import pandas as pd
+
+import category_catalog
+import constants
+import encryptor_encoder
+import utility_functions
+
+
+# RSA tokens are URL-safe Base64 encoding of 32 bytes cipher text, i.e. 43 characters followed by one "=" padding.
+_RSA_TOKEN_PATTERN: re.Pattern = re.compile(r"^[A-Za-z0-9_-]{43}=$")
+
+# Symmetric tokens are key version prefix followed by unpadded URL-safe Base64 encoding of 8 bytes tag and
+# at least 6 bytes Unique ID (2 characters part category, 3 characters cap color code and 1 character sequence).
+_SYMMETRIC_TOKEN_PATTERN: re.Pattern = re.compile(r"^s[0-9]+\.[A-Za-z0-9_-]{19,}$")
+
+# Decrypted Unique ID must start with part category and cap color code, followed by special code and sequence.
+_UNIQUE_ID_PATTERN: re.Pattern = re.compile(r"^[A-Z0-9]{5}[ -~]*[A-Z0-9]$")
+
+# Columns of `pd.DataFrame` returned by `decode_tokens()`.
+DECODED_TOKEN_COLUMNS: typing.List[str] = [
+    "TOKEN",
+    "IS_VALID",
+    "UNIQUE_ID",
+    "PART_CATEGORY",
+    "CAP_COLOR_CODE",
+    "SPECIAL_CODE",
+    "SEQUENCE",
+    "ERROR",
+]
+
+
+def is_well_formed_token(token_str: str) -> bool:
+    """
+    Returns `True` if `token_str` has the shape of any token created by `encryptor_encoder` module, without decrypting it.
+    """
+    return (
+        _RSA_TOKEN_PATTERN.match(token_str) is not None
+        or _SYMMETRIC_TOKEN_PATTERN.match(token_str) is not None
+    )
+
+
+def _decode_decrypt_tokens_in_process(
+    tokens_list: typing.List[str],
+) -> typing.List[str]:
+    """
+    Returns Unique IDs for all `tokens_list` in the same order, using current process only.
+    Empty string is returned in place of the tokens that failed to decrypt.
+    """
+    unique_ids_list: typing.List[str] = []
+
+    for token_str in tokens_list:
+        try:
+            unique_ids_list.append(
+                encryptor_encoder.decode_decrypt_token(token_str=token_str)
+            )
+        except ValueError:
+            unique_ids_list.append("")
+
+    return unique_ids_list
+
+
+def _decode_decrypt_tokens(
+    tokens_list: typing.List[str],
+    max_workers: int,
+) -> typing.List[str]:
+    """
+    Returns Unique IDs for all `tokens_list` in the same order, splitting large batches across the worker processes.
+    """
+    # Small batches are faster in current process, than sending them to worker processes.
+    if max_workers <= 1 or len(tokens_list) < max_workers * 100:
+        return _decode_decrypt_tokens_in_process(tokens_list=tokens_list)
+
+    sub_batch_size: int = math.ceil(len(tokens_list) / (max_workers * 4))
+    sub_batches_list: typing.List[typing.List[str]] = [
+        tokens_list[start_idx : start_idx + sub_batch_size]
+        for start_idx in range(0, len(tokens_list), sub_batch_size)
+    ]
+
+    unique_ids_list: typing.List[str] = []
+    for unique_ids_sub_batch in encryptor_encoder.EncryptionProcessPool.get_instance(
+        max_workers=max_workers
+    ).map(_decode_decrypt_tokens_in_process, sub_batches_list):
+        unique_ids_list.extend(unique_ids_sub_batch)
+
+    return unique_ids_list
+
+
+def split_unique_id(
+    unique_id_str: str,
+    alpha_numeric_digit_length: int,
+    special_codes_list: typing.List[str] = None,
+) -> typing.Tuple[str, str, str, str]:
+    """
+    Splits `unique_id_str` and returns a `tuple` of part category, cap color code, special code and sequence.
+
+    As special code has no fixed length, the longest matching one from `special_codes_list` is used if given.
+    Otherwise, the last `alpha_numeric_digit_length` characters are treated as sequence. Note that without
+    `special_codes_list`, IDs generated before the digit length of their cap color grew are split one character late.
+
+    Args:
+
+    `unique_id_str` - The decrypted Unique ID, for e.g. "ALREDX00001A".
+    `alpha_numeric_digit_length` - The current alpha-numeric digit length for part category and cap color code of `unique_id_str`.
+    `special_codes_list` - Optional list of special codes expected in the Unique IDs.
+    """
+    part_category: str = unique_id_str[:2]
+    cap_color_code: str = unique_id_str[2:5]
+    remaining_str: str = unique_id_str[5:]
+
+    for special_code in sorted(special_codes_list or [], key=len, reverse=True):
+        sequence_str: str = remaining_str[len(special_code) :]
+        if (
+            remaining_str.startswith(special_code)
+            and 0 < len(sequence_str) <= alpha_numeric_digit_length
+        ):
+            return part_category, cap_color_code, special_code, sequence_str
+
+    sequence_length: int = min(alpha_numeric_digit_length, len(remaining_str))
+
+    return (
+        part_category,
+        cap_color_code,
+        remaining_str[: len(remaining_str) - sequence_length],
+        remaining_str[len(remaining_str) - sequence_length :],
+    )
+
+
+def decode_tokens(
+    tokens_list: typing.List[str],
+    max_workers: int = constants.ENCRYPTION_MAX_WORKERS,
+    special_codes_list: typing.List[str] = None,
+) -> pd.DataFrame:
+    """
+    Decodes all `tokens_list` and returns `pd.DataFrame` having `DECODED_TOKEN_COLUMNS` with one row per token, in the same order.
+
+    Rows of invalid tokens have `IS_VALID` as `False` and the reason in `ERROR` column, which is one of
+    "MALFORMED_TOKEN", "DECRYPTION_FAILED", "INVALID_UNIQUE_ID" or "UNKNOWN_CATEGORY_COLOR".
+
+    Args:
+
+    `tokens_list` - The list of scanned tokens, for e.g. extracted from the scanned short URLs.
+    `max_workers` - The number of worker processes used to split the decryption across CPU cores.
+    `special_codes_list` - Optional list of special codes expected in the Unique IDs, see `split_unique_id()`.
+    """
+    tokens_list = [str(token_str).strip() for token_str in tokens_list]
+
+    # Cheap check first, so the malformed tokens never reach the decryption.
+    well_formed_idx_list: typing.List[int] = [
+        idx
+        for idx, token_str in enumerate(tokens_list)
+        if is_well_formed_token(token_str)
+    ]
+    unique_ids_list: typing.List[str] = _decode_decrypt_tokens(
+        tokens_list=[tokens_list[idx] for idx in well_formed_idx_list],
+        max_workers=max_workers,
+    )
+
+    decoded_rows_list: typing.List[list] = [
+        [token_str, False, "", "", "", "", "", "MALFORMED_TOKEN"]
+        for token_str in tokens_list
+    ]
+
+    category_color_codes_set: typing.FrozenSet[
+        str
+    ] = category_catalog.CategoryCatalog.get_category_color_codes()
+    digit_lengths_dict: typing.Dict[str, int] = {}
+
+    for idx, unique_id_str in zip(well_formed_idx_list, unique_ids_list):
+        decoded_row: list = decoded_rows_list[idx]
+
+        if unique_id_str == "":
+            decoded_row[7] = "DECRYPTION_FAILED"
+            continue
+
+        decoded_row[2] = unique_id_str
+
+        if _UNIQUE_ID_PATTERN.match(unique_id_str) is None:
+            decoded_row[7] = "INVALID_UNIQUE_ID"
+            continue
+
+        if unique_id_str[:5] not in category_color_codes_set:
+            decoded_row[7] = "UNKNOWN_CATEGORY_COLOR"
+            continue
+
+        # Read digit length only once per part category and cap color code.
+        if unique_id_str[:5] not in digit_lengths_dict:
+            digit_lengths_dict[
+                unique_id_str[:5]
+            ] = utility_functions.read_last_alpha_numeric_digit_length(
+                part_category=unique_id_str[:2],
+                cap_color=unique_id_str[2:5],
+            )
+
+        decoded_row[3:7] = split_unique_id(
+            unique_id_str=unique_id_str,
+            alpha_numeric_digit_length=digit_lengths_dict[unique_id_str[:5]],
+            special_codes_list=special_codes_list,
+        )
+        decoded_row[1] = True
+        decoded_row[7] = ""
+
+    return pd.DataFrame(data=decoded_rows_list, columns=DECODED_TOKEN_COLUMNS)
+
+
+def decode_tokens_file(
+    input_file_path: str,
+    output_file_path: str,
+    token_column_name: str = "TOKEN",
+    max_workers: int = constants.ENCRYPTION_MAX_WORKERS,
+    special_codes_list: typing.List[str] = None,
+) -> pd.DataFrame:
+    """
+    Decodes the tokens from `token_column_name` column of CSV file at `input_file_path`, stores the result as CSV file
+    at `output_file_path` and returns it as `pd.DataFrame`.
+
+    Args:
+
+    `input_file_path` - The CSV file path containing scanned tokens.
+    `output_file_path` - The CSV file path to store the decoded result.
+    `token_column_name` - The column name of `input_file_path` containing the tokens.
+    `max_workers` - The number of worker processes used to split the decryption across CPU cores.
+    `special_codes_list` - Optional list of special codes expected in the Unique IDs, see `split_unique_id()`.
+    """
+    input_df: pd.DataFrame = pd.read_csv(
+        input_file_path,
+        usecols=[token_column_name],
+        dtype=str,
+        keep_default_na=False,
+    )
+
+    result_df: pd.DataFrame = decode_tokens(
+        tokens_list=input_df[token_column_name].tolist(),
+        max_workers=max_workers,
+        special_codes_list=special_codes_list,
+    )
+    result_df.to_csv(output_file_path, index=False)
+
+    return result_df
+
+
+# Handle execution in case launched as a stand-alone script (for debugging/testing only).
+if __name__ == "__main__":
+    import time
+
+    checked_unique_ids_list: typing.List[str] = [
+        f"ALRED{sequence_str}" for sequence_str in ("00001A", "00001B", "0000ZZ")
+    ] + ["ALREDX00010"]
+    checked_tokens_list: typing.List[str] = encryptor_encoder.encrypt_encode_unique_ids(
+        unique_ids_list=checked_unique_ids_list
+    ) + [
+        encryptor_encoder.get_token_cipher(backend_name="blake2-siv").encrypt_encode(
+            "ALREDX00011"
+        ),
+        "not-a-token",
+        "A" * 43 + "=",
+    ]
+
+    start_time: float = time.perf_counter()
+    print(
+        decode_tokens(
+            tokens_list=checked_tokens_list,
+            max_workers=1,
+            special_codes_list=["X"],
+        ).to_string()
+    )
+    print(f"- Time taken: {time.perf_counter() - start_time:.3f} seconds")
@@ -10,42 +10,45 @@ When combined, it'll result as: "ALRED00001A".
 
 """
 
+import concurrent.futures
 import datetime
-import glob
 import os
 import typing
 import time
 
 import pandas as pd
 
+import category_catalog
 import constants
+import dead_letter_queue
 import encryptor_encoder
-import firebase_url_shortner
+import file_lock
+import id_range_allocator
+import job_progress
+import result_writer
+import sequence_engine
+import short_url_retry
+import url_shortner
 import utility_functions
 
-from dash_instance import DashInstance
-
 
 # FILE_FORMATTED_DATETIME_STR: str = f"%d-%m-%Y_%I-%M-%S-%p"
 FILE_FORMATTED_DATETIME_STR: str = f"%d-%m-%Y_%I-%M-%p"
 COLUMN_FORMATTED_DATE_STR: str = f"%d/%m/%Y"
 
 
-def _store_unique_id_to_track(
+def _get_output_file_path(
+    sub_dir_name: str,
     part_category: str,
     cap_color_code: str,
-    special_code: str,
-    unique_ids_list: list,
-    encrypted_encoded_ids_list: list,
-) -> None:
-    """
-    Stores the next Unique ID in JSON file mapped under specific part category and cap color code.
+    file_extension: str,
+) -> str:
     """
+    Returns the output file path inside `sub_dir_name`, named using `part_category`, `cap_color_code` and current datetime.
 
-    # Create a sub-directory to store files of all Unique IDs.
-    sub_dir_name: str = constants.TRACKING_INDEXING_DIRPATH  # "Track_Unique_IDs"
-    os.makedirs(name=sub_dir_name, exist_ok=True)
-
+    The file is created empty to reserve its name, so another job started within the same minute will get a numbered file name
+    instead of appending to (or overwriting) this one.
+    """
     current_datetime: datetime.datetime = (
         utility_functions.get_current_datetime_for_IST()
     )
@@ -53,11 +56,26 @@ def _store_unique_id_to_track(
         FILE_FORMATTED_DATETIME_STR
     )
 
-    file_path: str = os.path.join(
-        sub_dir_name,
-        f"{part_category}_{cap_color_code}_{file_formatted_datetime_str}.csv",
+    return utility_functions.reserve_file_path(
+        dir_path=sub_dir_name,
+        file_name=f"{part_category}_{cap_color_code}_{file_formatted_datetime_str}",
+        file_extension=file_extension,
     )
 
+
+def _store_unique_id_to_track(
+    part_category: str,
+    cap_color_code: str,
+    special_code: str,
+    unique_ids_list: list,
+    encrypted_encoded_ids_list: list,
+    file_path: str,
+) -> None:
+    """
+    Appends the Unique IDs to CSV file at `file_path`, mapped under specific part category and cap color code.
+    Header is written only when the file is empty.
+    """
+
     # Get a count of total Unique IDs.
     total_ids_count: int = len(unique_ids_list)
 
@@ -77,156 +95,68 @@ def _store_unique_id_to_track(
             "LONGITUDE": [0.0] * total_ids_count,
         },
     )
-    result_df.to_csv(file_path, index=False)
-
-
-def _read_starting_unique_id_from_track(
-    part_category: str,
-    cap_color_code: str,
-    alpha_numeric_digit_length: int,
-) -> str:
-    """
-    Reads the stored Unique ID related to `part_category` and `cap_color_code`.
-    """
-    # Create a sub-directory where all files of Unique IDs are stored.
-    sub_dir_name: str = constants.TRACKING_INDEXING_DIRPATH  # "Track_Unique_IDs"
-    os.makedirs(name=sub_dir_name, exist_ok=True)
-
-    # Get file path for latest file stored belonging to current part category and cap color code.
-    # Implementation Reference: https://stackoverflow.com/a/168424
-    csv_files_path: list = list(
-        filter(
-            os.path.isfile,
-            glob.glob(
-                os.path.join(sub_dir_name, f"{part_category}_{cap_color_code}_*.csv")
-            ),
-        )
-    )
-    csv_files_path.sort(key=lambda x: os.path.getmtime(x), reverse=False)
-
-    # If file not found, the return zero values as a starting point.
-    # TODO: Also check whether CSV file itself is empty.
-    if len(csv_files_path) <= 0 or not os.path.exists(csv_files_path[-1]):
-        return "0" * alpha_numeric_digit_length
-
-    # Create file name to read the next Unique ID using latest file stored
-    # for this part category and cap color code.
-    file_path: str = csv_files_path[-1]
-
-    result_df: pd.DataFrame = pd.read_csv(file_path)
-
-    if len(result_df.index) <= 0 or "UNIQUE_ID" not in result_df.columns:
-        return "0" * alpha_numeric_digit_length
-
-    # Extract last row from `result_df` as DataFrame.
-    last_row_df: pd.DataFrame = result_df.iloc[[-1]].copy(deep=True)
-
-    # Extract current last Unique ID to convert it to next Unique ID.
-    next_unique_id_chars: typing.List[str] = list(last_row_df["UNIQUE_ID"].iat[0])
-
-    # Use a boolean to check whether full alpha-numeric digits limit is crossed.
-    is_limit_crossed: bool = False
-
-    # Create the next Unique ID based on `next_unique_id_chars`.
-    # Increment from last characters ASCII values.
-    for prev_idx in range(len(next_unique_id_chars) - 1, -1, -1):
-        # Get previous character's ASCII value.
-        prev_ascii: int = ord(next_unique_id_chars[prev_idx])
-
-        # Use a boolean to check and avoid multi-incrementing while processing character "A".
-        is_set_first_alphabet: bool = False
-
-        # If between 0 to 9.
-        if prev_ascii >= 48 and prev_ascii < 58:
-            prev_ascii += 1
-
-            # If passed the digit limits, then set to ASCII of 'A'.
-            if prev_ascii == 58:
-                prev_ascii = ord("A")
-                is_set_first_alphabet = (
-                    True  # Setting this will tell to avoid incrementing again.
-                )
-
-        # If between A to Z.
-        if prev_ascii >= 65 and prev_ascii < 91:
-            if not is_set_first_alphabet:
-                prev_ascii += 1
-
-            if prev_ascii == 91:
-                # If passed the alphabet limits (A-Z), then set to '0' and continue with previous character.
-                next_unique_id_chars[prev_idx] = "0"
-
-                # If it's first (0-th) index having '0' character,
-                # and all other characters are also '0' it means the limit is crossed;
-                # then increment length of alpha-numeric digits and break from loop.
-                if prev_idx == 0 and "".join(next_unique_id_chars) == "0" * len(
-                    next_unique_id_chars
-                ):
-                    with DashInstance.get_multiprocessing_lock() as mp_lock:
-                        utility_functions.write_new_alpha_numeric_digit_length(
-                            part_category=part_category,
-                            cap_color=cap_color_code,
-                            value=len(next_unique_id_chars) + 1,
-                        )
-                    is_limit_crossed = True
-                else:
-                    continue
-
-        # If the limit is crossed, then insert character '1' at 0-th place of `unique_id_chars`.
-        if is_limit_crossed:
-            next_unique_id_chars.insert(0, "1")
-        else:
-            # Set to character representation of `prev_ascii` and break from the loop since no need to check and increment more characters.
-            next_unique_id_chars[prev_idx] = chr(prev_ascii)
-        break
-
-    # Read the value for what was stored for "Next_ID".
-    starting_id: str = "".join(next_unique_id_chars)
-    return (
-        starting_id if (starting_id.strip() != "") else "0" * alpha_numeric_digit_length
+    result_df.to_csv(
+        file_path,
+        mode="a",
+        index=False,
+        header=os.path.getsize(file_path) <= 0,
     )
 
 
 def _find_and_fix_missing_short_urls(
     input_df: pd.DataFrame,
+    result_file_path: str,
+    circuit_breaker: short_url_retry.CircuitBreaker,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
 ) -> dict:
     """
-    Tries to find if there's any missing short URLs present. If yes, then it tries to fill those untill there's no missing short URLs left. Finally returns a `dict` with all short URLs mapped with their encrypted encoded IDs.
+    Tries to find if there's any missing short URLs present. If yes, then it retries to fill those with exponential backoff,
+    upto `SHORT_URL_MAX_RETRIES` (from `constants` module) times or untill `circuit_breaker` opens. The ones still missing
+    are moved to dead letters of the job writing its result at `result_file_path`, to be resumed later.
+    Finally returns a `dict` with all received short URLs mapped with their encrypted encoded IDs.
     """
 
-    # Make a copy of input DataFrame to avoid inplace modifications.
-    existing_df: pd.DataFrame = input_df.copy(deep=True)
-
-    # Get DataFrame rows where short URL is missing.
-    # If the value is missing then it will contain `NaN` values, so fill those with empty string first.
-    existing_df.fillna(value="", inplace=True)
-    existing_df = existing_df.loc[existing_df["Short Links"] == ""]
-
-    # Extract list of encrypted and encoded IDs to process and fetch their short URLs.
-    encrypted_encoded_ids_list: list = existing_df["Encrypted Encoded"].to_list()
+    # Get DataFrame rows where short URL is missing, as a copy to avoid inplace modifications.
+    # If the value is missing then it will contain `NaN` values, so treat those as empty string.
+    existing_df: pd.DataFrame = input_df.loc[
+        input_df["Short Links"].fillna("") == ""
+    ].copy()
 
     unique_ids_to_short_url_dict: dict = {}
 
-    # Iterate untill all short URLs are fetched.
-    while len(encrypted_encoded_ids_list) > 0:
-        print(f"\n -- Found {len(encrypted_encoded_ids_list)} missing short URLs...")
+    if len(existing_df.index) <= 0:
+        return unique_ids_to_short_url_dict
 
-        firebase_url_shortner.collect_firebase_short_urls(
-            encrypted_encoded_coupon_codes_list=encrypted_encoded_ids_list,
-            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
-        )
-        print("Fetched missing, now filling those URLs...")
+    print(f"\n -- Found {len(existing_df.index)} missing short URLs...")
 
-        # Fill the existing DataFrame where short URLs were missing.
-        for encrypted_encoded_key, short_url in unique_ids_to_short_url_dict.items():
-            existing_df.loc[
-                existing_df["Encrypted Encoded"] == encrypted_encoded_key, "Short Links"
-            ] = short_url
+    missing_statuses_dict: typing.Dict[
+        str, int
+    ] = short_url_retry.retry_missing_short_urls(
+        encrypted_encoded_coupon_codes_list=existing_df["Encrypted Encoded"].to_list(),
+        unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+        circuit_breaker=circuit_breaker,
+        requests_per_second=requests_per_second,
+    )
 
-        # Try to check if still there's any missing short URL found.
-        existing_df.fillna(value="", inplace=True)
-        existing_df = existing_df.loc[existing_df["Short Links"] == ""]
-        encrypted_encoded_ids_list = existing_df["Encrypted Encoded"].to_list()
+    # Persist the ones still missing, so those can be resumed without generating the whole job again.
+    existing_df = existing_df.loc[
+        existing_df["Encrypted Encoded"].isin(missing_statuses_dict)
+    ]
+    dead_letter_queue.append_dead_letters(
+        result_file_path=result_file_path,
+        dead_letters_df=pd.DataFrame(
+            data={
+                "PRODUCT_CATEGORY": existing_df["Product category"],
+                "CAP_COLOUR": existing_df["Cap colour"],
+                "GENERATION_DATE": existing_df["Date of generation"],
+                "UNIQUE_ID": existing_df["Unique ID"],
+                "ENCRYPTED_ENCODED": existing_df["Encrypted Encoded"],
+                "LAST_STATUS_CODE": existing_df["Encrypted Encoded"].map(
+                    missing_statuses_dict
+                ),
+            },
+        ),
+    )
 
     return unique_ids_to_short_url_dict
 
@@ -239,330 +169,427 @@ def _create_csv_record_and_excel_result(
     full_unique_ids_list: list,
     encrypted_encoded_ids_list: list,
     short_links_list: list,
-) -> None:
+    tracking_file_path: str,
+    result_file_path: str,
+    result_excel_writer: result_writer.ResultExcelWriter,
+    circuit_breaker: short_url_retry.CircuitBreaker,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+) -> int:
     """
-    Create Pandas DataFrame and stores in Excel file.
-    """
-    ## 1. Create CSV file to record all Unique IDs, which will be used to append to Elasticsearch index.
-    _store_unique_id_to_track(
-        part_category=part_category,
-        cap_color_code=cap_color_code,
-        special_code=special_code,
-        unique_ids_list=unique_ids_list,
-        encrypted_encoded_ids_list=encrypted_encoded_ids_list,
-    )
+    Appends a chunk of Unique IDs to tracking CSV file, and their rows to result Excel file using `result_excel_writer`.
+    Returns the number of rows appended to result Excel file.
 
-    ## 2. Create Excel file to store user downloadable file.
-    # Create a sub-directory where all result Excel files will be stored.
-    sub_dir_name: str = constants.RESULT_EXCEL_DIRPATH  # "Result"
-    os.makedirs(name=sub_dir_name, exist_ok=True)
-
-    # Get current datetime to create the required file format.
-    current_datetime: datetime.datetime = (
-        utility_functions.get_current_datetime_for_IST()
+    Unique IDs which are moved to dead letters (because their short URLs couldn't be received) are not appended to
+    result Excel file, those will be written to a supplementary result file once resumed.
+    """
+    # Values which are same for every row of result Excel file.
+    category_name: str = category_catalog.CategoryCatalog.get_category_name(
+        short_category=part_category.upper()
     )
-    file_formatted_datetime_str: str = current_datetime.strftime(
-        FILE_FORMATTED_DATETIME_STR
+    color_name: str = category_catalog.CategoryCatalog.get_color_name(
+        short_color=cap_color_code.upper()
     )
-
-    file_path: str = os.path.join(
-        sub_dir_name,
-        f"{part_category}_{cap_color_code}_{file_formatted_datetime_str}.xlsx",
+    generation_date_str: str = (
+        utility_functions.get_current_datetime_for_IST().strftime(
+            COLUMN_FORMATTED_DATE_STR
+        )
     )
 
-    # Create a mapping for part category and cap color codes, from short forms to full names.
-    part_category_short_to_full_dict: dict = {
-        "AL": "Alpha",
-        "BE": "Beta",
-        "GA": "Gamma",
-    }
-    cap_color_code_short_to_full_dict: dict = {
-        "RED": "Red",
-        "BLK": "Black",
-        "BLU": "Blue",
-    }
-
-    # Get a count of total Unique IDs.
-    total_ids_count: int = len(full_unique_ids_list)
+    # Only the rows with missing short URLs need a DataFrame, to retry them and move the failed ones to dead letters.
+    missing_idx_list: typing.List[int] = [
+        idx for idx, short_link in enumerate(short_links_list) if not short_link
+    ]
+    unique_ids_to_short_url_dict: dict = {}
 
-    result_df: pd.DataFrame = pd.DataFrame(
-        data={
-            "Product category": [
-                part_category_short_to_full_dict[part_category.upper()]
-            ]
-            * total_ids_count,
-            "Cap colour": [cap_color_code_short_to_full_dict[cap_color_code.upper()]]
-            * total_ids_count,
-            "Unique record": short_links_list,
-            "Date of generation": [current_datetime.strftime(COLUMN_FORMATTED_DATE_STR)]
-            * total_ids_count,
-            # Below columns won't be written but still useful for processing internally.
-            "Unique ID": full_unique_ids_list,
-            "Encrypted Encoded": encrypted_encoded_ids_list,
-            "Short Links": short_links_list,
-        },
-    )
+    if len(missing_idx_list) > 0:
+        # Try to fix all the missing short URLs.
+        unique_ids_to_short_url_dict = _find_and_fix_missing_short_urls(
+            input_df=pd.DataFrame(
+                data={
+                    "Product category": [category_name] * len(missing_idx_list),
+                    "Cap colour": [color_name] * len(missing_idx_list),
+                    "Date of generation": [generation_date_str] * len(missing_idx_list),
+                    "Unique ID": [
+                        full_unique_ids_list[idx] for idx in missing_idx_list
+                    ],
+                    "Encrypted Encoded": [
+                        encrypted_encoded_ids_list[idx] for idx in missing_idx_list
+                    ],
+                    "Short Links": [""] * len(missing_idx_list),
+                },
+            ),
+            result_file_path=result_file_path,
+            circuit_breaker=circuit_breaker,
+            requests_per_second=requests_per_second,
+        )
 
-    # Try to fix all the missing short URLs if have any.
-    unique_ids_to_short_url_dict: dict = _find_and_fix_missing_short_urls(
-        input_df=result_df,
+    ## 1. Append to CSV file to record all Unique IDs, which will be used to append to Elasticsearch index.
+    _store_unique_id_to_track(
+        part_category=part_category,
+        cap_color_code=cap_color_code,
+        special_code=special_code,
+        unique_ids_list=unique_ids_list,
+        encrypted_encoded_ids_list=encrypted_encoded_ids_list,
+        file_path=tracking_file_path,
     )
 
-    # Fill the final DataFrame where short URLs were missing.
-    for encrypted_encoded_key, short_url in unique_ids_to_short_url_dict.items():
-        result_df.loc[
-            result_df["Encrypted Encoded"] == encrypted_encoded_key, "Unique record"
-        ] = short_url
-
-    result_df.to_excel(
-        file_path,
-        sheet_name=f"{part_category}_{cap_color_code}",
-        index=False,
-        columns=[
-            "Product category",
-            "Cap colour",
-            "Unique record",
-            "Date of generation",
-        ],
+    ## 2. Append to Excel file of user downloadable result, row by row with only the exported columns.
+    # Short URLs which are still missing are in dead letters, so those rows are skipped.
+    return result_excel_writer.append_rows(
+        rows_iter=(
+            (category_name, color_name, short_link, generation_date_str)
+            for short_link in (
+                short_link or unique_ids_to_short_url_dict.get(encrypted_encoded_id)
+                for short_link, encrypted_encoded_id in zip(
+                    short_links_list, encrypted_encoded_ids_list
+                )
+            )
+            if short_link
+        )
     )
 
 
-def generate_unique_ids(
+def _generate_unique_ids_for_cap_color(
     part_category: str,
-    cap_color_codes: list,
+    cap_color_code: str,
     special_code: str,
     max_generate_limit: int,
-    # alpha_numeric_digit_length: int = None,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+    encryption_max_workers: int = constants.ENCRYPTION_MAX_WORKERS,
+    job_id: str = None,
     is_debug_mode: bool = False,
-) -> None:
+) -> dict:
     """
-    Generates the Unique IDs when provided `part_category` and `cap_color_codes`.
+    Generates, encrypts, shortens and stores the Unique IDs for a single `cap_color_code`.
+
+    Unique IDs are processed in chunks of `GENERATION_CHUNK_SIZE` (from `constants` module) and each chunk is appended
+    to the tracking and result files before generating the next one, so memory usage depends on chunk size
+    rather than `max_generate_limit`.
+
+    Returns a `dict` with time taken (in seconds) by each stage of the generation process.
 
     Args:
 
     `part_category` - The part category string which is the first prefix for Unique ID.
-    `cap_color_codes` - The list of cap color codes which will be the second prefix for Unique ID.
+    `cap_color_code` - The cap color code which will be the second prefix for Unique ID.
     `special_code` - The special code used to indicate generated Unique IDs for some festival-like purpose.
     `max_generate_limit` - The maximum number of Unique IDs to be generated.
-    `alpha_numeric_digit_length` - The digit length for alpha-numeric characters. This will be used to fill left un-used positions with zeros.
+    `requests_per_second` - The maximum number of Google API requests per second, shared with all other processes.
+    `encryption_max_workers` - The share of processes available to encrypt Unique IDs of this cap color code.
+    `job_id` - The ID of job from `job_queue` module, to publish the progress of this cap color code. Default is `None`, i.e. not published.
     `is_debug_mode` - To check whether the code is running in debug mode. Default is `False`.
     """
+    total_start_time: float = time.perf_counter()
 
-    # Remove previous tracking if there're older processes exist which might be older than yesterday.
-    with DashInstance.get_multiprocessing_lock() as mp_lock:
-        utility_functions.remove_old_id_generation_task_entries()
-
-    # Create entry to track this ID generation process.
-    with DashInstance.get_multiprocessing_lock() as mp_lock:
-        utility_functions.write_id_generation_task_entry(
-            part_category=part_category,
-            special_code=special_code,
-            max_generate_limit=max_generate_limit,
-        )
+    # Lock metrics are kept per process, which may have processed other cap color codes before.
+    start_lock_wait_seconds: float = sum(
+        metrics_dict["TOTAL_WAIT_SECONDS"]
+        for metrics_dict in file_lock.get_lock_metrics().values()
+    )
 
+    # To check duplicates while running in debug mode.
     duplicates_set: set = set()
 
-    for cap_color in cap_color_codes:
-        # Read existing length for alpha-numeric digits.
-        alpha_numeric_digit_length: int = 0
-        with DashInstance.get_multiprocessing_lock() as mp_lock:
-            alpha_numeric_digit_length = (
-                utility_functions.read_last_alpha_numeric_digit_length(
-                    part_category=part_category,
-                    cap_color=cap_color,
-                )
-            )
+    # Lease a range of alpha-numeric sequences for current `part_category` and `cap_color_code`.
+    # Leased range can't be handed out to any other process, so they can generate in parallel.
+    (
+        start_value,
+        alpha_numeric_digit_length,
+    ) = id_range_allocator.lease_unique_id_range(
+        part_category=part_category,
+        cap_color_code=cap_color_code,
+        special_code=special_code,
+        count=max_generate_limit,
+    )
+    current_starting_unique_id: str = sequence_engine.int_to_unique_id(
+        value=start_value,
+        alpha_numeric_digit_length=alpha_numeric_digit_length,
+    )
 
-        # First check and read from file if there can be a starting ID for current `part_category` and `cap_color`.
-        current_starting_unique_id: str = _read_starting_unique_id_from_track(
-            part_category=part_category,
-            cap_color_code=cap_color,
-            alpha_numeric_digit_length=alpha_numeric_digit_length,
+    # Counters of every stage, published for the web page while this cap color code is processed.
+    progress_reporter: job_progress.JobProgressReporter = (
+        job_progress.JobProgressReporter(
+            job_id=job_id,
+            cap_color_code=cap_color_code,
+            total_ids_count=max_generate_limit,
         )
+    )
+    progress_reporter.publish(is_forced=True)
+    result_rows_count: int = 0
+    dead_letters_count: int = 0
+
+    ## Debug Start
+    if is_debug_mode:
+        print(f"\n- Starting ID : {current_starting_unique_id}")
+        _ = input("Press enter/return key to continue...")
+    ## Debug End
+
+    # Create file paths once, so every chunk will be appended to the same tracking and result files.
+    tracking_file_path: str = _get_output_file_path(
+        sub_dir_name=constants.TRACKING_INDEXING_DIRPATH,  # "Track_Unique_IDs"
+        part_category=part_category,
+        cap_color_code=cap_color_code,
+        file_extension="csv",
+    )
+    result_file_path: str = _get_output_file_path(
+        sub_dir_name=constants.RESULT_EXCEL_DIRPATH,  # "Result"
+        part_category=part_category,
+        cap_color_code=cap_color_code,
+        file_extension="xlsx",
+    )
 
-        # After getting `current_starting_unique_id`,
-        # read length for alpha-numeric digits again to ensure having correct value
-        # just in case if getting that ID might increment the length due to crossing limit.
-        with DashInstance.get_multiprocessing_lock() as mp_lock:
-            alpha_numeric_digit_length = (
-                utility_functions.read_last_alpha_numeric_digit_length(
-                    part_category=part_category,
-                    cap_color=cap_color,
-                )
-            )
-
-        ## Debug Start
-        if is_debug_mode:
-            print(f"\n- Starting ID : {current_starting_unique_id}")
-            _ = input("Press enter/return key to continue...")
-        ## Debug End
-
-        # Get ASCII value for last character.
-        last_char_ascii: int = ord(current_starting_unique_id[-1])
-
-        # Get list of characters excluding the part category, cap color code and special code from Unique ID before starting.
-        unique_id_chars: typing.List[str] = list(current_starting_unique_id)
+    # Rows are streamed to temporary files instead of being kept in memory, and continue in next worksheet or file near Excel's row limit.
+    result_excel_writer: result_writer.ResultExcelWriter = (
+        result_writer.ResultExcelWriter(
+            file_path=result_file_path,
+            sheet_title=f"{part_category}_{cap_color_code}",
+        )
+    )
 
-        # To store only alpha-numeric values of unique IDs. For e.g., "00001A"
-        unique_ids_list: typing.List[str] = []
+    id_generation_seconds: float = 0.0
+    short_url_generation_seconds: float = 0.0
+    result_writing_seconds: float = 0.0
 
-        # To store entire strings of generated alpha-numeric unique IDs. For e.g., "PRBLK00001A"
-        full_unique_ids_list: typing.List[str] = []
+    next_value: int = start_value
 
-        # To store encrypted, encoded form of above `full_unique_ids_list`.
-        encrypted_encoded_ids_list: typing.List[str] = []
+    # Circuit breaker shared by all chunks, so an outage of short links API stops the requests for whole job.
+    circuit_breaker: short_url_retry.CircuitBreaker = short_url_retry.CircuitBreaker()
 
-        # To store short links for above `encrypted_encoded_ids_list`.
-        short_links_list: typing.List[str] = []
+    for chunk_start_idx in range(
+        0, max_generate_limit, constants.GENERATION_CHUNK_SIZE
+    ):
+        chunk_ids_count: int = min(
+            constants.GENERATION_CHUNK_SIZE, max_generate_limit - chunk_start_idx
+        )
 
         start_time: float = time.perf_counter()
 
-        for idx, _ in enumerate(range(max_generate_limit)):
-            # Create Unique ID.
-            generated_uid: str = (
-                part_category
-                + cap_color
-                + special_code
-                + "".join(unique_id_chars).rjust(alpha_numeric_digit_length, "0")
-            )
-
-            # Get encrypted and encoded representation of Unique ID.
-            encrypted_encoded_id: str = encryptor_encoder.encrypt_encode_unique_id(
-                unique_id_str=generated_uid
-            )
+        # Render alpha-numeric sequences of current chunk as a single block. For e.g. "00001A"
+        # Allocator has already stored the grown length of alpha-numeric digits, if the range crosses the limit.
+        (
+            unique_ids_list,
+            next_value,
+            alpha_numeric_digit_length,
+        ) = sequence_engine.render_unique_ids_block(
+            start_value=next_value,
+            count=chunk_ids_count,
+            alpha_numeric_digit_length=alpha_numeric_digit_length,
+        )
 
-            # Append results to respective final lists.
-            unique_ids_list.append(
-                "".join(unique_id_chars).rjust(alpha_numeric_digit_length, "0")
-            )
-            full_unique_ids_list.append(generated_uid)
-            encrypted_encoded_ids_list.append(encrypted_encoded_id)
+        # Create entire strings of generated alpha-numeric unique IDs. For e.g., "PRBLK00001A"
+        unique_id_prefix: str = part_category + cap_color_code + special_code
+        full_unique_ids_list: typing.List[str] = [
+            unique_id_prefix + unique_id for unique_id in unique_ids_list
+        ]
+        # Published at once, as unused quota of a failed job is released based on it before short URLs are requested.
+        progress_reporter.update(ids_generated=chunk_start_idx + chunk_ids_count)
+
+        # Get encrypted and encoded representation of all Unique IDs in current chunk.
+        encrypted_encoded_ids_list: list = encryptor_encoder.encrypt_encode_unique_ids(
+            unique_ids_list=full_unique_ids_list,
+            max_workers=encryption_max_workers,
+        )
+        progress_reporter.add(ids_encrypted=chunk_ids_count)
 
-            ## Debug Start
-            if is_debug_mode:
+        ## Debug Start
+        if is_debug_mode:
+            for idx, generated_uid in enumerate(
+                full_unique_ids_list, start=chunk_start_idx
+            ):
                 print("%9d. %s" % ((idx + 1), generated_uid))
                 if generated_uid in duplicates_set:
                     print(f"\n Found duplicate : {generated_uid}")
                     _ = input("Press enter/return key to continue...")
-            ## Debug End
-            duplicates_set.add(generated_uid)
-
-            # If between 0 to 9.
-            if last_char_ascii >= 48 and last_char_ascii < 58:
-                last_char_ascii += 1
-
-                # If passed the digit limits, then set to ASCII of 'A'.
-                if last_char_ascii == 58:
-                    last_char_ascii = ord("A")
-
-                # Update last character.
-                last_idx: int = len(unique_id_chars) - 1
-                unique_id_chars[last_idx] = chr(last_char_ascii)
-                continue
-
-            # If between A to Z.
-            if last_char_ascii >= 65 and last_char_ascii < 91:
-                last_char_ascii += 1
-
-                # If passed the alphabet limits, then set to ASCII of '0'.
-                if last_char_ascii == 91:
-                    last_char_ascii = ord("0")
-
-                    # Use a boolean to check whether full alpha-numeric digits limit is crossed.
-                    is_limit_crossed: bool = False
-
-                    # Increment previous characters ASCII values.
-                    # This will exclude the last character and will only consider from first till second last.
-                    for prev_idx in range(len(unique_id_chars) - 2, -1, -1):
-                        # Get previous character's ASCII value.
-                        prev_ascii: int = ord(unique_id_chars[prev_idx])
-
-                        # Use a boolean to check and avoid multi-incrementing while processing character "A".
-                        is_set_first_alphabet: bool = False
-
-                        # If between 0 to 9.
-                        if prev_ascii >= 48 and prev_ascii < 58:
-                            prev_ascii += 1
-
-                            # If passed the digit limits, then set to ASCII of 'A'.
-                            if prev_ascii == 58:
-                                prev_ascii = ord("A")
-                                is_set_first_alphabet = True  # Setting this will tell to avoid incrementing again.
-
-                        # If between A to Z.
-                        if prev_ascii >= 65 and prev_ascii < 91:
-                            if not is_set_first_alphabet:
-                                prev_ascii += 1
-
-                            if prev_ascii == 91:
-                                # If passed the alphabet limits (A-Z), then set to '0' and continue with previous character.
-                                unique_id_chars[prev_idx] = "0"
-
-                                # If it's first (0-th) index having '0' character,
-                                # and all other characters (except last one) are also '0' it means the limit is crossed;
-                                # then increment length of alpha-numeric digits and break from loop.
-                                if prev_idx == 0 and "".join(
-                                    unique_id_chars[:-1]
-                                ) == "0" * (alpha_numeric_digit_length - 1):
-                                    with DashInstance.get_multiprocessing_lock() as mp_lock:
-                                        alpha_numeric_digit_length += 1
-                                        utility_functions.write_new_alpha_numeric_digit_length(
-                                            part_category=part_category,
-                                            cap_color=cap_color,
-                                            value=alpha_numeric_digit_length,
-                                        )
-                                    is_limit_crossed = True
-                                    break
-                                else:
-                                    continue
-
-                        # Set to character representation of `prev_ascii` and break from the loop since no need to check and increment more characters.
-                        unique_id_chars[prev_idx] = chr(prev_ascii)
-                        break
-
-                    # If the limit is crossed, then insert character '1' at 0-th place of `unique_id_chars`.
-                    if is_limit_crossed:
-                        unique_id_chars.insert(0, "1")
-
-                # Update last character.
-                last_idx: int = len(unique_id_chars) - 1
-                unique_id_chars[last_idx] = chr(last_char_ascii)
-                continue
+                duplicates_set.add(generated_uid)
+        ## Debug End
 
         end_time: float = time.perf_counter()
-        print(f"Unique ID generation time: {end_time - start_time:.2f} seconds")
+        id_generation_seconds += end_time - start_time
 
-        # Call the asynchronous method here to get short URLs for all encrypted, encoded Unique IDs.
-        start_time: float = time.perf_counter()
+        # Call the asynchronous method here to get short URLs for encrypted, encoded Unique IDs of current chunk.
+        start_time = time.perf_counter()
         unique_ids_to_short_url_dict: dict = {}
 
-        firebase_url_shortner.collect_firebase_short_urls(
-            encrypted_encoded_coupon_codes_list=encrypted_encoded_ids_list,
-            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
-        )
-
-        end_time: float = time.perf_counter()
-        print(f"Short URL generation time: {end_time - start_time:.2f} seconds")
+        # While circuit breaker is open, skip the requests and let the whole chunk move to dead letters.
+        if not circuit_breaker.is_open():
+            url_shortner.collect_short_urls(
+                encrypted_encoded_coupon_codes_list=encrypted_encoded_ids_list,
+                unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+                requests_per_second=requests_per_second,
+                short_urls_received_callback=lambda short_urls_count: progress_reporter.add(
+                    ids_shortened=short_urls_count
+                ),
+                circuit_breaker=circuit_breaker,
+            )
 
         # For all `encrypted_encoded_ids_list`, extract and store the related short link.
-        for encrypted_encoded_id in encrypted_encoded_ids_list:
-            short_links_list.append(unique_ids_to_short_url_dict[encrypted_encoded_id])
+        short_links_list: typing.List[str] = [
+            unique_ids_to_short_url_dict.get(encrypted_encoded_id, "")
+            for encrypted_encoded_id in encrypted_encoded_ids_list
+        ]
 
-        # Create and store DataFrame as Excel file for Unique IDs of each color code and part categories having 2 columns.
-        # Firstly for actual Unique ID and second for encrypted, encoded variant of that Unique ID.
-        _create_csv_record_and_excel_result(
+        end_time = time.perf_counter()
+        short_url_generation_seconds += end_time - start_time
+
+        # Append current chunk to tracking CSV file and result Excel worksheet.
+        start_time = time.perf_counter()
+        chunk_result_rows_count: int = _create_csv_record_and_excel_result(
             part_category=part_category,
-            cap_color_code=cap_color,
+            cap_color_code=cap_color_code,
             special_code=special_code,
             unique_ids_list=unique_ids_list,
             full_unique_ids_list=full_unique_ids_list,
             encrypted_encoded_ids_list=encrypted_encoded_ids_list,
             short_links_list=short_links_list,
+            tracking_file_path=tracking_file_path,
+            result_file_path=result_file_path,
+            result_excel_writer=result_excel_writer,
+            circuit_breaker=circuit_breaker,
+            requests_per_second=requests_per_second,
+        )
+        end_time = time.perf_counter()
+        result_writing_seconds += end_time - start_time
+
+        # Short URLs received by retries aren't counted while shortening, so set the exact counts of whole chunk.
+        result_rows_count += chunk_result_rows_count
+        dead_letters_count += chunk_ids_count - chunk_result_rows_count
+        progress_reporter.update(
+            ids_shortened=result_rows_count,
+            rows_written=result_rows_count,
+            dead_letters=dead_letters_count,
         )
 
-    # Remove previous tracking if there're older processes exist which might be older than yesterday.
-    with DashInstance.get_multiprocessing_lock() as mp_lock:
-        utility_functions.remove_old_id_generation_task_entries()
+        print(
+            f"- {part_category}_{cap_color_code} : Stored {chunk_start_idx + chunk_ids_count}/{max_generate_limit} Unique IDs"
+        )
+
+    # Finally write the result Excel files from streamed rows.
+    start_time = time.perf_counter()
+    result_file_paths_list: typing.List[str] = result_excel_writer.close()
+    end_time = time.perf_counter()
+    result_writing_seconds += end_time - start_time
+
+    progress_reporter.finish()
+
+    print(f"Unique ID generation time: {id_generation_seconds:.2f} seconds")
+    print(f"Short URL generation time: {short_url_generation_seconds:.2f} seconds")
+    if len(result_file_paths_list) > 1:
+        print(
+            f"- {part_category}_{cap_color_code} : Result is split in {len(result_file_paths_list)} files, {result_file_paths_list}"
+        )
+
+    return {
+        "CAP_COLOR_CODE": cap_color_code,
+        "ID_GENERATION_SECONDS": id_generation_seconds,
+        "SHORT_URL_GENERATION_SECONDS": short_url_generation_seconds,
+        "RESULT_WRITING_SECONDS": result_writing_seconds,
+        "LOCK_WAIT_SECONDS": sum(
+            metrics_dict["TOTAL_WAIT_SECONDS"]
+            for metrics_dict in file_lock.get_lock_metrics().values()
+        )
+        - start_lock_wait_seconds,
+        "TOTAL_SECONDS": end_time - total_start_time,
+    }
+
+
+def generate_unique_ids(
+    part_category: str,
+    cap_color_codes: list,
+    special_code: str,
+    max_generate_limit: int,
+    # alpha_numeric_digit_length: int = None,
+    is_debug_mode: bool = False,
+    max_workers: int = constants.MAX_CAP_COLOR_WORKERS,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+    encryption_max_workers: int = constants.ENCRYPTION_MAX_WORKERS,
+    job_id: str = None,
+) -> None:
+    """
+    Generates the Unique IDs when provided `part_category` and `cap_color_codes`.
+
+    Args:
+
+    `part_category` - The part category string which is the first prefix for Unique ID.
+    `cap_color_codes` - The list of cap color codes which will be the second prefix for Unique ID.
+    `special_code` - The special code used to indicate generated Unique IDs for some festival-like purpose.
+    `max_generate_limit` - The maximum number of Unique IDs to be generated.
+    `alpha_numeric_digit_length` - The digit length for alpha-numeric characters. This will be used to fill left un-used positions with zeros.
+    `is_debug_mode` - To check whether the code is running in debug mode. Default is `False`.
+    `max_workers` - The maximum number of cap color codes processed in parallel, each in a separate process. Default is `MAX_CAP_COLOR_WORKERS` from `constants` module.
+    `requests_per_second` - The maximum number of Google API requests per second, shared with all other processes. Default is `GOOGLE_API_REQUESTS_PER_SECOND` from `constants` module.
+    `encryption_max_workers` - The share of processes available to encrypt Unique IDs of this job. Default is `ENCRYPTION_MAX_WORKERS` from `constants` module.
+    `job_id` - The ID of job from `job_queue` module, to publish its progress using `job_progress` module. Default is `None`, i.e. not published.
+    """
+
+    # Create entry to track this ID generation process, older entries are removed by `task_log` compactor.
+    utility_functions.write_id_generation_task_entry(
+        part_category=part_category,
+        special_code=special_code,
+        max_generate_limit=max_generate_limit,
+    )
+
+    # Each cap color code is an independent sequence, so those can be processed in parallel.
+    # Debug mode waits for the user input, so it always processes them one after another.
+    workers_count: int = max(1, min(max_workers, len(cap_color_codes)))
+    if is_debug_mode:
+        workers_count = 1
+
+    # Google API limit is shared by all processes through `request_rate_limiter` module, so each of them can use all of it.
+    # But split the encryption processes among them so CPU cores are not oversubscribed.
+    encryption_max_workers = max(1, encryption_max_workers // workers_count)
+
+    cap_color_timings_list: typing.List[dict] = []
+
+    if workers_count <= 1:
+        for cap_color in cap_color_codes:
+            cap_color_timings_list.append(
+                _generate_unique_ids_for_cap_color(
+                    part_category=part_category,
+                    cap_color_code=cap_color,
+                    special_code=special_code,
+                    max_generate_limit=max_generate_limit,
+                    requests_per_second=requests_per_second,
+                    encryption_max_workers=encryption_max_workers,
+                    job_id=job_id,
+                    is_debug_mode=is_debug_mode,
+                )
+            )
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers_count
+        ) as process_pool_executor:
+            futures_list: typing.List[concurrent.futures.Future] = [
+                process_pool_executor.submit(
+                    _generate_unique_ids_for_cap_color,
+                    part_category,
+                    cap_color,
+                    special_code,
+                    max_generate_limit,
+                    requests_per_second,
+                    encryption_max_workers,
+                    job_id,
+                )
+                for cap_color in cap_color_codes
+            ]
+
+            # Let every cap color code finish even if any one fails, then collect in the same order as `cap_color_codes`.
+            concurrent.futures.wait(futures_list)
+            for future in futures_list:
+                cap_color_timings_list.append(future.result())
+
+    # Report time taken by each stage for every cap color code.
+    for cap_color_timings_dict in cap_color_timings_list:
+        print(
+            "- {}_{} : generation {:.2f}s, short URLs {:.2f}s, result files {:.2f}s, lock waits {:.2f}s, total {:.2f}s".format(
+                part_category,
+                cap_color_timings_dict["CAP_COLOR_CODE"],
+                cap_color_timings_dict["ID_GENERATION_SECONDS"],
+                cap_color_timings_dict["SHORT_URL_GENERATION_SECONDS"],
+                cap_color_timings_dict["RESULT_WRITING_SECONDS"],
+                cap_color_timings_dict["LOCK_WAIT_SECONDS"],
+                cap_color_timings_dict["TOTAL_SECONDS"],
+            )
+        )
 
 
 # Handle execution in case launched as a stand-alone script.
@@ -0,0 +1,54 @@
+import typing
+
+import constants
+import firebase_url_shortner
+import local_url_shortner
+
+if typing.TYPE_CHECKING:
+    import short_url_retry
+
+
+# Names of short URL backends (used by `SHORT_URL_BACKEND` in `constants` module).
+SHORT_URL_BACKENDS_LIST: typing.List[str] = ["firebase", "local"]
+
+
+def collect_short_urls(
+    encrypted_encoded_coupon_codes_list: typing.List[str],
+    unique_ids_to_short_url_dict: dict,
+    requests_per_second: float = constants.GOOGLE_API_REQUESTS_PER_SECOND,
+    response_statuses_dict: dict = None,
+    short_urls_received_callback: typing.Callable[[int], None] = None,
+    circuit_breaker: "short_url_retry.CircuitBreaker" = None,
+) -> None:
+    """
+    Collects the short URLs using the backend set for `SHORT_URL_BACKEND` in `constants` module.
+
+    Args:
+
+    `encrypted_encoded_coupon_codes_list` - This is list of Unique ID strings in encrypted and encoded format.
+    `unique_ids_to_short_url_dict` - This is a mapping to store Unique ID with created short URLs. Empty string is stored if the short URL is not received.
+    `requests_per_second` - The maximum number of POST requests per second shared with all other processes, used only by "firebase" backend.
+    `response_statuses_dict` - Optional mapping to store HTTP status code of response against each requested encrypted encoded Unique ID.
+    `short_urls_received_callback` - Optional function called with the number of short URLs received, as soon as those are received.
+    `circuit_breaker` - Optional circuit breaker recording every response, used only by "firebase" backend. Requests not sent yet are skipped once it opens.
+    """
+    if constants.SHORT_URL_BACKEND == "local":
+        local_url_shortner.collect_local_short_urls(
+            encrypted_encoded_coupon_codes_list=encrypted_encoded_coupon_codes_list,
+            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+            response_statuses_dict=response_statuses_dict,
+            short_urls_received_callback=short_urls_received_callback,
+        )
+
+    elif constants.SHORT_URL_BACKEND == "firebase":
+        firebase_url_shortner.collect_firebase_short_urls(
+            encrypted_encoded_coupon_codes_list=encrypted_encoded_coupon_codes_list,
+            unique_ids_to_short_url_dict=unique_ids_to_short_url_dict,
+            requests_per_second=requests_per_second,
+            response_statuses_dict=response_statuses_dict,
+            short_urls_received_callback=short_urls_received_callback,
+            circuit_breaker=circuit_breaker,
+        )
+
+    else:
+        raise ValueError(f"Unknown short URL backend: {constants.SHORT_URL_BACKEND}")